@@ -1,10 +1,20 @@
 # Core functionality exports
 from app.core.dokapon_extract import decompress_lz77, process_file, extract_tex, extract_spranm, extract_fnt
-from app.core.text_extract_repack import extract_texts, extract_texts_to_memory, import_texts
-from app.core.pck_handler import PCKFile, Sound, extract_pck, create_pck
+from app.core.batch_extract import ExtractionJob, ExtractionResult, iter_extract, extract_files
+from app.core.text_extract_repack import (
+    TextEntry, TextTable, load_text_table, extract_texts, extract_texts_to_memory, import_texts,
+    diff_texts, import_text_changes,
+)
+from app.core.pck_handler import PCKFile, PCKBatch, Sound, extract_pck, create_pck
+from app.core.opus_info import OpusInfo, read_opus_info, index_pck, index_pck_file, load_cached_index
+from app.core.voice_replace import (
+    ReplacementJob, ReplacementResult, EncodeCache, iter_replacements, prepare_replacements,
+)
+from app.core.exe_image import ExeImage, ExeChange, PEHeader, PESection, open_exe_image, release_exe_image
 from app.core.hex_editor import (
-    HexPatch, PatchConflict, parse_hex_file, parse_hex_files, 
-    detect_conflicts, apply_patches, find_hex_files
+    HexPatch, PatchConflict, JournalRange, parse_hex_file, parse_hex_files, 
+    detect_conflicts, compile_patches, apply_patches, revert_patches, get_applied_patches,
+    diff_executables, create_diff_patch, find_hex_files, create_hex_patches
 )
 from app.core.video_converter import VideoConverter, VideoInfo, ConversionSettings, find_game_videos
 from app.core.tool_manager import ToolManager, get_ffmpeg_path, get_ffprobe_path, get_opusenc_path
@@ -17,19 +27,26 @@ from app.core.cell_parser import (
     render_map_text,
 )
 from app.core.texture_parser import (
-    TextureHeader, TexturePart, TexturePartsContainer,
+    TextureHeader, TexturePart, TexturePartsContainer, Palette,
     parse_texture_header, parse_texture_parts_payload, parse_texture_parts_chunk,
-    parse_palette_chunk, build_indexed_atlas_image, build_png_image,
+    parse_palette_chunk, build_indexed_atlas_image, build_palette_table, build_png_image,
     summarize_texture_parts,
 )
 from app.core.game_scanner import (
     FileInsight, MapGroup, DebugOffsetState, DebugInsight,
-    detect_signature, count_pngs, analyze_file, scan_map_groups,
-    analyze_debug, summarize_map_groups,
+    SCAN_QUICK, SCAN_STANDARD, SCAN_DEEP, SCAN_TIERS,
+    detect_signature, count_pngs, analyze_file, list_map_files, iter_map_insights,
+    scan_map_groups, analyze_debug, summarize_map_groups,
+)
+from app.core.scan_cache import ScanCache, ScanCacheStats, user_cache_dir
+from app.core.gamedata_index import (
+    GameDataIndex, GameDataIndexStats, IndexedFile, IndexedChunk,
+    build_gamedata_index, load_gamedata_index, refresh_gamedata_index,
+    get_gamedata_index, release_gamedata_index,
 )
 from app.core.map_renderer import (
-    LoadedCellDocument,
-    load_cell_document, build_atlas_for_document, render_map_image,
+    LoadedCellDocument, MapTileSource, DocumentCache, document_cache,
+    load_cell_document, build_atlas_for_document, build_tile_grid, render_map_image,
     list_cell_files, scan_workspace,
 )
 from app.core.report_generator import (
@@ -44,22 +61,59 @@ __all__ = [
     'extract_tex',
     'extract_spranm',
     'extract_fnt',
+    # Batch extraction
+    'ExtractionJob',
+    'ExtractionResult',
+    'iter_extract',
+    'extract_files',
+    'TextEntry',
+    'TextTable',
+    'load_text_table',
     'extract_texts',
     'extract_texts_to_memory',
     'import_texts',
+    'diff_texts',
+    'import_text_changes',
     # PCK handling
     'PCKFile',
+    'PCKBatch',
     'Sound',
     'extract_pck',
     'create_pck',
+    # Opus metadata
+    'OpusInfo',
+    'read_opus_info',
+    'index_pck',
+    'index_pck_file',
+    'load_cached_index',
+    # Voice replacement
+    'ReplacementJob',
+    'ReplacementResult',
+    'EncodeCache',
+    'iter_replacements',
+    'prepare_replacements',
+    # Shared executable image
+    'ExeImage',
+    'ExeChange',
+    'PEHeader',
+    'PESection',
+    'open_exe_image',
+    'release_exe_image',
     # Hex editing
     'HexPatch',
     'PatchConflict',
+    'JournalRange',
     'parse_hex_file',
     'parse_hex_files',
     'detect_conflicts',
+    'compile_patches',
     'apply_patches',
+    'revert_patches',
+    'get_applied_patches',
+    'diff_executables',
+    'create_diff_patch',
     'find_hex_files',
+    'create_hex_patches',
     # Video conversion
     'VideoConverter',
     'VideoInfo',
@@ -89,11 +143,13 @@ __all__ = [
     'TextureHeader',
     'TexturePart',
     'TexturePartsContainer',
+    'Palette',
     'parse_texture_header',
     'parse_texture_parts_payload',
     'parse_texture_parts_chunk',
     'parse_palette_chunk',
     'build_indexed_atlas_image',
+    'build_palette_table',
     'build_png_image',
     'summarize_texture_parts',
     # Game scanner
@@ -101,16 +157,40 @@ __all__ = [
     'MapGroup',
     'DebugOffsetState',
     'DebugInsight',
+    'SCAN_QUICK',
+    'SCAN_STANDARD',
+    'SCAN_DEEP',
+    'SCAN_TIERS',
     'detect_signature',
     'count_pngs',
     'analyze_file',
+    'list_map_files',
+    'iter_map_insights',
     'scan_map_groups',
     'analyze_debug',
     'summarize_map_groups',
+    # Scan cache
+    'ScanCache',
+    'ScanCacheStats',
+    'user_cache_dir',
+    # GameData index
+    'GameDataIndex',
+    'GameDataIndexStats',
+    'IndexedFile',
+    'IndexedChunk',
+    'build_gamedata_index',
+    'load_gamedata_index',
+    'refresh_gamedata_index',
+    'get_gamedata_index',
+    'release_gamedata_index',
     # Map renderer
     'LoadedCellDocument',
+    'MapTileSource',
+    'DocumentCache',
+    'document_cache',
     'load_cell_document',
     'build_atlas_for_document',
+    'build_tile_grid',
     'render_map_image',
     'list_cell_files',
     'scan_workspace',
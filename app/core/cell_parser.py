@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 import struct
-from typing import Iterable
+import sys
+from typing import Iterable, Sequence
 
 
 def align8(value: int) -> int:
     return (value + 7) & ~7
 
 
+def u32_view(buf: bytes, offset: int, count: int) -> Sequence[int]:
+    """Little-endian u32 values of *buf* as a sequence sharing its memory where possible."""
+    view = memoryview(buf)[offset:offset + count * 4]
+    if sys.byteorder == "little":
+        return view.cast("I")
+    values = array("I", view)
+    values.byteswap()
+    return values
+
+
 @dataclass(slots=True)
 class CellHeader:
     table_offset: int
@@ -38,7 +50,8 @@ class CellChunk:
 class CellMap:
     width: int
     height: int
-    values: list[int]
+    # Read-only view into the Cell buffer, not a list
+    values: Sequence[int]
 
 
 @dataclass(slots=True)
@@ -114,7 +127,7 @@ def parse_cell_chunks(buf: bytes, header: CellHeader) -> list[CellChunk]:
 
 
 def parse_chunk_map(buf: bytes, chunk: CellChunk) -> CellMap:
-    payload = buf[chunk.payload_offset:chunk.payload_offset + chunk.payload_size]
+    payload = memoryview(buf)[chunk.payload_offset:chunk.payload_offset + chunk.payload_size]
     if len(payload) < 4:
         raise ValueError("Map chunk payload is too small")
     width, height = struct.unpack_from("<HH", payload, 0)
@@ -124,7 +137,7 @@ def parse_chunk_map(buf: bytes, chunk: CellChunk) -> CellMap:
         raise ValueError(
             f"Map chunk size mismatch: width={width} height={height} payload=0x{len(payload):X} expected=0x{expected_size:X}"
         )
-    values = list(struct.unpack_from(f"<{expected_values}I", payload, 4))
+    values = u32_view(payload, 4, expected_values)
     return CellMap(width=width, height=height, values=values)
 
 
@@ -13,7 +13,7 @@ Features:
 - Support for .tex, .mpd, .spranm, and .fnt files
 - Maintain directory structure during batch processing
 
-Usage: python dokapon_extract.py [-h] [-i INPUT] [-o OUTPUT] [-t {tex,spranm,fnt,all}] [-v] [--repack]
+Usage: python dokapon_extract.py [-h] [-i INPUT] [-o OUTPUT] [-t {tex,spranm,fnt,all}] [-j JOBS] [-v] [--repack]
 """
 
 import os
@@ -23,6 +23,8 @@ from dataclasses import dataclass
 from typing import Optional
 import json
 
+from app.core.lz77 import compress, decompress_flag_byte
+
 @dataclass
 class SpriteHeader:
     size: int
@@ -52,65 +54,10 @@ def decompress_lz77(data: bytes) -> Optional[bytes]:
     - Bytes 12-16: offset to uncompressed data (Sequence header)
     - Bytes 16 to offset: LZ77 compressed data
     - Bytes offset to end: uncompressed Sequence metadata
-    """
-    if not data.startswith(b'LZ77'):
-        return None
-    
-    decompressed_size = struct.unpack('<I', data[8:12])[0]
-    uncompressed_offset = struct.unpack('<I', data[12:16])[0]
-    
-    # Determine where compressed data ends
-    compressed_end = uncompressed_offset if uncompressed_offset > 16 else len(data)
-    
-    result = bytearray()
-    pos = 16  # Start after header
-
-    try:
-        while pos < compressed_end and len(result) < decompressed_size:
-            flag = data[pos]
-            pos += 1
-
-            # Process 8 chunks per flag byte
-            for bit in range(8):
-                if pos >= compressed_end or len(result) >= decompressed_size:
-                    break
-
-                # MSB-first: bit 7 first, bit 0 last
-                if flag & (0x80 >> bit):
-                    # Compressed: back-reference
-                    if pos + 1 >= compressed_end:
-                        break
-                    
-                    b1 = data[pos]
-                    b2 = data[pos + 1]
-                    pos += 2
-                    
-                    # Standard Nintendo LZ77 format:
-                    length = ((b1 >> 4) & 0x0F) + 3
-                    offset = ((b1 & 0x0F) << 8) | b2
-                    offset += 1
-                    
-                    for _ in range(length):
-                        if len(result) >= offset:
-                            result.append(result[-offset])
-                        else:
-                            result.append(0)
-                else:
-                    # Literal byte
-                    if pos >= compressed_end:
-                        break
-                    result.append(data[pos])
-                    pos += 1
-
-        # Append uncompressed Sequence data if present
-        if uncompressed_offset > 16 and uncompressed_offset < len(data):
-            result.extend(data[uncompressed_offset:])
-        
-        return bytes(result) if len(result) > 0 else None
 
-    except Exception as e:
-        print(f"Decompression error: {str(e)}")
-        return None
+    The token loop runs on the active :mod:`app.core.lz77` decode backend.
+    """
+    return decompress_flag_byte(data)
 
 def save_metadata(output_path: str, png_start: int, png_data: bytes, original_file: str = None, extra_info: dict = None) -> None:
     """Save metadata for any extracted PNG file."""
@@ -264,17 +211,37 @@ def repack_png(json_path: str, modified_png_path: str, output_path: str) -> bool
         # Strip metadata from PNG
         stripped_png = strip_metadata_png(png_data)
         
-        # Handle size differences
-        if len(stripped_png) < length:
+        # Offsets in the metadata point into the decompressed buffer, so
+        # LZ77-wrapped originals are spliced after decoding and re-encoded.
+        compressed = original_data.startswith(b'LZ77')
+        if compressed:
+            container = decompress_lz77(original_data)
+            if container is None:
+                print("Error: Could not decompress original LZ77 file")
+                return False
+            tail_offset = struct.unpack_from('<I', original_data, 12)[0]
+            tail_length = len(original_data) - tail_offset if 16 < tail_offset < len(original_data) else 0
+            payload_length = len(container) - tail_length
+        else:
+            container = original_data
+            
+        # Handle size differences. A PNG that runs to the end of its
+        # container may grow or shrink freely; anything else keeps its slot.
+        tail_slot = offset + length == len(container)
+        if len(stripped_png) < length and not tail_slot:
             stripped_png += b'\x00' * (length - len(stripped_png))
-        elif len(stripped_png) > length:
+        elif len(stripped_png) > length and not tail_slot:
             raise ValueError(
                 f"Modified PNG ({len(stripped_png)} bytes) exceeds original size ({length} bytes)"
             )
             
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        new_data = original_data[:offset] + stripped_png + original_data[offset + length:]
+        new_data = container[:offset] + stripped_png + container[offset + length:]
+        if compressed:
+            boundary = min(payload_length, len(new_data))
+            new_data = compress(new_data[:boundary], "flag_byte",
+                                trailing=new_data[boundary:], template=original_data)
         
         with open(output_path, 'wb') as out_file:
             out_file.write(new_data)
@@ -456,6 +423,11 @@ def main():
                               'fnt    - Extract font files\n'
                               'all    - Process all supported files'))
 
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        default=0,
+                        help='Worker processes for directory extraction (default: 0 = one per CPU core)')
+
     parser.add_argument('-v', '--verbose',
                         action='store_true',
                         help='Show detailed processing information')
@@ -530,14 +502,17 @@ def main():
             print(f"\nProcessing {len(all_files)} files...")
             print(f"Extracting to: {output_dir}")
 
+            # Imported here because batch_extract itself imports this module
+            from app.core.batch_extract import ExtractionJob, iter_extract
+
+            jobs = [ExtractionJob(fpath, output_dir, os.path.relpath(fpath, input_dir)) for fpath in all_files]
             success_count = 0
-            for fpath in all_files:
-                # Pass input_dir to preserve directory structure
-                if process_file(fpath, output_dir, args.type):
+            for result in iter_extract(jobs, args.type, max_workers=args.jobs or None):
+                print(result.log, end='')
+                if result.success:
                     success_count += 1
                     if args.verbose:
-                        rel_path = os.path.relpath(fpath, input_dir)
-                        print(f"Processed: {rel_path}")
+                        print(f"Processed: {result.rel_path}")
 
             print(f"\nResults: {success_count}/{len(all_files)} successful")
 
@@ -0,0 +1,333 @@
+"""
+Shared memory-mapped view of the game executable.
+
+The text tools, the debug scanner and the hex patcher all read the same
+exe.  :func:`open_exe_image` maps it once per path and hands every caller
+the same :class:`ExeImage`, so the file is paged in once per session and
+re-mapped only when it changes on disk.
+
+An image parses the PE headers and section table, serves range reads,
+searches for many byte patterns in a single pass and, when opened
+writable, records every write in a change journal that can be reverted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+from typing import Iterable
+
+
+_COFF_HEADER = struct.Struct("<HHIIIHH")
+_SECTION_HEADER = struct.Struct("<8sIIIIIIHHI")
+_PE32_MAGIC = 0x10B
+_PE32_PLUS_MAGIC = 0x20B
+
+
+@dataclass(slots=True, frozen=True)
+class PESection:
+    name: str
+    virtual_address: int
+    virtual_size: int
+    raw_offset: int
+    raw_size: int
+    characteristics: int
+
+    def contains_offset(self, offset: int) -> bool:
+        return self.raw_offset <= offset < self.raw_offset + self.raw_size
+
+    def contains_rva(self, rva: int) -> bool:
+        return self.virtual_address <= rva < self.virtual_address + max(self.virtual_size, self.raw_size)
+
+
+@dataclass(slots=True, frozen=True)
+class PEHeader:
+    machine: int
+    timestamp: int
+    is_64bit: bool
+    image_base: int
+    entry_point: int
+    sections: tuple[PESection, ...] = ()
+
+
+@dataclass(slots=True, frozen=True)
+class ExeChange:
+    offset: int
+    before: bytes
+    after: bytes
+
+
+def _parse_pe(data) -> PEHeader | None:
+    """Headers and section table of a PE image, or None if *data* is not one."""
+    try:
+        if bytes(data[:2]) != b"MZ":
+            return None
+        pe_offset = struct.unpack_from("<I", data, 0x3C)[0]
+        if bytes(data[pe_offset:pe_offset + 4]) != b"PE\0\0":
+            return None
+        machine, section_count, timestamp, _symbols, _symbol_count, optional_size, _flags = (
+            _COFF_HEADER.unpack_from(data, pe_offset + 4)
+        )
+        optional = pe_offset + 4 + _COFF_HEADER.size
+        magic, = struct.unpack_from("<H", data, optional)
+        entry_point, = struct.unpack_from("<I", data, optional + 16)
+        if magic == _PE32_PLUS_MAGIC:
+            image_base, = struct.unpack_from("<Q", data, optional + 24)
+        elif magic == _PE32_MAGIC:
+            image_base, = struct.unpack_from("<I", data, optional + 28)
+        else:
+            return None
+
+        sections = []
+        table = optional + optional_size
+        for i in range(section_count):
+            name, virtual_size, virtual_address, raw_size, raw_offset, *_rest, characteristics = (
+                _SECTION_HEADER.unpack_from(data, table + i * _SECTION_HEADER.size)
+            )
+            sections.append(PESection(
+                name=name.rstrip(b"\0").decode("ascii", errors="replace"),
+                virtual_address=virtual_address,
+                virtual_size=virtual_size,
+                raw_offset=raw_offset,
+                raw_size=raw_size,
+                characteristics=characteristics,
+            ))
+    except struct.error:
+        return None
+    return PEHeader(machine, timestamp, magic == _PE32_PLUS_MAGIC, image_base, entry_point, tuple(sections))
+
+
+@lru_cache(maxsize=32)
+def _pattern_set(patterns: tuple[bytes, ...]) -> tuple[re.Pattern, dict[bytes, tuple[bytes, ...]]]:
+    """Alternation regex over *patterns* plus, per pattern, the patterns it starts with.
+
+    Alternatives are tried longest first, so where several patterns match at
+    the same offset the regex reports the longest and the others are exactly
+    its prefixes.
+    """
+    ordered = sorted(set(patterns), key=len, reverse=True)
+    regex = re.compile(b"|".join(re.escape(pattern) for pattern in ordered))
+    prefixes = {
+        pattern: tuple(other for other in ordered if len(other) <= len(pattern) and pattern.startswith(other))
+        for pattern in ordered
+    }
+    return regex, prefixes
+
+
+class ExeImage:
+    """Memory map of an executable with PE metadata, search and a change journal.
+
+    Read-only images are normally obtained through :func:`open_exe_image`
+    and shared; open one with ``writable=True`` to patch the file in place.
+    Writes go straight to the mapped file and each one is recorded in
+    :attr:`journal` with the bytes it replaced.
+    """
+
+    def __init__(self, path: str | os.PathLike, writable: bool = False) -> None:
+        self.path = os.path.abspath(os.fspath(path))
+        self.writable = writable
+        self.journal: list[ExeChange] = []
+        self._digest: str | None = None
+        self._map: mmap.mmap | None = None
+
+        with open(self.path, "r+b" if writable else "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            self.size = stat.st_size
+            self.stat_key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            if self.size:
+                access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+                self._map = mmap.mmap(handle.fileno(), 0, access=access)
+        self.pe = _parse_pe(self.data)
+
+    def __enter__(self) -> ExeImage:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def data(self):
+        """The mapped bytes, usable wherever a buffer is accepted (regex, hashlib, slicing)."""
+        return self._map if self._map is not None else b""
+
+    @property
+    def closed(self) -> bool:
+        return self.size > 0 and (self._map is None or self._map.closed)
+
+    @property
+    def sections(self) -> tuple[PESection, ...]:
+        return self.pe.sections if self.pe else ()
+
+    def close(self) -> None:
+        if self._map is not None and not self._map.closed:
+            if self.writable:
+                self._map.flush()
+            self._map.close()
+        if self.journal:
+            _forget_digest(self.path)
+
+    def is_stale(self) -> bool:
+        """True once the file on disk is no longer the one that was mapped."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return (stat.st_size, stat.st_mtime_ns, stat.st_ino) != self.stat_key
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Up to *length* bytes at *offset* (fewer at the end of the file)."""
+        return bytes(self.data[offset:offset + length])
+
+    def digest(self) -> str:
+        """blake2b content hash, computed once per mapping while nothing is written."""
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.data, digest_size=16).hexdigest()
+        return self._digest
+
+    def section_at(self, offset: int) -> PESection | None:
+        for section in self.sections:
+            if section.contains_offset(offset):
+                return section
+        return None
+
+    def offset_to_va(self, offset: int) -> int | None:
+        """Virtual address a file offset is loaded at, or None outside every section."""
+        section = self.section_at(offset)
+        if section is None:
+            return None
+        return self.pe.image_base + section.virtual_address + offset - section.raw_offset
+
+    def va_to_offset(self, address: int) -> int | None:
+        """File offset backing a virtual address, or None if it has no file data."""
+        if self.pe is None:
+            return None
+        rva = address - self.pe.image_base
+        for section in self.sections:
+            if section.contains_rva(rva):
+                offset = rva - section.virtual_address
+                return section.raw_offset + offset if offset < section.raw_size else None
+        return None
+
+    def find(self, pattern: bytes, start: int = 0, end: int | None = None) -> int:
+        return self.data.find(pattern, start, self.size if end is None else end)
+
+    def iter_matches(self, patterns: Iterable[bytes], start: int = 0, end: int | None = None):
+        """Yield ``(offset, pattern)`` for every occurrence of any of *patterns*.
+
+        The buffer is searched once with a compiled alternation, and every
+        match resumes the search one byte further on, so overlapping
+        occurrences are all reported, in offset order.
+        """
+        patterns = tuple(pattern for pattern in patterns if pattern)
+        if not patterns or not self.size:
+            return
+        regex, prefixes = _pattern_set(patterns)
+        end = self.size if end is None else end
+        search = regex.search
+        data = self.data
+        while True:
+            match = search(data, start, end)
+            if match is None:
+                return
+            for pattern in prefixes[match.group()]:
+                yield match.start(), pattern
+            start = match.start() + 1
+
+    def find_all(self, patterns: Iterable[bytes]) -> dict[bytes, list[int]]:
+        """Every offset of each pattern, in a single pass over the image."""
+        patterns = list(patterns)
+        found: dict[bytes, list[int]] = {pattern: [] for pattern in patterns}
+        for offset, pattern in self.iter_matches(patterns):
+            found[pattern].append(offset)
+        return found
+
+    def contains(self, patterns: Iterable[bytes]) -> dict[bytes, bool]:
+        """Which patterns occur at all; stops scanning once every one was seen."""
+        patterns = list(patterns)
+        missing = {pattern for pattern in patterns if pattern}
+        found = {pattern: False for pattern in patterns}
+        for _offset, pattern in self.iter_matches(missing):
+            found[pattern] = True
+            missing.discard(pattern)
+            if not missing:
+                break
+        return found
+
+    def write(self, offset: int, data: bytes) -> bool:
+        """Write *data* at *offset*; returns False (and records nothing) if it is already there."""
+        if not self.writable:
+            raise PermissionError(f"{self.path} is mapped read-only")
+        end = offset + len(data)
+        if offset < 0 or end > self.size:
+            raise ValueError(f"Write 0x{offset:X}-0x{end:X} is outside the file (0x{self.size:X} bytes)")
+        before = self._map[offset:end]
+        if before == data:
+            return False
+        self._map[offset:end] = data
+        self.journal.append(ExeChange(offset, before, bytes(data)))
+        self._digest = None
+        return True
+
+    def revert(self) -> int:
+        """Undo every journaled write, newest first; returns how many were undone."""
+        count = len(self.journal)
+        while self.journal:
+            change = self.journal.pop()
+            self._map[change.offset:change.offset + len(change.before)] = change.before
+        self._digest = None
+        return count
+
+    def flush(self) -> None:
+        if self._map is not None and self.writable:
+            self._map.flush()
+
+
+_shared_images: dict[str, ExeImage] = {}
+_shared_lock = threading.Lock()
+
+
+def _forget_digest(path: str) -> None:
+    # The shared mapping sees writes made through another image of the same
+    # file, but its cached hash does not
+    image = _shared_images.get(path)
+    if image is not None:
+        image._digest = None
+
+
+def open_exe_image(path: str | os.PathLike) -> ExeImage:
+    """Shared read-only image of *path*, re-mapped if the file changed since.
+
+    Do not close the returned image; use :func:`release_exe_image` before
+    replacing or truncating the file, which Windows refuses while it is
+    mapped.
+    """
+    key = os.path.abspath(os.fspath(path))
+    with _shared_lock:
+        image = _shared_images.get(key)
+        if image is not None and not image.closed and not image.is_stale():
+            return image
+        image = ExeImage(key)
+        _shared_images[key] = image
+        return image
+
+
+def release_exe_image(path: str | os.PathLike | None = None) -> None:
+    """Unmap the shared image of *path*, or of every path if None."""
+    with _shared_lock:
+        if path is None:
+            keys = list(_shared_images)
+        else:
+            keys = [os.path.abspath(os.fspath(path))]
+        for key in keys:
+            image = _shared_images.pop(key, None)
+            if image is not None:
+                image.close()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass, field
+import os
 from pathlib import Path
 import re
-from typing import Any
+import struct
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 
 from .cell_parser import (
+    CellHeader,
     parse_cell_chunks,
     parse_cell_header,
     parse_cell_map,
@@ -14,14 +17,36 @@ from .cell_parser import (
     summarize_record_decoding,
     summarize_records,
 )
+from .exe_image import open_exe_image
 from .lz77 import CellLZ77Info as LZ77Info, decompress as _decompress_lz77
+from .process_pool import default_workers, iter_pool_results, put_result
 from .texture_parser import parse_palette_chunk, parse_texture_parts_chunk, summarize_texture_parts
 
+if TYPE_CHECKING:
+    from .scan_cache import ScanCache
+
 
 PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 PNG_END = b"IEND\xaeB`\x82"
 MAP_ID_RE = re.compile(r"^F_(\d{2})_")
 
+# Scan tiers, cheapest first.  "quick" reads only the head of a file for
+# its signature and LZ77/Cell header fields, "standard" reads the whole
+# file, decompresses it and adds PNG counts and the Cell chunk table, and
+# "deep" adds record, map and texture summaries.
+SCAN_QUICK = "quick"
+SCAN_STANDARD = "standard"
+SCAN_DEEP = "deep"
+SCAN_TIERS = (SCAN_QUICK, SCAN_STANDARD, SCAN_DEEP)
+QUICK_SCAN_BYTES = 0x200
+
+# Map scans are chunked across worker processes like batch extraction
+_SCAN_CHUNKS_PER_WORKER = 4
+_SCAN_MAX_CHUNK_SIZE = 16
+# Below this many bytes to analyse, starting worker processes costs more
+# than it saves, so the scan runs in-process
+_SCAN_PARALLEL_MIN_BYTES = 8 << 20
+
 
 @dataclass(slots=True)
 class FileInsight:
@@ -30,7 +55,7 @@ class FileInsight:
     extension: str
     size: int
     signature: str
-    png_count: int = 0
+    png_count: int | None = 0
     lz77: dict[str, Any] | None = None
     decompressed_signature: str | None = None
     cell_fields: dict[str, Any] | None = None
@@ -39,6 +64,7 @@ class FileInsight:
     cell_map: dict[str, Any] | None = None
     cell_texture: dict[str, Any] | None = None
     parse_error: str | None = None
+    tier: str = SCAN_DEEP
 
 
 @dataclass(slots=True)
@@ -96,19 +122,30 @@ def _decompress_lz77_cell(data: bytes) -> tuple[bytes, LZ77Info | None]:
     return _decompress_lz77(data, variant="cell")
 
 
-def parse_cell_fields(buf: bytes) -> dict[str, Any]:
-    header = parse_cell_header(buf)
-    records = parse_cell_records(buf, header)
+def scan_tier_rank(tier: str) -> int:
+    """Position of *tier* in :data:`SCAN_TIERS`; a higher rank has every field of a lower one."""
+    try:
+        return SCAN_TIERS.index(tier)
+    except ValueError:
+        raise ValueError(f"Unknown scan tier: {tier!r}") from None
+
+
+def _cell_header_fields(header: CellHeader) -> dict[str, Any]:
     return {
         "table_offset": header.table_offset,
         "entry_count": header.entry_count,
         "grid_width": header.grid_width,
         "grid_height": header.grid_height,
         "grid_cells": header.grid_width * header.grid_height,
-        **summarize_records(records),
     }
 
 
+def parse_cell_fields(buf: bytes) -> dict[str, Any]:
+    header = parse_cell_header(buf)
+    records = parse_cell_records(buf, header)
+    return {**_cell_header_fields(header), **summarize_records(records)}
+
+
 def extract_cell_metadata(
     buf: bytes,
 ) -> tuple[dict[str, Any], list[str], dict[str, Any], dict[str, Any] | None, dict[str, Any] | None]:
@@ -125,14 +162,7 @@ def extract_cell_metadata(
         if palette_chunk is not None:
             texture_summary["palette_count"] = len(parse_palette_chunk(buf, palette_chunk))
     return (
-        {
-            "table_offset": header.table_offset,
-            "entry_count": header.entry_count,
-            "grid_width": header.grid_width,
-            "grid_height": header.grid_height,
-            "grid_cells": header.grid_width * header.grid_height,
-            **summarize_records(records),
-        },
+        {**_cell_header_fields(header), **summarize_records(records)},
         [chunk.name for chunk in chunks],
         summarize_record_decoding(records),
         summarize_map(cell_map, header.entry_count) if cell_map else None,
@@ -140,66 +170,208 @@ def extract_cell_metadata(
     )
 
 
-def analyze_file(path: Path, root: Path) -> FileInsight:
-    data = path.read_bytes()
+def _read_lz77_header(head: bytes) -> dict[str, Any] | None:
+    """raw_size/token_count/data_offset of a cell LZ77 container, without decompressing it."""
+    if len(head) < 0x10:
+        return None
+    raw_size, token_count, data_offset = struct.unpack_from("<III", head, 0x04)
+    return {"raw_size": raw_size, "token_count": token_count, "data_offset": data_offset}
+
+
+def _analyze_cell(insight: FileInsight, buf: bytes, tier: str) -> None:
+    if tier == SCAN_DEEP:
+        (
+            insight.cell_fields,
+            insight.cell_chunks,
+            insight.cell_records,
+            insight.cell_map,
+            insight.cell_texture,
+        ) = extract_cell_metadata(buf)
+        return
+    header = parse_cell_header(buf)
+    insight.cell_fields = _cell_header_fields(header)
+    if tier == SCAN_STANDARD:
+        insight.cell_chunks = [chunk.name for chunk in parse_cell_chunks(buf, header)]
+
+
+def analyze_file(path: Path, root: Path, tier: str = SCAN_DEEP) -> FileInsight:
+    """Describe one game file at the given scan *tier* (see :data:`SCAN_TIERS`).
+
+    A quick scan reads only the first :data:`QUICK_SCAN_BYTES` bytes, so
+    it leaves ``png_count`` as None and reports LZ77 files by their
+    container header alone.
+    """
+    scan_tier_rank(tier)
+    with path.open("rb") as handle:
+        data = handle.read(QUICK_SCAN_BYTES) if tier == SCAN_QUICK else handle.read()
+        size = os.fstat(handle.fileno()).st_size
     signature = detect_signature(data[:0x40])
     insight = FileInsight(
         path=str(path),
         relative_path=str(path.relative_to(root)),
         extension=path.suffix.lower(),
-        size=path.stat().st_size,
+        size=size,
         signature=signature,
-        png_count=count_pngs(data),
+        png_count=None if tier == SCAN_QUICK else count_pngs(data),
+        tier=tier,
     )
 
     try:
         if signature == "LZ77":
+            if tier == SCAN_QUICK:
+                insight.lz77 = _read_lz77_header(data)
+                return insight
             decompressed, info = _decompress_lz77_cell(data)
             assert info is not None
             insight.lz77 = asdict(info)
             insight.decompressed_signature = detect_signature(decompressed[:0x40])
             if insight.decompressed_signature == "Cell":
-                (
-                    insight.cell_fields,
-                    insight.cell_chunks,
-                    insight.cell_records,
-                    insight.cell_map,
-                    insight.cell_texture,
-                ) = extract_cell_metadata(decompressed)
+                _analyze_cell(insight, decompressed, tier)
         elif signature == "Cell":
-            (
-                insight.cell_fields,
-                insight.cell_chunks,
-                insight.cell_records,
-                insight.cell_map,
-                insight.cell_texture,
-            ) = extract_cell_metadata(data)
+            _analyze_cell(insight, data, tier)
     except Exception as exc:
         insight.parse_error = str(exc)
 
     return insight
 
 
-def scan_map_groups(game_dir: Path) -> list[MapGroup]:
+def default_scan_workers() -> int:
+    """Number of worker processes :func:`iter_map_insights` uses when none is requested."""
+    return default_workers()
+
+
+def list_map_files(game_dir: Path) -> list[tuple[str, Path]]:
+    """``(map_id, path)`` for every file :func:`scan_map_groups` analyses, in report order.
+
+    Uses the loaded GameData index of *game_dir* when there is one instead
+    of walking the folders; indexed files deleted since are skipped.
+    """
+    from .gamedata_index import get_gamedata_index
+
     field_map = game_dir / "GameData" / "app" / "Field" / "Map"
     field_chizu = game_dir / "GameData" / "app" / "Field" / "Chizu"
+    index = get_gamedata_index(game_dir)
+    if index is not None:
+        map_files = sorted(path for path in index.paths("GameData/app/Field/Map/") if path.is_file())
+        chizu_files = sorted(path for path in index.paths("GameData/app/Field/Chizu/") if path.is_file())
+    else:
+        map_files = [path for path in sorted(field_map.rglob("*")) if path.is_file()]
+        chizu_files = [path for path in sorted(field_chizu.rglob("*")) if path.is_file()] if field_chizu.exists() else []
+
+    files: list[tuple[str, Path]] = []
+    for file_path in map_files:
+        match = MAP_ID_RE.match(file_path.name)
+        files.append((match.group(1) if match else "misc", file_path))
+    files.extend(("chizu", file_path) for file_path in chizu_files)
+    return files
+
+
+def _analyze_chunk(paths: list[str], root: str, tier: str) -> int:
+    for path in paths:
+        put_result(analyze_file(Path(path), Path(root), tier))
+    return len(paths)
+
+
+def _iter_analyze(
+    paths: list[Path],
+    root: Path,
+    max_workers: int | None,
+    should_cancel: Callable[[], bool] | None,
+    tier: str = SCAN_DEEP,
+) -> Iterator[FileInsight]:
+    """Run :func:`analyze_file` over *paths*, yielding insights in completion order."""
+    workers = min(max_workers or default_scan_workers(), len(paths))
+    # Quick scans only read file heads, which never pays for a process pool
+    if tier == SCAN_QUICK:
+        workers = 1
+    elif workers > 1 and sum(path.stat().st_size for path in paths) < _SCAN_PARALLEL_MIN_BYTES:
+        workers = 1
+    if workers <= 1:
+        for path in paths:
+            if should_cancel and should_cancel():
+                return
+            yield analyze_file(path, root, tier)
+        return
+
+    # Same pool as batch_extract: chunked tasks and a result queue so every
+    # file is reported the moment it is analysed.
+    size = max(1, min(_SCAN_MAX_CHUNK_SIZE, len(paths) // (workers * _SCAN_CHUNKS_PER_WORKER)))
+    chunks = [
+        ([str(path) for path in paths[start:start + size]], str(root), tier)
+        for start in range(0, len(paths), size)
+    ]
+    yield from iter_pool_results(_analyze_chunk, chunks, len(paths), workers, should_cancel, "Scan worker")
+
+
+def iter_map_insights(
+    game_dir: Path,
+    cache: ScanCache | None = None,
+    max_workers: int | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    tier: str = SCAN_DEEP,
+) -> Iterator[tuple[str, FileInsight]]:
+    """Analyse every Field/Map and Field/Chizu file, yielding ``(map_id, insight)``.
+
+    Files are analysed at *tier*; a cached insight of that tier or a
+    higher one counts as a hit.
+
+    Cache hits are yielded first, straight from *cache* on the calling
+    thread; the remaining files are analysed across a process pool and
+    yielded in completion order, then stored in the cache.  Once
+    *should_cancel* returns True no new files are started and iteration
+    stops; the cache is only pruned after a complete scan.
+    """
+    files = list_map_files(game_dir)
+    map_ids: dict[str, str] = {}
+    misses: list[Path] = []
+    for map_id, file_path in files:
+        if should_cancel and should_cancel():
+            return
+        insight = cache.lookup(file_path, game_dir, tier) if cache is not None else None
+        if insight is not None:
+            yield map_id, insight
+            continue
+        map_ids[str(file_path)] = map_id
+        misses.append(file_path)
+
+    remaining = len(misses)
+    for insight in _iter_analyze(misses, game_dir, max_workers, should_cancel, tier):
+        if cache is not None:
+            cache.store(Path(insight.path), game_dir, insight)
+        remaining -= 1
+        yield map_ids[insight.path], insight
+
+    if cache is not None and not remaining:
+        cache.prune(game_dir)
+
+
+def scan_map_groups(
+    game_dir: Path,
+    cache: ScanCache | None = None,
+    max_workers: int | None = None,
+    on_insight: Callable[[FileInsight], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    tier: str = SCAN_DEEP,
+) -> list[MapGroup]:
+    """Group :func:`iter_map_insights` results by map id, in file order.
+
+    *on_insight* is called for each file as it finishes, e.g. to emit a Qt
+    signal from a worker thread.  A cancelled scan returns the files
+    analysed so far.
+    """
     groups: dict[str, MapGroup] = {}
+    for map_id, insight in iter_map_insights(game_dir, cache, max_workers, should_cancel, tier):
+        if on_insight:
+            on_insight(insight)
+        groups.setdefault(map_id, MapGroup(map_id=map_id)).files.append(insight)
 
-    for file_path in sorted(field_map.rglob("*")):
-        if not file_path.is_file():
-            continue
-        match = MAP_ID_RE.match(file_path.name)
-        map_id = match.group(1) if match else "misc"
-        groups.setdefault(map_id, MapGroup(map_id=map_id))
-        groups[map_id].files.append(analyze_file(file_path, game_dir))
+    for group in groups.values():
+        group.files.sort(key=lambda insight: Path(insight.relative_path))
+    return [groups[key] for key in sorted(groups)]
 
-    if field_chizu.exists():
-        groups.setdefault("chizu", MapGroup(map_id="chizu"))
-        for file_path in sorted(field_chizu.rglob("*")):
-            if file_path.is_file():
-                groups["chizu"].files.append(analyze_file(file_path, game_dir))
 
-    return [groups[key] for key in sorted(groups)]
+def _format_bytes(data: bytes) -> str:
+    return " ".join(f"{byte:02X}" for byte in data)
 
 
 def read_bytes_at(path: Path, offset: int, length: int = 8) -> str | None:
@@ -208,13 +380,13 @@ def read_bytes_at(path: Path, offset: int, length: int = 8) -> str | None:
     with path.open("rb") as handle:
         handle.seek(offset)
         data = handle.read(length)
-    return " ".join(f"{byte:02X}" for byte in data)
+    return _format_bytes(data)
 
 
 def analyze_debug(game_dir: Path) -> DebugInsight:
     exe = game_dir / "DOKAPON! Sword of Fury.exe"
     backup = game_dir / "DOKAPON! Sword of Fury.exe.bak"
-    data = exe.read_bytes()
+    image = open_exe_image(exe)
     markers = [
         b"DebugPlayBattle",
         b"DEBUGPLAY",
@@ -230,9 +402,9 @@ def analyze_debug(game_dir: Path) -> DebugInsight:
     states = [
         DebugOffsetState(
             offset_hex=f"0x{offset:X}",
-            current_bytes=read_bytes_at(exe, offset) or "",
+            current_bytes=_format_bytes(image.read(offset, 8)),
             backup_bytes=read_bytes_at(backup, offset),
-            matches_backup_expected=(read_bytes_at(backup, offset, len(expected)) == " ".join(f"{b:02X}" for b in expected))
+            matches_backup_expected=(read_bytes_at(backup, offset, len(expected)) == _format_bytes(expected))
             if backup.exists()
             else False,
         )
@@ -243,7 +415,9 @@ def analyze_debug(game_dir: Path) -> DebugInsight:
     return DebugInsight(
         exe_path=str(exe),
         backup_path=str(backup) if backup.exists() else None,
-        markers_found={marker.decode("ascii", errors="replace"): marker in data for marker in markers},
+        markers_found={
+            marker.decode("ascii", errors="replace"): found for marker, found in image.contains(markers).items()
+        },
         offsets=states,
         has_debug_assets=bool(debug_assets),
         debug_assets=debug_assets,
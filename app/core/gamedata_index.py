@@ -0,0 +1,527 @@
+"""
+Prebuilt binary index of a game folder.
+
+Every tab used to rediscover the game folder on its own: the asset
+browser, the map file list and the video tab each walked the tree and the
+scanner re-read files to classify them.  The index is built once, stored
+in the user cache directory and afterwards updated incrementally: a
+refresh only stats the tree and re-reads files whose size or mtime
+changed.
+
+Per file it records the type signature, size and mtime, the LZ77 variant
+and decompressed size, the offsets of embedded PNGs, the Cell chunk table
+and a content hash.  The file is a fixed-width layout that is memory
+mapped as is, so loading an index costs nothing at startup and entries
+are only decoded when they are looked up:
+
+* header (``_HEADER``)
+* one ``_RECORD`` per file, sorted by relative path
+* ``_PNG_SPAN`` and ``_CHUNK`` tables the records point into
+* a string table with the UTF-8 relative paths
+
+Run ``python -m app.core.gamedata_index <game dir>`` to build or refresh
+the index from the command line.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable
+
+from .cell_parser import parse_cell_chunks, parse_cell_header
+from .game_scanner import PNG_END, PNG_SIGNATURE, detect_signature
+from .lz77 import decompress as _decompress_lz77, peek_header as peek_lz77_header
+from .scan_cache import user_cache_dir
+
+
+GAMEDATA_INDEX_MAGIC = b"DKGI"
+# Bump whenever the layout or what gets recorded per file changes; older
+# index files are then rebuilt from scratch.
+GAMEDATA_INDEX_VERSION = 1
+GAMEDATA_INDEX_DIRNAME = "gamedata"
+GAMEDATA_INDEX_SUFFIX = ".idx"
+
+_HEADER = struct.Struct("<4sIIIIIIII")
+_RECORD = struct.Struct("<IHBBBBHQQQIIII16s")
+_PNG_SPAN = struct.Struct("<QI")
+_CHUNK = struct.Struct("<20sII")
+
+FILE_TYPES = ("Unknown", "LZ77", "Sequence", "Texture", "Filename", "Cell")
+LZ77_VARIANTS = ("flag_byte", "token_stream", "cell")
+_NONE = 0xFF
+_FLAG_PARSE_ERROR = 0x01
+
+
+@dataclass(slots=True, frozen=True)
+class IndexedChunk:
+    """One Cell chunk; offsets are into the decompressed Cell container."""
+    name: str
+    offset: int
+    size: int
+
+
+@dataclass(slots=True)
+class IndexedFile:
+    relative_path: str
+    size: int
+    mtime_ns: int
+    file_type: str
+    content_hash: str
+    # Size after LZ77 decompression; equal to size for uncompressed files
+    decompressed_size: int
+    lz77_variant: str | None = None
+    # Signature of the decompressed data, for cell-variant LZ77 files
+    inner_type: str | None = None
+    # (offset, length) of every embedded PNG; length 0 if IEND is missing
+    png_spans: tuple[tuple[int, int], ...] = ()
+    chunks: tuple[IndexedChunk, ...] = ()
+    parse_error: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.relative_path.rsplit("/", 1)[-1]
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.name)[1].lower()
+
+
+@dataclass(slots=True)
+class GameDataIndexStats:
+    files: int = 0
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.updated + self.removed
+
+
+class GameDataIndex:
+    """Read-only view of an index file.
+
+    Lookups decode records straight from the mapping.  Every method returns
+    complete lists rather than iterators, so a refresh that replaces the
+    file cannot invalidate a result half way through.  Once a refresh has
+    replaced an index, lookups on the old object are answered by the new
+    one.
+    """
+
+    def __init__(self, path: str | os.PathLike, root: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self.root = Path(os.path.abspath(os.fspath(root)))
+        self._lock = threading.RLock()
+        self._map: mmap.mmap | None = None
+        self._replacement: GameDataIndex | None = None
+        with open(self.path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            if stat.st_size < _HEADER.size:
+                raise ValueError(f"{self.path} is not a GameData index")
+            # When the index was written; folders changed later may differ from it
+            self.mtime_ns = stat.st_mtime_ns
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, version, self._count, _png_count, _chunk_count,
+            self._records, self._pngs, self._chunks, self._strings,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != GAMEDATA_INDEX_MAGIC or version != GAMEDATA_INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {GAMEDATA_INDEX_VERSION} GameData index")
+
+    def __enter__(self) -> GameDataIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, relative_path: str) -> bool:
+        return self.get(relative_path) is not None
+
+    @property
+    def closed(self) -> bool:
+        return self._map is None or self._map.closed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None and not self._map.closed:
+                self._map.close()
+
+    def _replace_with(self, index: GameDataIndex) -> None:
+        """Unmap this index and forward later lookups to *index*."""
+        with self._lock:
+            self._replacement = index
+            self.close()
+
+    def _check_open(self) -> mmap.mmap:
+        if self.closed:
+            raise ValueError(f"GameData index {self.path} is closed")
+        return self._map
+
+    def _path_at(self, i: int) -> str:
+        data = self._map
+        offset, length = struct.unpack_from("<IH", data, self._records + i * _RECORD.size)
+        start = self._strings + offset
+        return data[start:start + length].decode("utf-8")
+
+    def _lower_bound(self, relative_path: str) -> int:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._path_at(middle) < relative_path:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _decode(self, i: int) -> IndexedFile:
+        data = self._map
+        (
+            _path_offset, _path_length, file_type, inner_type, variant, flags, _reserved,
+            size, mtime_ns, decompressed_size, png_start, png_count, chunk_start, chunk_count, digest,
+        ) = _RECORD.unpack_from(data, self._records + i * _RECORD.size)
+        png_spans = tuple(
+            _PNG_SPAN.unpack_from(data, self._pngs + (png_start + n) * _PNG_SPAN.size) for n in range(png_count)
+        )
+        chunks = []
+        for n in range(chunk_count):
+            name, offset, chunk_size = _CHUNK.unpack_from(data, self._chunks + (chunk_start + n) * _CHUNK.size)
+            chunks.append(IndexedChunk(name.rstrip(b"\0").decode("utf-8", errors="replace"), offset, chunk_size))
+        return IndexedFile(
+            relative_path=self._path_at(i),
+            size=size,
+            mtime_ns=mtime_ns,
+            file_type=FILE_TYPES[file_type],
+            content_hash=digest.hex(),
+            decompressed_size=decompressed_size,
+            lz77_variant=None if variant == _NONE else LZ77_VARIANTS[variant],
+            inner_type=None if inner_type == _NONE else FILE_TYPES[inner_type],
+            png_spans=png_spans,
+            chunks=tuple(chunks),
+            parse_error=bool(flags & _FLAG_PARSE_ERROR),
+        )
+
+    def relative(self, path: str | os.PathLike) -> str | None:
+        """Index key of *path* ("" for the root), or None if it is outside the game folder."""
+        try:
+            relative = Path(os.path.abspath(os.fspath(path))).relative_to(self.root)
+        except ValueError:
+            return None
+        return relative.as_posix() if relative.parts else ""
+
+    def get(self, relative_path: str) -> IndexedFile | None:
+        with self._lock:
+            if self._replacement is not None:
+                return self._replacement.get(relative_path)
+            self._check_open()
+            i = self._lower_bound(relative_path)
+            if i < self._count and self._path_at(i) == relative_path:
+                return self._decode(i)
+            return None
+
+    def files(self, prefix: str = "", extensions: Iterable[str] | None = None) -> list[IndexedFile]:
+        """Entries whose relative path starts with *prefix*, in path order.
+
+        Use a prefix ending in ``/`` to list a folder.  *extensions* are
+        lower-case suffixes such as ``".mpd"``.
+        """
+        wanted = tuple(extensions) if extensions is not None else None
+        with self._lock:
+            if self._replacement is not None:
+                return self._replacement.files(prefix, wanted)
+            self._check_open()
+            found = []
+            for i in range(self._lower_bound(prefix), self._count):
+                relative_path = self._path_at(i)
+                if not relative_path.startswith(prefix):
+                    break
+                if wanted is None or relative_path.lower().endswith(wanted):
+                    found.append(self._decode(i))
+            return found
+
+    def paths(self, prefix: str = "", extensions: Iterable[str] | None = None) -> list[Path]:
+        """Absolute paths of :meth:`files`."""
+        return [self.root / entry.relative_path for entry in self.files(prefix, extensions)]
+
+
+def _png_spans(data) -> tuple[tuple[int, int], ...]:
+    # Same walk as game_scanner.count_pngs, keeping where each image is
+    spans = []
+    pos = 0
+    while True:
+        start = data.find(PNG_SIGNATURE, pos)
+        if start < 0:
+            return tuple(spans)
+        end = data.find(PNG_END, start)
+        if end < 0:
+            spans.append((start, 0))
+            pos = start + 1
+        else:
+            spans.append((start, end + len(PNG_END) - start))
+            pos = end + len(PNG_END)
+
+
+def index_file(path: Path, relative_path: str, stat: os.stat_result | None = None) -> IndexedFile:
+    """Read one file and describe it for the index."""
+    stat = stat or path.stat()
+    with path.open("rb") as handle:
+        data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+    try:
+        entry = IndexedFile(
+            relative_path=relative_path,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            file_type=detect_signature(data[:0x40]),
+            content_hash=hashlib.blake2b(data, digest_size=16).hexdigest(),
+            decompressed_size=stat.st_size,
+            png_spans=_png_spans(data),
+        )
+        try:
+            buf = data
+            header = peek_lz77_header(data, path)
+            if header is not None:
+                entry.lz77_variant, entry.decompressed_size = header
+                if entry.lz77_variant == "cell":
+                    buf, _info = _decompress_lz77(bytes(data), variant="cell")
+                    entry.inner_type = detect_signature(buf[:0x40])
+            if buf[:4] == b"Cell":
+                buf = bytes(buf)
+                cell_header = parse_cell_header(buf)
+                entry.chunks = tuple(
+                    IndexedChunk(chunk.name, chunk.offset, chunk.size_total)
+                    for chunk in parse_cell_chunks(buf, cell_header)
+                )
+        except Exception:
+            entry.parse_error = True
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    return entry
+
+
+def _walk(root: Path) -> list[tuple[str, os.DirEntry]]:
+    found = []
+    pending = [(root, "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            relative_path = prefix + entry.name
+            if entry.is_dir():
+                pending.append((Path(entry.path), relative_path + "/"))
+            elif entry.is_file():
+                found.append((relative_path, entry))
+    return found
+
+
+def _serialize(entries: list[IndexedFile]) -> bytes:
+    records = bytearray()
+    pngs = bytearray()
+    chunks = bytearray()
+    strings = bytearray()
+    png_count = chunk_count = 0
+    for entry in entries:
+        encoded = entry.relative_path.encode("utf-8")
+        flags = _FLAG_PARSE_ERROR if entry.parse_error else 0
+        records += _RECORD.pack(
+            len(strings), len(encoded),
+            FILE_TYPES.index(entry.file_type),
+            _NONE if entry.inner_type is None else FILE_TYPES.index(entry.inner_type),
+            _NONE if entry.lz77_variant is None else LZ77_VARIANTS.index(entry.lz77_variant),
+            flags, 0,
+            entry.size, entry.mtime_ns, entry.decompressed_size,
+            png_count, len(entry.png_spans), chunk_count, len(entry.chunks),
+            bytes.fromhex(entry.content_hash),
+        )
+        strings += encoded
+        for offset, length in entry.png_spans:
+            pngs += _PNG_SPAN.pack(offset, length)
+        for chunk in entry.chunks:
+            chunks += _CHUNK.pack(chunk.name.encode("utf-8")[:20], chunk.offset, chunk.size)
+        png_count += len(entry.png_spans)
+        chunk_count += len(entry.chunks)
+
+    records_offset = _HEADER.size
+    pngs_offset = records_offset + len(records)
+    chunks_offset = pngs_offset + len(pngs)
+    strings_offset = chunks_offset + len(chunks)
+    header = _HEADER.pack(
+        GAMEDATA_INDEX_MAGIC, GAMEDATA_INDEX_VERSION, len(entries), png_count, chunk_count,
+        records_offset, pngs_offset, chunks_offset, strings_offset,
+    )
+    return header + records + pngs + chunks + strings
+
+
+def gamedata_index_path(game_dir: str | os.PathLike) -> Path:
+    """Where the index of *game_dir* is kept (in the per-user cache, not the game folder)."""
+    key = hashlib.blake2b(os.path.abspath(os.fspath(game_dir)).encode("utf-8"), digest_size=8).hexdigest()
+    return user_cache_dir() / GAMEDATA_INDEX_DIRNAME / f"{key}{GAMEDATA_INDEX_SUFFIX}"
+
+
+def build_gamedata_index(
+    game_dir: str | os.PathLike,
+    index_path: str | os.PathLike | None = None,
+    previous: GameDataIndex | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> GameDataIndexStats | None:
+    """Write the index of *game_dir*, reusing entries of *previous* whose size and mtime still match.
+
+    Only new and changed files are read.  The file is replaced atomically;
+    on Windows, where a mapped file cannot be replaced, *previous* is closed
+    first if it maps the same file.  *should_cancel* is polled before each
+    file; once it returns True nothing is written and None is returned.
+    """
+    started = time.perf_counter()
+    root = Path(os.path.abspath(os.fspath(game_dir)))
+    index_path = Path(index_path) if index_path is not None else gamedata_index_path(root)
+    known = {entry.relative_path: entry for entry in previous.files()} if previous is not None else {}
+
+    stats = GameDataIndexStats()
+    entries = []
+    for relative_path, dir_entry in sorted(_walk(root), key=lambda item: item[0]):
+        if should_cancel and should_cancel():
+            return None
+        stat = dir_entry.stat()
+        old = known.pop(relative_path, None)
+        if old is not None and old.size == stat.st_size and old.mtime_ns == stat.st_mtime_ns:
+            entries.append(old)
+            continue
+        try:
+            entries.append(index_file(Path(dir_entry.path), relative_path, stat))
+        except OSError:
+            continue
+        if old is None:
+            stats.added += 1
+        else:
+            stats.updated += 1
+    stats.removed = len(known)
+    stats.files = len(entries)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=index_path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(_serialize(entries))
+        if os.name == "nt" and previous is not None and previous.path == index_path:
+            previous.close()
+        os.replace(temp_path, index_path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+_shared_indexes: dict[str, GameDataIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def load_gamedata_index(game_dir: str | os.PathLike) -> GameDataIndex | None:
+    """Shared index of *game_dir* as last built, or None if it was never built.
+
+    Only the index file is mapped; the game folder is not touched, so the
+    result may be out of date until :func:`refresh_gamedata_index` runs.
+    """
+    key = os.path.abspath(os.fspath(game_dir))
+    with _shared_lock:
+        index = _shared_indexes.get(key)
+        if index is not None and not index.closed:
+            return index
+        try:
+            index = GameDataIndex(gamedata_index_path(key), key)
+        except (OSError, ValueError):
+            return None
+        _shared_indexes[key] = index
+        return index
+
+
+def refresh_gamedata_index(
+    game_dir: str | os.PathLike,
+    should_cancel: Callable[[], bool] | None = None,
+) -> GameDataIndexStats | None:
+    """Build or incrementally update the index of *game_dir* and share the result.
+
+    Returns None, leaving the shared index as it was, if cancelled.
+    """
+    key = os.path.abspath(os.fspath(game_dir))
+    previous = load_gamedata_index(key)
+    stats = build_gamedata_index(key, previous=previous, should_cancel=should_cancel)
+    if stats is None:
+        return None
+    index = GameDataIndex(gamedata_index_path(key), key)
+    with _shared_lock:
+        replaced = _shared_indexes.get(key)
+        _shared_indexes[key] = index
+    if replaced is not None:
+        # Callers may still hold the old index; its lookups now go to the new one
+        replaced._replace_with(index)
+    return stats
+
+
+def get_gamedata_index(path: str | os.PathLike) -> GameDataIndex | None:
+    """Already loaded shared index of the game folder containing *path*, if any.
+
+    Never reads the disk, so listing functions can call it on every use
+    and fall back to walking the folder when it returns None.
+    """
+    target = Path(os.path.abspath(os.fspath(path)))
+    with _shared_lock:
+        for key, index in _shared_indexes.items():
+            if not index.closed and (target == index.root or index.root in target.parents):
+                return index
+    return None
+
+
+def release_gamedata_index(game_dir: str | os.PathLike | None = None) -> None:
+    """Unmap the shared index of *game_dir*, or of every folder if None."""
+    with _shared_lock:
+        if game_dir is None:
+            keys = list(_shared_indexes)
+        else:
+            keys = [os.path.abspath(os.fspath(game_dir))]
+        for key in keys:
+            index = _shared_indexes.pop(key, None)
+            if index is not None:
+                index.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or refresh the GameData index of a game folder.")
+    parser.add_argument("game_dir", type=Path, help="Game installation directory")
+    parser.add_argument("--list", metavar="PREFIX", help="Print the indexed files under PREFIX (e.g. GameData/app/)")
+    args = parser.parse_args()
+
+    # Share the registry with the app.core.gamedata_index module the other
+    # tools import, not this __main__ copy.
+    from app.core.gamedata_index import get_gamedata_index as _get, refresh_gamedata_index as _refresh
+
+    result = _refresh(args.game_dir)
+    print(
+        f"{result.files} file(s) indexed in {result.seconds:.2f} s: "
+        f"{result.added} added, {result.updated} updated, {result.removed} removed"
+    )
+    if args.list is not None:
+        for entry in _get(args.game_dir).files(args.list):
+            detail = entry.file_type
+            if entry.lz77_variant:
+                detail += f" {entry.lz77_variant} -> {entry.decompressed_size:,} bytes"
+            if entry.chunks:
+                detail += f" [{', '.join(chunk.name for chunk in entry.chunks)}]"
+            print(f"{entry.relative_path}  {entry.size:,} bytes  {detail}")
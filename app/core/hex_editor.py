@@ -12,12 +12,29 @@ License: Free to use and modify
 """
 
 import os
+import zlib
+import heapq
 import struct
 import shutil
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict
 from pathlib import Path
 
+from app.core.exe_image import ExeImage, open_exe_image, release_exe_image
+
+
+# Undo journal kept next to an executable patched in place
+JOURNAL_SUFFIX = ".hexjournal"
+JOURNAL_MAGIC = b"DKHJ"
+JOURNAL_VERSION = 1
+_JOURNAL_HEADER = struct.Struct(">4sIQ")      # magic, version, range count
+_JOURNAL_RANGE = struct.Struct(">QQII")       # offset, size, original crc32, patched crc32
+
+# Binary diff tuning
+DIFF_BLOCK_SIZE = 1 << 16    # Bytes compared per step
+DIFF_LEAF_SIZE = 64          # Unequal ranges are bisected down to this size
+DIFF_MAX_GAP = 16            # Equal bytes allowed inside one patch (a record header is 16)
+
 
 @dataclass
 class HexPatch:
@@ -49,6 +66,23 @@ class HexPatch:
         return self.offset + self.size
 
 
+@dataclass
+class JournalRange:
+    """Original bytes of one range of an executable patched in place."""
+    offset: int           # Start offset in EXE
+    original: bytes       # Bytes before any patch touched the range
+    original_crc: int     # CRC-32 of original
+    patched_crc: int      # CRC-32 of the range as last written by apply_patches
+    
+    @property
+    def size(self) -> int:
+        return len(self.original)
+    
+    @property
+    def end_offset(self) -> int:
+        return self.offset + len(self.original)
+
+
 @dataclass 
 class PatchConflict:
     """Represents a conflict between two patches."""
@@ -145,55 +179,133 @@ def parse_hex_files(file_paths: List[str]) -> List[HexPatch]:
     all_patches = []
     for path in file_paths:
         try:
-            patches = parse_hex_file(path)
-            all_patches.extend(patches)
+            all_patches.extend(_parse_hex_file_cached(path))
         except Exception as e:
             print(f"Warning: Failed to parse {path}: {e}")
     return all_patches
 
 
+# Parsed patches per .hex path, reused while the file's size and mtime match
+_parse_cache: Dict[str, Tuple[Tuple[int, int], List[HexPatch]]] = {}
+
+
+def _parse_hex_file_cached(path: str) -> List[HexPatch]:
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = _parse_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    patches = parse_hex_file(path)
+    _parse_cache[path] = (key, patches)
+    return patches
+
+
 def detect_conflicts(patches: List[HexPatch]) -> List[PatchConflict]:
     """
     Detect conflicts between patches (overlapping regions).
     
+    Patches are swept in offset order while a heap holds the ones whose
+    range is still open, so every overlapping pair from different files is
+    found in O(n log n + k) for k overlapping pairs, however long a patch
+    is or however many patches it spans.
+    
     Args:
         patches: List of patches to check
         
     Returns:
-        List of PatchConflict objects describing any conflicts found
+        List of PatchConflict objects describing any conflicts found,
+        ordered by the offset of the first patch of each pair
     """
-    conflicts = []
+    pairs = []
     
-    # Sort patches by offset for efficient comparison
+    # Sort patches by offset; ties keep their list order
     sorted_patches = sorted(patches, key=lambda p: p.offset)
+    active = []  # (end_offset, position) of patches still open at the sweep line
     
-    for i, patch1 in enumerate(sorted_patches):
-        for patch2 in sorted_patches[i + 1:]:
+    for position, patch in enumerate(sorted_patches):
+        while active and active[0][0] <= patch.offset:
+            heapq.heappop(active)
+        for _end, earlier in active:
             # Skip patches from the same file
-            if patch1.source_file == patch2.source_file:
-                continue
-            
-            # Check for same offset
-            if patch1.offset == patch2.offset:
-                conflicts.append(PatchConflict(
-                    patch1=patch1,
-                    patch2=patch2,
-                    conflict_type="same_offset"
-                ))
-            # Check for overlap
-            elif patch1.offset < patch2.offset < patch1.end_offset:
-                conflicts.append(PatchConflict(
-                    patch1=patch1,
-                    patch2=patch2,
-                    conflict_type="overlap"
-                ))
-            # Early exit if patch2 is beyond patch1's range
-            elif patch2.offset >= patch1.end_offset:
-                break
+            if sorted_patches[earlier].source_file != patch.source_file:
+                pairs.append((earlier, position))
+        if patch.size > 0:
+            heapq.heappush(active, (patch.end_offset, position))
+    
+    pairs.sort()
+    conflicts = []
+    for earlier, position in pairs:
+        patch1 = sorted_patches[earlier]
+        patch2 = sorted_patches[position]
+        conflicts.append(PatchConflict(
+            patch1=patch1,
+            patch2=patch2,
+            conflict_type="same_offset" if patch1.offset == patch2.offset else "overlap"
+        ))
     
     return conflicts
 
 
+def compile_patches(patches: List[HexPatch],
+                    priority: Optional[Callable[[HexPatch], float]] = None) -> List[HexPatch]:
+    """
+    Compile a patch set into the minimal list of non-overlapping writes.
+    
+    Where patches overlap, each byte comes from the patch with the highest
+    priority; between equal priorities (and by default) the patch later in
+    the list wins, exactly as if the patches were written one after
+    another. Contiguous bytes are then merged into a single write, so the
+    result is sorted by offset, never overlaps, and has no two writes that
+    touch.
+    
+    Args:
+        patches: Patches in precedence order (last wins)
+        priority: Optional numeric priority per patch (higher wins)
+        
+    Returns:
+        List of HexPatch writes; a write assembled from several files
+        names all of them in source_file
+    """
+    order = sorted(
+        (i for i, p in enumerate(patches) if p.size > 0),
+        key=lambda i: patches[i].offset
+    )
+    bounds = sorted({p.offset for p in patches if p.size > 0} |
+                    {p.end_offset for p in patches if p.size > 0})
+    
+    writes = []  # [offset, end_offset, chunks, sources]
+    winners = []  # heap of (-priority, -index, end_offset)
+    next_start = 0
+    for left, right in zip(bounds, bounds[1:]):
+        while next_start < len(order) and patches[order[next_start]].offset <= left:
+            i = order[next_start]
+            rank = priority(patches[i]) if priority else 0
+            heapq.heappush(winners, (-rank, -i, patches[i].end_offset))
+            next_start += 1
+        # Patches that ended are only dropped once they reach the top
+        while winners and winners[0][2] <= left:
+            heapq.heappop(winners)
+        if not winners:
+            continue
+        
+        winner = patches[-winners[0][1]]
+        chunk = winner.data[left - winner.offset:right - winner.offset]
+        if writes and writes[-1][1] == left:
+            writes[-1][1] = right
+            writes[-1][2].append(chunk)
+            if winner.source_file not in writes[-1][3]:
+                writes[-1][3].append(winner.source_file)
+        else:
+            writes.append([left, right, [chunk], [winner.source_file]])
+    
+    compiled = []
+    for offset, _end, chunks, sources in writes:
+        data = b''.join(chunks)
+        source = sources[0] if len(sources) == 1 else " + ".join(os.path.basename(s) for s in sources)
+        compiled.append(HexPatch(offset=offset, size=len(data), data=data, source_file=source))
+    return compiled
+
+
 def validate_patches(patches: List[HexPatch], exe_size: int) -> List[str]:
     """
     Validate patches against target file size.
@@ -224,12 +336,18 @@ def apply_patches(exe_path: str, patches: List[HexPatch],
     """
     Apply a list of patches to an executable file.
     
+    Only the patched ranges are written. When the executable itself is
+    patched with backup enabled, the original bytes of those ranges are
+    first saved to an undo journal next to it (see revert_patches), so no
+    full copy of the executable is made or rewritten.
+    
     Args:
         exe_path: Path to the source executable
         patches: List of HexPatch objects to apply
-        output_path: Output path (defaults to overwriting original if None,
-                    or creates *_patched.exe if backup=True)
-        backup: Whether to create a backup of the original
+        output_path: Output path (defaults to patching the original in
+                    place if backup=True, or creates *_patched.exe)
+        backup: Whether to journal the original bytes when patching
+                in place
         
     Returns:
         Tuple of (patches_applied_count, list_of_error_messages)
@@ -242,13 +360,8 @@ def apply_patches(exe_path: str, patches: List[HexPatch],
     
     errors = []
     
-    # Read original file
-    with open(exe_path, 'rb') as f:
-        exe_data = bytearray(f.read())
-    
-    exe_size = len(exe_data)
-    
-    # Validate patches
+    # Validate patches against the shared image of the original
+    exe_size = open_exe_image(exe_path).size
     validation_errors = validate_patches(patches, exe_size)
     if validation_errors:
         return 0, validation_errors
@@ -258,38 +371,224 @@ def apply_patches(exe_path: str, patches: List[HexPatch],
     for conflict in conflicts:
         errors.append(f"Warning: {conflict}")
     
-    # Sort patches by offset for consistent application order
+    # Sort patches by offset for consistent application order, then merge
+    # them into non-overlapping writes (later patches win where they overlap)
     sorted_patches = sorted(patches, key=lambda p: p.offset)
-    
-    # Apply patches
-    applied = 0
-    for patch in sorted_patches:
-        try:
-            exe_data[patch.offset:patch.offset + patch.size] = patch.data
-            applied += 1
-        except Exception as e:
-            errors.append(f"Failed to apply patch from {patch.source_file}: {e}")
+    writes = compile_patches(sorted_patches)
     
     # Determine output path
     if output_path is None:
         if backup:
-            # Create backup
-            backup_path = exe_path + ".backup"
-            if not os.path.exists(backup_path):
-                shutil.copy2(exe_path, backup_path)
             output_path = exe_path
         else:
             base, ext = os.path.splitext(exe_path)
             output_path = f"{base}_patched{ext}"
     
-    # Write output
-    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-    with open(output_path, 'wb') as f:
-        f.write(exe_data)
+    if os.path.exists(output_path) and os.path.samefile(exe_path, output_path):
+        # In place: journal the original bytes before anything is written
+        if backup:
+            _extend_journal(exe_path, writes)
+    else:
+        # Start from a copy of the original, then write only the patched ranges
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        release_exe_image(output_path)
+        shutil.copyfile(exe_path, output_path)
     
+    # Apply patches
+    failed = []
+    with ExeImage(output_path, writable=True) as output:
+        for write in writes:
+            try:
+                output.write(write.offset, write.data)
+            except Exception as e:
+                failed.append(write)
+                errors.append(f"Failed to apply patch from {write.source_file}: {e}")
+    
+    applied = sum(
+        1 for patch in sorted_patches
+        if not any(w.offset < patch.end_offset and patch.offset < w.end_offset for w in failed)
+    )
     return applied, errors
 
 
+def get_journal_path(exe_path: str) -> str:
+    """Path of the undo journal for an executable patched in place."""
+    return exe_path + JOURNAL_SUFFIX
+
+
+def read_journal(journal_path: str) -> List[JournalRange]:
+    """
+    Read an undo journal.
+    
+    Args:
+        journal_path: Path to the journal file
+        
+    Returns:
+        List of JournalRange objects sorted by offset (empty if the
+        journal does not exist)
+        
+    Raises:
+        ValueError: If the file is not a valid journal
+    """
+    if not os.path.exists(journal_path):
+        return []
+    
+    with open(journal_path, 'rb') as f:
+        data = f.read()
+    
+    if len(data) < _JOURNAL_HEADER.size:
+        raise ValueError(f"Truncated journal: {journal_path}")
+    magic, version, count = _JOURNAL_HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        raise ValueError(f"Not a patch journal: {journal_path}")
+    
+    ranges = []
+    pos = _JOURNAL_HEADER.size
+    for _ in range(count):
+        if pos + _JOURNAL_RANGE.size > len(data):
+            raise ValueError(f"Truncated journal: {journal_path}")
+        offset, size, original_crc, patched_crc = _JOURNAL_RANGE.unpack_from(data, pos)
+        pos += _JOURNAL_RANGE.size
+        if pos + size > len(data):
+            raise ValueError(f"Truncated journal: {journal_path}")
+        ranges.append(JournalRange(offset, data[pos:pos + size], original_crc, patched_crc))
+        pos += size
+    
+    return ranges
+
+
+def write_journal(journal_path: str, ranges: List[JournalRange]) -> None:
+    """
+    Write an undo journal, replacing any previous one atomically.
+    
+    Args:
+        journal_path: Path to the journal file
+        ranges: Non-overlapping ranges sorted by offset
+    """
+    temp_path = f"{journal_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, len(ranges)))
+        for r in ranges:
+            f.write(_JOURNAL_RANGE.pack(r.offset, r.size, r.original_crc, r.patched_crc))
+            f.write(r.original)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, journal_path)
+
+
+def _extend_journal(exe_path: str, writes: List[HexPatch]) -> None:
+    """
+    Add the ranges about to be written to the executable's undo journal.
+    
+    Ranges already in the journal keep their recorded original bytes; the
+    rest are taken from the executable as it is now. Overlapping and
+    adjacent ranges are merged, and each range's patched checksum is set
+    to what the executable will hold after the writes.
+    """
+    journal_path = get_journal_path(exe_path)
+    journaled = read_journal(journal_path)
+    image = open_exe_image(exe_path)
+    
+    spans = sorted([(r.offset, r.end_offset) for r in journaled] +
+                   [(w.offset, w.end_offset) for w in writes])
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    
+    ranges = []
+    j = w = 0
+    for start, end in merged:
+        current = image.read(start, end - start)
+        original = bytearray(current)
+        patched = bytearray(current)
+        while j < len(journaled) and journaled[j].offset < end:
+            r = journaled[j]
+            original[r.offset - start:r.end_offset - start] = r.original
+            j += 1
+        while w < len(writes) and writes[w].offset < end:
+            patch = writes[w]
+            patched[patch.offset - start:patch.end_offset - start] = patch.data
+            w += 1
+        ranges.append(JournalRange(start, bytes(original), zlib.crc32(original), zlib.crc32(patched)))
+    
+    write_journal(journal_path, ranges)
+
+
+def revert_patches(exe_path: str, force: bool = False) -> Tuple[int, List[str]]:
+    """
+    Restore the original bytes recorded in an executable's undo journal.
+    
+    A range is only restored while it still holds exactly what
+    apply_patches wrote (checked against its CRC-32), so bytes changed by
+    something else since are left alone unless force is set. Ranges that
+    could not be restored stay in the journal; once all are restored the
+    journal is removed.
+    
+    Args:
+        exe_path: Path to the executable patched in place
+        force: Restore ranges even if they were modified after patching
+        
+    Returns:
+        Tuple of (ranges_restored_count, list_of_error_messages)
+    """
+    journal_path = get_journal_path(exe_path)
+    try:
+        ranges = read_journal(journal_path)
+    except ValueError as e:
+        return 0, [str(e)]
+    if not ranges:
+        return 0, [f"No patch journal for {os.path.basename(exe_path)}"]
+    
+    restored = 0
+    errors = []
+    kept = []
+    with ExeImage(exe_path, writable=True) as image:
+        for r in ranges:
+            if zlib.crc32(r.original) != r.original_crc:
+                errors.append(f"Journal entry at 0x{r.offset:08X} is corrupt")
+                kept.append(r)
+                continue
+            if r.end_offset > image.size:
+                errors.append(f"Range at 0x{r.offset:08X} is beyond the end of the file")
+                kept.append(r)
+                continue
+            current_crc = zlib.crc32(image.read(r.offset, r.size))
+            if current_crc != r.original_crc:
+                if current_crc != r.patched_crc and not force:
+                    errors.append(f"Range at 0x{r.offset:08X} ({r.size} bytes) was modified after patching")
+                    kept.append(r)
+                    continue
+                image.write(r.offset, r.original)
+            restored += 1
+    
+    if kept:
+        write_journal(journal_path, kept)
+    else:
+        os.remove(journal_path)
+    
+    return restored, errors
+
+
+def get_applied_patches(exe_path: str, patches: List[HexPatch]) -> List[bool]:
+    """
+    Check which patches are currently present in an executable.
+    
+    Only the patched ranges are read, through the shared image.
+    
+    Args:
+        exe_path: Path to the executable
+        patches: List of patches to check
+        
+    Returns:
+        One flag per patch, True where the file holds the patch's data
+    """
+    image = open_exe_image(exe_path)
+    return [image.read(p.offset, p.size) == p.data for p in patches]
+
+
 def create_hex_patch(offset: int, data: bytes, output_path: str) -> None:
     """
     Create a .hex patch file from raw data.
@@ -308,6 +607,127 @@ def create_hex_patch(offset: int, data: bytes, output_path: str) -> None:
         f.write(data)
 
 
+def create_hex_patches(patches: List[Tuple[int, bytes]], output_path: str) -> None:
+    """
+    Create a .hex patch file holding several patches.
+    
+    Args:
+        patches: List of (offset, data) pairs; empty data is skipped
+        output_path: Path to write the .hex file
+    """
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'wb') as f:
+        for offset, data in sorted(patches, key=lambda p: p[0]):
+            if not data:
+                continue
+            f.write(offset.to_bytes(8, byteorder='big'))
+            f.write(len(data).to_bytes(8, byteorder='big'))
+            f.write(data)
+
+
+def _diff_runs(original, modified, start: int, end: int, runs: List[List[int]]) -> None:
+    """Append [start, end) runs of differing bytes, bisecting unequal ranges."""
+    if original[start:end] == modified[start:end]:
+        return
+    if end - start > DIFF_LEAF_SIZE:
+        mid = (start + end) // 2
+        _diff_runs(original, modified, start, mid, runs)
+        _diff_runs(original, modified, mid, end, runs)
+        return
+    
+    a = original[start:end]
+    b = modified[start:end]
+    i = 0
+    while i < len(a):
+        if a[i] == b[i]:
+            i += 1
+            continue
+        j = i + 1
+        while j < len(a) and a[j] != b[j]:
+            j += 1
+        if runs and runs[-1][1] == start + i:
+            runs[-1][1] = start + j
+        else:
+            runs.append([start + i, start + j])
+        i = j
+
+
+def diff_executables(original_path: str, modified_path: str,
+                     max_gap: int = DIFF_MAX_GAP,
+                     block_size: int = DIFF_BLOCK_SIZE) -> List[HexPatch]:
+    """
+    Compute the patches that turn one executable into another.
+    
+    Both files are compared through their shared memory-mapped images,
+    block by block; equal blocks cost one memcmp each, and only unequal
+    blocks are bisected down to the differing bytes. Differences separated
+    by at most max_gap equal bytes are coalesced into one patch, which is
+    smaller on disk than two records (each record has a 16-byte header).
+    
+    Args:
+        original_path: Path to the unmodified executable
+        modified_path: Path to the modified executable
+        max_gap: Largest run of equal bytes to include inside a patch
+        block_size: Size of the blocks compared in one step
+        
+    Returns:
+        List of HexPatch objects sorted by offset, with source_file set
+        to modified_path
+        
+    Raises:
+        ValueError: If the files differ in size (a .hex patch cannot
+                    resize the executable)
+    """
+    original = open_exe_image(original_path)
+    modified = open_exe_image(modified_path)
+    if original.size != modified.size:
+        raise ValueError(
+            f"Executables differ in size ({original.size} vs {modified.size} bytes); "
+            f".hex patches cannot change the file size"
+        )
+    
+    a = original.data
+    b = modified.data
+    runs = []
+    for start in range(0, original.size, block_size):
+        end = min(start + block_size, original.size)
+        if a[start:end] != b[start:end]:
+            _diff_runs(a, b, start, end, runs)
+    
+    # Coalesce differences separated by small gaps
+    merged = []
+    for start, end in runs:
+        if merged and start - merged[-1][1] <= max_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    
+    return [
+        HexPatch(offset=start, size=end - start, data=modified.read(start, end - start),
+                 source_file=modified_path)
+        for start, end in merged
+    ]
+
+
+def create_diff_patch(original_path: str, modified_path: str, output_path: str,
+                      max_gap: int = DIFF_MAX_GAP) -> List[HexPatch]:
+    """
+    Write a .hex patch file holding every difference between two executables.
+    
+    Args:
+        original_path: Path to the unmodified executable
+        modified_path: Path to the modified executable
+        output_path: Path to write the .hex file
+        max_gap: Largest run of equal bytes to include inside a patch
+        
+    Returns:
+        The patches written (as diff_executables returns them)
+    """
+    patches = diff_executables(original_path, modified_path, max_gap)
+    create_hex_patches([(p.offset, p.data) for p in patches], output_path)
+    return patches
+
+
 def find_hex_files(directory: str, recursive: bool = True) -> List[str]:
     """
     Find all .hex files in a directory.
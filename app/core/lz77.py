@@ -4,18 +4,49 @@ Provides a single dispatch function ``decompress`` that delegates to the
 appropriate implementation based on the *variant* parameter:
 
 * ``"flag_byte"``   -- flag-byte style used for textures / SPRANM
-                       (delegates to :func:`dokapon_extract.decompress_lz77`)
+                       (also exposed as :func:`dokapon_extract.decompress_lz77`)
 * ``"token_stream"`` -- MDL-specific token stream
-                        (delegates to :class:`mdl_handler.LZ77Decompressor`)
+                        (wrapped by :class:`mdl_handler.LZ77Decompressor`)
 * ``"cell"``         -- cell-based LZ77 used by the explorer tool
 * ``"auto"``         -- attempts to detect the correct variant automatically
+
+Decode engine
+-------------
+The token loops for all three variants live in a pluggable *backend*.  Two
+backends are always available:
+
+* ``"fast"``      -- (default) preallocates the output from the header's
+                     declared size, copies literal runs and back-references
+                     as slices, and expands overlapping back-references by
+                     repeating the period instead of copying byte by byte.
+* ``"reference"`` -- the original byte-at-a-time loops, kept as the
+                     correctness oracle for the fast path and the benchmark.
+
+Additional backends (e.g. a compiled extension) can be added with
+:func:`register_backend`.  The active backend is chosen at import time from
+the ``DOKAPON_LZ77_BACKEND`` environment variable and can be switched later
+with :func:`set_backend`.  Every backend must produce byte-identical output.
+
+Compression
+-----------
+:func:`compress` rebuilds a container for any of the three variants with a
+hash-chain match finder and three effort levels (``"fast"``, ``"normal"``,
+``"optimal"``).
+
+Run ``python -m app.core.lz77 <files or dirs>`` to benchmark each backend
+in MB/s per variant, or add ``--roundtrip`` to recompress every file and
+verify that it decodes back to the same bytes.
 """
 
 from __future__ import annotations
 
+import os
+import re
 import struct
+import time
 from dataclasses import dataclass
-from typing import Optional, Tuple, Union
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple, Union
 
 
 # ---------------------------------------------------------------------------
@@ -34,19 +65,160 @@ class CellLZ77Info:
 
 
 # ---------------------------------------------------------------------------
-# Cell-variant implementation (ported from test/doka/src/dokapon_explorer/lz77.py)
+# Backend registry
 # ---------------------------------------------------------------------------
 
-def _decompress_cell(buf: bytes) -> Tuple[bytes, Optional[CellLZ77Info]]:
-    """Decompress the cell-style LZ77 container if present.
+@dataclass(frozen=True)
+class LZ77Backend:
+    """A set of token-loop kernels, one per LZ77 variant.
 
-    Returns ``(data, info)`` where *info* is ``None`` when the input does not
-    start with the ``LZ77`` magic.
+    Kernel signatures (headers are parsed by the callers):
+
+    * ``flag_byte(data, compressed_end, decompressed_size) -> bytearray``
+      decodes ``data[16:compressed_end]``.
+    * ``token_stream(data, expected_size) -> (bytearray, consumed, truncated)``
+      decodes the whole of *data*; *truncated* is True when the stream ended
+      in the middle of a back-reference.
+    * ``cell(buf, token_count, data_offset, raw_size) -> (bytearray, flags_end, data_end)``
+      raises ``ValueError`` on malformed input.
     """
-    if len(buf) < 0x10 or buf[:4] != b"LZ77":
-        return buf, None
+    name: str
+    flag_byte: Callable[[bytes, int, int], bytearray]
+    token_stream: Callable[[bytes, int], Tuple[bytearray, int, bool]]
+    cell: Callable[[bytes, int, int, int], Tuple[bytearray, int, int]]
 
-    raw_size, token_count, data_offset = struct.unpack_from("<III", buf, 0x04)
+
+_BACKENDS: dict[str, LZ77Backend] = {}
+_active_backend: Optional[LZ77Backend] = None
+
+BACKEND_ENV_VAR = "DOKAPON_LZ77_BACKEND"
+DEFAULT_BACKEND = "fast"
+
+
+def register_backend(backend: LZ77Backend) -> None:
+    """Register (or replace) a decode backend under ``backend.name``."""
+    _BACKENDS[backend.name] = backend
+
+
+def available_backends() -> list[str]:
+    """Return the names of all registered backends."""
+    return sorted(_BACKENDS)
+
+
+def get_backend() -> LZ77Backend:
+    """Return the backend currently used by every LZ77 entry point."""
+    assert _active_backend is not None
+    return _active_backend
+
+
+def set_backend(name: str) -> LZ77Backend:
+    """Select the active backend by name.
+
+    Raises
+    ------
+    ValueError
+        If no backend with that name is registered.
+    """
+    global _active_backend
+    try:
+        _active_backend = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown LZ77 backend: {name!r} (available: {', '.join(available_backends())})"
+        ) from None
+    return _active_backend
+
+
+def _preallocate(declared: int, bound: int) -> bytearray:
+    """Allocate the output buffer up front.
+
+    *declared* comes from the file header and is trusted only up to *bound*,
+    the largest output the input could possibly expand to, so a corrupt
+    header cannot trigger a huge allocation.
+    """
+    return bytearray(max(0, min(declared, bound)))
+
+
+# ---------------------------------------------------------------------------
+# Reference kernels (original byte-at-a-time loops)
+# ---------------------------------------------------------------------------
+
+def _flag_byte_reference(data: bytes, compressed_end: int, decompressed_size: int) -> bytearray:
+    result = bytearray()
+    pos = 16  # Start after header
+
+    while pos < compressed_end and len(result) < decompressed_size:
+        flag = data[pos]
+        pos += 1
+
+        # Process 8 chunks per flag byte
+        for bit in range(8):
+            if pos >= compressed_end or len(result) >= decompressed_size:
+                break
+
+            # MSB-first: bit 7 first, bit 0 last
+            if flag & (0x80 >> bit):
+                # Compressed: back-reference
+                if pos + 1 >= compressed_end:
+                    break
+
+                b1 = data[pos]
+                b2 = data[pos + 1]
+                pos += 2
+
+                # Standard Nintendo LZ77 format:
+                length = ((b1 >> 4) & 0x0F) + 3
+                offset = ((b1 & 0x0F) << 8) | b2
+                offset += 1
+
+                for _ in range(length):
+                    if len(result) >= offset:
+                        result.append(result[-offset])
+                    else:
+                        result.append(0)
+            else:
+                # Literal byte
+                if pos >= compressed_end:
+                    break
+                result.append(data[pos])
+                pos += 1
+
+    return result
+
+
+def _token_stream_reference(data: bytes, expected_size: int) -> Tuple[bytearray, int, bool]:
+    output = bytearray()
+    pos = 0
+    data_len = len(data)
+
+    while pos < data_len and len(output) < expected_size:
+        token = data[pos]
+        pos += 1
+
+        if token & 0x80:
+            if pos >= data_len:
+                return output, pos, True
+
+            length = ((token & 0x7C) >> 2) + 3
+            offset = ((token & 0x03) << 8) | data[pos]
+            pos += 1
+            offset += 1
+
+            for _ in range(length):
+                if len(output) >= expected_size:
+                    break
+                if offset <= len(output):
+                    output.append(output[-offset])
+                else:
+                    # Window underrun: mirror observed decompressor behaviour with zero fill
+                    output.append(0)
+        else:
+            output.append(token)
+
+    return output, pos, False
+
+
+def _cell_reference(buf: bytes, token_count: int, data_offset: int, raw_size: int) -> Tuple[bytearray, int, int]:
     flags_ptr = 0x10
     data_ptr = data_offset
     out = bytearray()
@@ -89,8 +261,197 @@ def _decompress_cell(buf: bytes) -> Tuple[bytes, Optional[CellLZ77Info]]:
         if len(out) > raw_size + 0x1000:
             raise ValueError("LZ77 output grew beyond guard range")
 
+    return out, flags_ptr, data_ptr
+
+
+# ---------------------------------------------------------------------------
+# Fast kernels (slice copies into a preallocated buffer)
+# ---------------------------------------------------------------------------
+
+# A run of MDL token-stream literals is a run of bytes with bit 7 clear.
+_TOKEN_LITERAL_RUN = re.compile(rb"[\x00-\x7f]+")
+
+
+def _copy_backref(out: bytearray, o: int, dist: int, length: int) -> None:
+    """Copy *length* bytes from ``o - dist`` to *o* (requires ``o >= dist``).
+
+    Non-overlapping copies are a single slice; overlapping copies repeat the
+    ``dist``-byte period, which is exactly what a byte-wise copy produces.
+    """
+    start = o - dist
+    if dist >= length:
+        out[o:o + length] = out[start:start + length]
+    else:
+        period = out[start:o]
+        out[o:o + length] = (period * (length // dist + 1))[:length]
+
+
+def _flag_byte_fast(data: bytes, compressed_end: int, decompressed_size: int) -> bytearray:
+    # Each flag byte covers at most 8 two-byte back-references of 18 bytes,
+    # so output never exceeds 9x the compressed span (plus one overshoot).
+    out = _preallocate(decompressed_size + 18, 9 * max(0, compressed_end - 16) + 18)
+    o = 0
+    pos = 16
+    # A truncated file's header can place the end past EOF.  The reference
+    # loop then fails with IndexError once it reads there, so only take the
+    # slice shortcut while the bytes exist and let indexing fail the same way.
+    available = min(compressed_end, len(data))
+
+    while pos < compressed_end and o < decompressed_size:
+        flag = data[pos]
+        pos += 1
+
+        if flag == 0 and pos + 8 <= available and o + 8 <= decompressed_size:
+            out[o:o + 8] = data[pos:pos + 8]
+            o += 8
+            pos += 8
+            continue
+
+        mask = 0x80
+        while mask:
+            if pos >= compressed_end or o >= decompressed_size:
+                break
+            if flag & mask:
+                if pos + 1 >= compressed_end:
+                    # The reference loop re-reads this byte as a flag and stops.
+                    pos = compressed_end
+                    break
+                b1 = data[pos]
+                dist = (((b1 & 0x0F) << 8) | data[pos + 1]) + 1
+                length = (b1 >> 4) + 3
+                pos += 2
+                if o >= dist:
+                    _copy_backref(out, o, dist, length)
+                else:
+                    # Window underrun: zero until the window is valid again.
+                    for k in range(o, o + length):
+                        out[k] = out[k - dist] if k >= dist else 0
+                o += length
+            else:
+                out[o] = data[pos]
+                o += 1
+                pos += 1
+            mask >>= 1
+
+    del out[o:]
+    return out
+
+
+def _token_stream_fast(data: bytes, expected_size: int) -> Tuple[bytearray, int, bool]:
+    data_len = len(data)
+    # A two-byte back-reference expands to at most 34 bytes.
+    out = _preallocate(expected_size, 17 * data_len)
+    o = 0
+    pos = 0
+    literal_run = _TOKEN_LITERAL_RUN.match
+
+    while pos < data_len and o < expected_size:
+        token = data[pos]
+        if token & 0x80:
+            pos += 1
+            if pos >= data_len:
+                del out[o:]
+                return out, pos, True
+            length = min(((token & 0x7C) >> 2) + 3, expected_size - o)
+            dist = (((token & 0x03) << 8) | data[pos]) + 1
+            pos += 1
+            if o >= dist:
+                _copy_backref(out, o, dist, length)
+            else:
+                # Window underrun: mirror observed decompressor behaviour with zero fill
+                for k in range(o, o + length):
+                    out[k] = out[k - dist] if k >= dist else 0
+            o += length
+        else:
+            run = min(literal_run(data, pos).end() - pos, expected_size - o)
+            out[o:o + run] = data[pos:pos + run]
+            o += run
+            pos += run
+
+    del out[o:]
+    return out, pos, False
+
+
+def _cell_fast(buf: bytes, token_count: int, data_offset: int, raw_size: int) -> Tuple[bytearray, int, int]:
+    buf_len = len(buf)
+    guard = raw_size + 0x1000
+    # Output is capped by the guard, by 258 bytes per token and by 129 bytes
+    # per data byte (a two-byte back-reference copies at most 258 bytes).
+    out = _preallocate(guard + 258, min(258 * token_count, 129 * max(0, buf_len - data_offset)))
+    o = 0
+    flags_ptr = 0x10
+    data_ptr = data_offset
+    remaining = token_count
+
+    while remaining > 0:
+        if flags_ptr >= buf_len:
+            raise ValueError("LZ77 flags pointer exceeded file size")
+        flags = buf[flags_ptr]
+        flags_ptr += 1
+
+        if flags == 0 and remaining >= 8 and data_ptr + 8 <= buf_len:
+            out[o:o + 8] = buf[data_ptr:data_ptr + 8]
+            o += 8
+            data_ptr += 8
+            remaining -= 8
+            if o > guard:
+                raise ValueError("LZ77 output grew beyond guard range")
+            continue
+
+        for _ in range(min(8, remaining)):
+            if flags & 0x80:
+                # Back-reference
+                if data_ptr + 2 > buf_len:
+                    raise ValueError("LZ77 backref exceeded file size")
+                dist = buf[data_ptr]
+                length = buf[data_ptr + 1] + 3
+                data_ptr += 2
+                if dist == 0:
+                    raise ValueError("LZ77 invalid distance 0")
+                if o < dist:
+                    raise ValueError("LZ77 backref before output start")
+                _copy_backref(out, o, dist, length)
+                o += length
+            else:
+                # Literal byte
+                if data_ptr >= buf_len:
+                    raise ValueError("LZ77 literal exceeded file size")
+                out[o] = buf[data_ptr]
+                o += 1
+                data_ptr += 1
+
+            flags = (flags << 1) & 0xFF
+            if o > guard:
+                raise ValueError("LZ77 output grew beyond guard range")
+        remaining -= 8
+
+    del out[o:]
+    return out, flags_ptr, data_ptr
+
+
+register_backend(LZ77Backend("reference", _flag_byte_reference, _token_stream_reference, _cell_reference))
+register_backend(LZ77Backend("fast", _flag_byte_fast, _token_stream_fast, _cell_fast))
+set_backend(os.environ.get(BACKEND_ENV_VAR, DEFAULT_BACKEND))
+
+
+# ---------------------------------------------------------------------------
+# Cell-variant implementation (ported from test/doka/src/dokapon_explorer/lz77.py)
+# ---------------------------------------------------------------------------
+
+def _decompress_cell(buf: bytes) -> Tuple[bytes, Optional[CellLZ77Info]]:
+    """Decompress the cell-style LZ77 container if present.
+
+    Returns ``(data, info)`` where *info* is ``None`` when the input does not
+    start with the ``LZ77`` magic.
+    """
+    if len(buf) < 0x10 or buf[:4] != b"LZ77":
+        return buf, None
+
+    raw_size, token_count, data_offset = struct.unpack_from("<III", buf, 0x04)
+    out, flags_ptr, data_ptr = get_backend().cell(buf, token_count, data_offset, raw_size)
+
     if len(out) > raw_size:
-        out = out[:raw_size]
+        del out[raw_size:]
 
     info = CellLZ77Info(
         raw_size=raw_size,
@@ -104,13 +465,47 @@ def _decompress_cell(buf: bytes) -> Tuple[bytes, Optional[CellLZ77Info]]:
 
 
 # ---------------------------------------------------------------------------
-# Internal helpers for flag_byte and token_stream variants
+# Flag-byte and token-stream variants
 # ---------------------------------------------------------------------------
 
+def decompress_flag_byte(data: bytes) -> Optional[bytes]:
+    """Decompress the flag-byte LZ77 container used by .tex/.spranm/.fnt.
+
+    File format:
+    - Bytes 0-4: "LZ77" magic
+    - Bytes 4-8: unknown (possibly checksum)
+    - Bytes 8-12: decompressed size of compressed portion
+    - Bytes 12-16: offset to uncompressed data (Sequence header)
+    - Bytes 16 to offset: LZ77 compressed data
+    - Bytes offset to end: uncompressed Sequence metadata
+
+    Returns ``None`` when *data* is not LZ77 or nothing could be decoded.
+    """
+    if not data.startswith(b'LZ77'):
+        return None
+
+    decompressed_size = struct.unpack('<I', data[8:12])[0]
+    uncompressed_offset = struct.unpack('<I', data[12:16])[0]
+
+    # Determine where compressed data ends
+    compressed_end = uncompressed_offset if uncompressed_offset > 16 else len(data)
+
+    try:
+        result = get_backend().flag_byte(data, compressed_end, decompressed_size)
+
+        # Append uncompressed Sequence data if present
+        if uncompressed_offset > 16 and uncompressed_offset < len(data):
+            result.extend(data[uncompressed_offset:])
+
+        return bytes(result) if len(result) > 0 else None
+
+    except Exception as e:
+        print(f"Decompression error: {str(e)}")
+        return None
+
+
 def _decompress_flag_byte(data: bytes) -> Optional[bytes]:
-    """Delegate to :func:`dokapon_extract.decompress_lz77`."""
-    from app.core.dokapon_extract import decompress_lz77 as _flag_byte_impl
-    return _flag_byte_impl(data)
+    return decompress_flag_byte(data)
 
 
 def _decompress_token_stream(data: bytes) -> Optional[bytes]:
@@ -169,6 +564,25 @@ def _detect_variant(data: bytes) -> str:
     return "flag_byte"
 
 
+def peek_header(data: bytes, path: Optional[Path] = None) -> Optional[Tuple[str, int]]:
+    """Return ``(variant, decompressed_size)`` from an LZ77 header without decoding.
+
+    With *path* the variant is the one the tools use for that file type;
+    otherwise the content heuristic decides.  For ``"flag_byte"`` the size
+    includes the uncompressed Sequence tail.  Returns ``None`` when *data*
+    is not LZ77.
+    """
+    if len(data) < 16 or data[:4] != b"LZ77":
+        return None
+    variant = _variant_for_path(path, data) if path is not None else _detect_variant(data)
+    if variant == "flag_byte":
+        size, uncompressed_offset = struct.unpack_from("<II", data, 0x08)
+        if 16 < uncompressed_offset < len(data):
+            size += len(data) - uncompressed_offset
+        return variant, size
+    return variant, struct.unpack_from("<I", data, 0x04)[0]
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -208,3 +622,527 @@ def decompress(data: bytes, variant: str = "auto") -> Union[bytes, Tuple[bytes,
         return _decompress_cell(data)
     else:
         raise ValueError(f"Unknown LZ77 variant: {variant!r}")
+
+
+# ---------------------------------------------------------------------------
+# Compression
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class _VariantLimits:
+    """Token limits and bit costs of one LZ77 variant."""
+    window: int
+    max_len: int
+    literal_bits: int
+    match_bits: int
+
+
+_MIN_MATCH = 3
+
+_LIMITS = {
+    # 12-bit distance, 4-bit length, one flag bit per token
+    "flag_byte": _VariantLimits(window=0x1000, max_len=18, literal_bits=9, match_bits=17),
+    # 10-bit distance, 5-bit length, no flags (literals are limited to 0x00-0x7F)
+    "token_stream": _VariantLimits(window=0x400, max_len=34, literal_bits=8, match_bits=16),
+    # 8-bit distance (0 is invalid), 8-bit length, one flag bit per token
+    "cell": _VariantLimits(window=0xFF, max_len=258, literal_bits=9, match_bits=17),
+}
+
+COMPRESSION_LEVELS = ("fast", "normal", "optimal")
+DEFAULT_COMPRESSION_LEVEL = "normal"
+
+# Hash-chain candidates examined per position.
+_CHAIN_DEPTH = {"fast": 8, "normal": 64, "optimal": 256}
+
+# The optimal parse tries every truncation of the longest match up to this
+# length (and the full match); beyond it only the full match is considered.
+_OPTIMAL_SHORT_LENGTHS = 34
+
+# A parsed token is (distance, length) for a back-reference or (0, byte)
+# for a literal.
+_Token = Tuple[int, int]
+
+
+class _HashChain:
+    """Hash-chain match finder keyed on the next three bytes."""
+
+    def __init__(self, data: bytes, limits: _VariantLimits, depth: int):
+        self.data = data
+        self.n = len(data)
+        self.window = limits.window
+        self.max_len = limits.max_len
+        self.depth = depth
+        self.head: dict[int, int] = {}
+        self.prev = [-1] * self.n
+
+    def insert(self, i: int) -> None:
+        if i + _MIN_MATCH <= self.n:
+            data = self.data
+            key = (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+            self.prev[i] = self.head.get(key, -1)
+            self.head[key] = i
+
+    def longest(self, i: int) -> Tuple[int, int]:
+        """Return ``(distance, length)`` of the longest match at *i* (length 0 if none).
+
+        Only positions already passed to :meth:`insert` are candidates.
+        """
+        data = self.data
+        limit = min(self.max_len, self.n - i)
+        if limit < _MIN_MATCH:
+            return 0, 0
+        key = (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+        j = self.head.get(key, -1)
+        best_len = 0
+        best_dist = 0
+        depth = self.depth
+        lowest = i - self.window
+        while j >= lowest and j >= 0 and depth > 0:
+            if data[j + best_len] == data[i + best_len]:
+                length = _match_length(data, j, i, limit)
+                if length > best_len:
+                    best_len = length
+                    best_dist = i - j
+                    if length == limit:
+                        break
+            j = self.prev[j]
+            depth -= 1
+        if best_len < _MIN_MATCH:
+            return 0, 0
+        return best_dist, best_len
+
+
+def _match_length(data: bytes, j: int, i: int, limit: int) -> int:
+    """Length of the common prefix of ``data[j:]`` and ``data[i:]``, capped at *limit*.
+
+    Comparing the source data directly is valid for overlapping matches too,
+    because the decoder copies forward one byte (or one period) at a time.
+    """
+    if data[j:j + limit] == data[i:i + limit]:
+        return limit
+    lo, hi = 0, limit
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if data[j:j + mid] == data[i:i + mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _tail_match(data: bytes, i: int, window: int) -> int:
+    """Distance of a back-reference reproducing the final ``< 3`` bytes, or 0.
+
+    The token-stream decoder stops at the declared size, so a minimum-length
+    back-reference can encode the last one or two bytes.
+    """
+    tail = data[i:]
+    for dist in range(1, min(window, i) + 1):
+        period = data[i - dist:i]
+        if (period * (len(tail) // dist + 1))[:len(tail)] == tail:
+            return dist
+    return 0
+
+
+def _literal_allowed(variant: str, byte: int) -> bool:
+    return variant != "token_stream" or byte < 0x80
+
+
+def _unencodable(data: bytes, i: int) -> ValueError:
+    return ValueError(
+        f"token_stream cannot encode byte 0x{data[i]:02X} at offset {i}: literals are "
+        f"limited to 0x00-0x7F and no earlier match reproduces it"
+    )
+
+
+def _parse_greedy(data: bytes, variant: str, depth: int, lazy: bool) -> list[_Token]:
+    """Greedy (optionally one-step lazy) parse."""
+    limits = _LIMITS[variant]
+    finder = _HashChain(data, limits, depth)
+    n = len(data)
+    tokens: list[_Token] = []
+    i = 0
+    pending: Optional[Tuple[int, int]] = None
+    while i < n:
+        dist, length = pending if pending is not None else finder.longest(i)
+        pending = None
+        finder.insert(i)
+        if length and lazy and i + 1 < n and length < limits.max_len and _literal_allowed(variant, data[i]):
+            next_dist, next_length = finder.longest(i + 1)
+            if next_length > length:
+                tokens.append((0, data[i]))
+                pending = (next_dist, next_length)
+                i += 1
+                continue
+        if length:
+            tokens.append((dist, length))
+            for k in range(i + 1, i + length):
+                finder.insert(k)
+            i += length
+        elif _literal_allowed(variant, data[i]):
+            tokens.append((0, data[i]))
+            i += 1
+        else:
+            dist = _tail_match(data, i, limits.window) if n - i < _MIN_MATCH else 0
+            if not dist:
+                raise _unencodable(data, i)
+            tokens.append((dist, _MIN_MATCH))
+            i = n
+    return tokens
+
+
+def _parse_optimal(data: bytes, variant: str, depth: int) -> list[_Token]:
+    """Shortest-path parse minimising the encoded size in bits."""
+    limits = _LIMITS[variant]
+    finder = _HashChain(data, limits, depth)
+    n = len(data)
+    matches: list[Tuple[int, int]] = []
+    for i in range(n):
+        matches.append(finder.longest(i))
+        finder.insert(i)
+
+    unreachable = float("inf")
+    cost: list[float] = [0.0] * (n + 1)
+    choice: list[_Token] = [(0, 0)] * n
+    dead_end = -1  # earliest position with no way to encode it at all
+    for i in range(n - 1, -1, -1):
+        best = unreachable
+        best_token: _Token = (0, data[i])
+        if _literal_allowed(variant, data[i]):
+            best = limits.literal_bits + cost[i + 1]
+        dist, length = matches[i]
+        if length:
+            for candidate in range(_MIN_MATCH, min(length, _OPTIMAL_SHORT_LENGTHS) + 1):
+                total = limits.match_bits + cost[i + candidate]
+                if total < best:
+                    best = total
+                    best_token = (dist, candidate)
+            if length > _OPTIMAL_SHORT_LENGTHS:
+                total = limits.match_bits + cost[i + length]
+                if total < best:
+                    best = total
+                    best_token = (dist, length)
+        elif variant == "token_stream" and n - i < _MIN_MATCH:
+            tail_dist = _tail_match(data, i, limits.window)
+            if tail_dist and limits.match_bits < best:
+                best = limits.match_bits
+                best_token = (tail_dist, _MIN_MATCH)
+        if best == unreachable and not length and not _literal_allowed(variant, data[i]):
+            dead_end = i
+        cost[i] = best
+        choice[i] = best_token
+
+    tokens: list[_Token] = []
+    i = 0
+    while i < n:
+        if cost[i] == unreachable:
+            raise _unencodable(data, dead_end if dead_end >= i else i)
+        token = choice[i]
+        tokens.append(token)
+        i += token[1] if token[0] else 1
+    return tokens
+
+
+def _emit_flag_byte(tokens: list[_Token]) -> bytearray:
+    out = bytearray()
+    for group in range(0, len(tokens), 8):
+        flag_pos = len(out)
+        out.append(0)
+        flag = 0
+        for bit, (dist, value) in enumerate(tokens[group:group + 8]):
+            if dist:
+                flag |= 0x80 >> bit
+                code = dist - 1
+                out.append(((value - 3) << 4) | (code >> 8))
+                out.append(code & 0xFF)
+            else:
+                out.append(value)
+        out[flag_pos] = flag
+    return out
+
+
+def _emit_token_stream(tokens: list[_Token]) -> bytearray:
+    out = bytearray()
+    for dist, value in tokens:
+        if dist:
+            code = dist - 1
+            out.append(0x80 | ((value - 3) << 2) | (code >> 8))
+            out.append(code & 0xFF)
+        else:
+            out.append(value)
+    return out
+
+
+def _emit_cell(tokens: list[_Token]) -> Tuple[bytearray, bytearray]:
+    flags = bytearray()
+    payload = bytearray()
+    for group in range(0, len(tokens), 8):
+        flag = 0
+        for bit, (dist, value) in enumerate(tokens[group:group + 8]):
+            if dist:
+                flag |= 0x80 >> bit
+                payload.append(dist)
+                payload.append(value - 3)
+            else:
+                payload.append(value)
+        flags.append(flag)
+    return flags, payload
+
+
+def compress(data: bytes, variant: str, level: str = DEFAULT_COMPRESSION_LEVEL, *,
+             trailing: bytes = b"", template: Optional[bytes] = None) -> bytes:
+    """Compress *data* into a complete LZ77 container of the given variant.
+
+    Parameters
+    ----------
+    data : bytes
+        Payload to compress.
+    variant : str
+        One of ``"flag_byte"``, ``"token_stream"`` or ``"cell"``.
+    level : str
+        ``"fast"`` (greedy, short hash chains), ``"normal"`` (lazy matching)
+        or ``"optimal"`` (shortest-path parse over the longest match at every
+        position and its truncations).
+    trailing : bytes
+        Uncompressed bytes stored after the stream.  For ``"flag_byte"`` they
+        become the Sequence metadata located by the header's offset field and
+        are appended by :func:`decompress`; for ``"token_stream"`` they end
+        up in ``LZ77Decompressor.trailing_data``; ``"cell"`` ignores them on
+        decode.
+    template : bytes, optional
+        Original container whose header fields that do not derive from the
+        payload (bytes 4-8 of ``"flag_byte"``, flag1/flag2 of
+        ``"token_stream"``) are carried over.
+
+    Raises
+    ------
+    ValueError
+        If *variant* or *level* is not recognised, if ``"flag_byte"`` is asked
+        to store *trailing* bytes after an empty payload, or (``"token_stream"``
+        only) the payload contains a byte >= 0x80 that no back-reference can
+        reproduce.
+    """
+    if variant not in _LIMITS:
+        raise ValueError(f"Unknown LZ77 variant: {variant!r}")
+    if level not in COMPRESSION_LEVELS:
+        raise ValueError(f"Unknown compression level: {level!r} (expected one of {', '.join(COMPRESSION_LEVELS)})")
+
+    data = bytes(data)
+    depth = _CHAIN_DEPTH[level]
+    if level == "optimal":
+        tokens = _parse_optimal(data, variant, depth)
+    else:
+        try:
+            tokens = _parse_greedy(data, variant, depth, lazy=(level == "normal"))
+        except ValueError:
+            if variant != "token_stream":
+                raise
+            # A greedy parse can strand a high byte that a different split reaches.
+            tokens = _parse_optimal(data, variant, depth)
+
+    if variant == "flag_byte":
+        if trailing and not data:
+            # The header only honours offsets past 16, so the stream cannot be empty.
+            raise ValueError("flag_byte cannot store trailing data without a compressed payload")
+        stream = _emit_flag_byte(tokens)
+        reserved = template[4:8] if template is not None and len(template) >= 16 else b"\x00" * 4
+        uncompressed_offset = 16 + len(stream) if trailing else 0
+        header = b"LZ77" + reserved + struct.pack("<II", len(data), uncompressed_offset)
+        return header + bytes(stream) + bytes(trailing)
+
+    if variant == "token_stream":
+        stream = _emit_token_stream(tokens)
+        flag1, flag2 = struct.unpack_from("<II", template, 8) if template is not None and len(template) >= 16 else (0, 0)
+        header = b"LZ77" + struct.pack("<III", len(data), flag1, flag2)
+        return header + bytes(stream) + bytes(trailing)
+
+    flags, payload = _emit_cell(tokens)
+    header = b"LZ77" + struct.pack("<III", len(data), len(tokens), 16 + len(flags))
+    return header + bytes(flags) + bytes(payload) + bytes(trailing)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark and round-trip harness
+# ---------------------------------------------------------------------------
+
+def _iter_lz77_files(paths: Iterable[Path]) -> Iterable[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from (p for p in sorted(path.rglob("*")) if p.is_file())
+        elif path.is_file():
+            yield path
+
+
+def _variant_for_path(path: Path, data: bytes) -> str:
+    """Pick the variant the tools actually use for a given file type."""
+    ext = path.suffix.lower()
+    if ext == ".mdl":
+        return "token_stream"
+    if ext == ".mpd":
+        return "cell"
+    if ext in (".tex", ".spranm", ".fnt"):
+        # Cell-layout textures exist too; fall back to the heuristic for those.
+        detected = _detect_variant(data)
+        return "cell" if detected == "cell" else "flag_byte"
+    return _detect_variant(data)
+
+
+def benchmark(paths: Iterable[Path], backends: Iterable[str] | None = None,
+              repeat: int = 3) -> dict[str, dict[str, dict[str, float]]]:
+    """Time every backend on every LZ77 file under *paths*.
+
+    Returns ``{variant: {backend: {"files", "bytes_in", "bytes_out",
+    "seconds", "mb_per_s", "mismatches"}}}``.  Throughput is measured on the
+    decompressed output and the best of *repeat* runs is kept per file.
+    Outputs are compared against the first backend listed and any difference
+    is counted in ``mismatches``.
+    """
+    backend_names = list(backends or available_backends())
+    previous = get_backend().name
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    try:
+        for path in _iter_lz77_files(paths):
+            data = path.read_bytes()
+            if not data.startswith(b"LZ77"):
+                continue
+            variant = _variant_for_path(path, data)
+            baseline = None
+            for name in backend_names:
+                set_backend(name)
+                best = float("inf")
+                output = None
+                for _ in range(max(1, repeat)):
+                    start = time.perf_counter()
+                    try:
+                        output = decompress(data, variant)
+                    except ValueError:
+                        output = None
+                    best = min(best, time.perf_counter() - start)
+                if isinstance(output, tuple):
+                    output = output[0]
+                stats = results.setdefault(variant, {}).setdefault(name, {
+                    "files": 0, "bytes_in": 0, "bytes_out": 0, "seconds": 0.0, "mismatches": 0,
+                })
+                stats["files"] += 1
+                stats["bytes_in"] += len(data)
+                stats["bytes_out"] += len(output or b"")
+                stats["seconds"] += best
+                if baseline is None:
+                    baseline = output
+                elif output != baseline:
+                    stats["mismatches"] += 1
+    finally:
+        set_backend(previous)
+
+    for per_backend in results.values():
+        for stats in per_backend.values():
+            seconds = stats["seconds"]
+            stats["mb_per_s"] = (stats["bytes_out"] / (1024 * 1024)) / seconds if seconds else 0.0
+    return results
+
+
+def _split_payload(data: bytes, variant: str) -> Tuple[bytes, bytes]:
+    """Decode *data* and return ``(payload, trailing)`` as :func:`compress` expects them."""
+    if variant == "flag_byte":
+        merged = decompress_flag_byte(data)
+        if merged is None:
+            raise ValueError("flag_byte stream did not decode")
+        uncompressed_offset = struct.unpack_from("<I", data, 12)[0]
+        trailing = data[uncompressed_offset:] if 16 < uncompressed_offset < len(data) else b""
+        return merged[:len(merged) - len(trailing)], trailing
+    if variant == "token_stream":
+        from app.core.mdl_handler import LZ77Decompressor
+        decompressor = LZ77Decompressor()
+        payload = decompressor.decompress_data(data)
+        if payload is None:
+            raise ValueError("token_stream did not decode")
+        return payload, decompressor.trailing_data
+    payload, _info = _decompress_cell(data)
+    return payload, b""
+
+
+def roundtrip(paths: Iterable[Path], levels: Iterable[str] | None = None) -> dict[str, dict[str, dict[str, float]]]:
+    """Recompress every LZ77 file under *paths* and check it decodes back.
+
+    Each file is decoded, re-encoded at every level with its trailing bytes
+    and header template, decoded again and compared with the first decode.
+    Returns ``{variant: {level: {"files", "failures", "original_bytes",
+    "compressed_bytes", "seconds"}}}``; files whose original stream does not
+    decode are skipped.
+    """
+    level_names = list(levels or COMPRESSION_LEVELS)
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for path in _iter_lz77_files(paths):
+        data = path.read_bytes()
+        if not data.startswith(b"LZ77"):
+            continue
+        variant = _variant_for_path(path, data)
+        try:
+            payload, trailing = _split_payload(data, variant)
+        except ValueError:
+            continue
+        for level in level_names:
+            stats = results.setdefault(variant, {}).setdefault(level, {
+                "files": 0, "failures": 0, "original_bytes": 0, "compressed_bytes": 0, "seconds": 0.0,
+            })
+            stats["files"] += 1
+            stats["original_bytes"] += len(data)
+            start = time.perf_counter()
+            try:
+                packed = compress(payload, variant, level, trailing=trailing, template=data)
+            except ValueError as exc:
+                stats["failures"] += 1
+                print(f"{path}: {level}: {exc}")
+                continue
+            stats["seconds"] += time.perf_counter() - start
+            stats["compressed_bytes"] += len(packed)
+            if _split_payload(packed, variant) != (payload, trailing):
+                stats["failures"] += 1
+                print(f"{path}: {level}: round trip mismatch")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark LZ77 decode backends (MB/s per variant).")
+    parser.add_argument("paths", nargs="+", type=Path, help="LZ77 files or directories to scan recursively")
+    parser.add_argument("--backend", action="append", dest="backends",
+                        help="Backend to time (repeatable, default: all). The first one is the baseline.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file, best time is kept (default: 3)")
+    parser.add_argument("--roundtrip", action="store_true",
+                        help="Recompress every file instead and verify it decodes to the same bytes")
+    parser.add_argument("--level", action="append", dest="levels", choices=COMPRESSION_LEVELS,
+                        help="Compression level for --roundtrip (repeatable, default: all)")
+    args = parser.parse_args()
+
+    # Under ``python -m`` this file runs as ``__main__`` next to the
+    # ``app.core.lz77`` module the other handlers import, so switch backends
+    # on the shared module instead of this copy.
+    from app.core.lz77 import benchmark as _shared_benchmark, roundtrip as _shared_roundtrip
+
+    if args.roundtrip:
+        report = _shared_roundtrip(args.paths, args.levels)
+        if not report:
+            print("No LZ77 files found.")
+        for variant, per_level in sorted(report.items()):
+            print(f"\n{variant}")
+            for level, stats in per_level.items():
+                ratio = stats["compressed_bytes"] / stats["original_bytes"] if stats["original_bytes"] else 0.0
+                print(
+                    f"  {level:<8} files={stats['files']:<5} original={stats['original_bytes']:>11,} "
+                    f"recompressed={stats['compressed_bytes']:>11,} ({ratio:6.1%})  "
+                    f"time={stats['seconds']:7.2f} s  failures={stats['failures']}"
+                )
+        raise SystemExit(0)
+
+    report = _shared_benchmark(args.paths, args.backends, args.repeat)
+    if not report:
+        print("No LZ77 files found.")
+    for variant, per_backend in sorted(report.items()):
+        print(f"\n{variant}")
+        for name, stats in per_backend.items():
+            print(
+                f"  {name:<10} files={stats['files']:<5} out={stats['bytes_out'] / (1024 * 1024):8.2f} MB "
+                f"time={stats['seconds']:7.3f} s  {stats['mb_per_s']:8.2f} MB/s  mismatches={stats['mismatches']}"
+            )
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
+import sys
+import threading
+import time
+from typing import Any, Callable
 
 from PIL import Image
 
 from .cell_parser import CellMap, CellRecord, decode_record, parse_cell_chunks, parse_cell_header, parse_cell_map, parse_cell_records
 from .lz77 import CellLZ77Info as LZ77Info, decompress as _decompress_lz77
-from .game_scanner import analyze_debug, scan_map_groups
+from .game_scanner import SCAN_DEEP, analyze_debug, scan_map_groups
+from .gamedata_index import get_gamedata_index, load_gamedata_index
+from .scan_cache import ScanCache
 from .texture_parser import (
+    np,
+    Palette,
     TexturePartsContainer,
     build_indexed_atlas_image,
+    build_palette_table,
     build_png_image,
     parse_palette_chunk,
     parse_texture_parts_chunk,
@@ -29,7 +39,11 @@ class LoadedCellDocument:
     chunks: list[object]
     cell_map: CellMap | None
     texture: TexturePartsContainer | None
-    palettes: list[list[tuple[int, int, int, int]]]
+    palettes: list[Palette]
+    # NumPy lookup tables matching ``palettes`` (empty without NumPy)
+    palette_tables: list[object] = field(default_factory=list)
+    # Part index per map cell, built on first render (see build_tile_grid)
+    tile_grid: object = None
 
 
 def _decompress_lz77_cell(data: bytes) -> tuple[bytes, LZ77Info | None]:
@@ -60,6 +74,7 @@ def load_cell_document(path: Path) -> LoadedCellDocument:
         cell_map=cell_map,
         texture=texture,
         palettes=palettes,
+        palette_tables=[table for table in map(build_palette_table, palettes) if table is not None],
     )
 
 
@@ -71,7 +86,251 @@ def build_atlas_for_document(document: LoadedCellDocument, palette_index: int =
     if not document.palettes:
         return None
     palette_index = max(0, min(palette_index, len(document.palettes) - 1))
-    return build_indexed_atlas_image(document.texture, document.palettes[palette_index])
+    table = document.palette_tables[palette_index] if document.palette_tables else None
+    return build_indexed_atlas_image(document.texture, document.palettes[palette_index], table)
+
+
+def _render_map_image_paste(
+    document: LoadedCellDocument,
+    atlas: Image.Image,
+    tile_width: int,
+    tile_height: int,
+    cells: tuple[int, int, int, int] | None = None,
+) -> Image.Image:
+    """Paste every tile of the map in order, or only the ``(left, top, right, bottom)`` range of *cells*.
+
+    With *cells* the image covers just that range, with its top-left cell at
+    the origin.
+    """
+    map_width = document.cell_map.width
+    left, top, right, bottom = cells if cells is not None else (0, 0, map_width, document.cell_map.height)
+    image = Image.new("RGBA", ((right - left) * tile_width, (bottom - top) * tile_height), (0, 0, 0, 0))
+
+    crop_cache: dict[int, Image.Image] = {}
+    for row in range(top, bottom):
+        for column in range(left, right):
+            record_index = document.cell_map.values[row * map_width + column] & 0xFFFF
+            if record_index >= len(document.decoded_records):
+                continue
+            record = document.decoded_records[record_index]
+            part_index = record.value_a_low16
+            if part_index >= len(document.texture.parts):
+                continue
+            if part_index not in crop_cache:
+                part = document.texture.parts[part_index]
+                x0, y0, x1, y1 = part.pixel_rect(document.texture.header.width, document.texture.header.height)
+                crop_cache[part_index] = atlas.crop((x0, y0, x1, y1))
+            image.paste(crop_cache[part_index], ((column - left) * tile_width, (row - top) * tile_height))
+    return image
+
+
+def build_tile_grid(document: LoadedCellDocument) -> object:
+    """Map every cell to a part index, ``len(parts)`` meaning "leave empty".
+
+    The grid depends only on the map and record table, so it is cached on
+    the document and reused across palette and zoom changes.
+    """
+    if document.tile_grid is None:
+        part_count = len(document.texture.parts)
+        record_parts = np.array([record.value_a_low16 for record in document.decoded_records] + [part_count], dtype=np.int64)
+        record_index = np.asarray(document.cell_map.values, dtype=np.uint32) & 0xFFFF
+        record_index = np.minimum(record_index, len(document.decoded_records))
+        grid = record_parts[record_index]
+        grid[grid > part_count] = part_count
+        document.tile_grid = grid.reshape(document.cell_map.height, document.cell_map.width)
+    return document.tile_grid
+
+
+def _nearest_indices(src: int, dst: int) -> object:
+    """Source index PIL's NEAREST resize samples for each of *dst* output pixels."""
+    probe = Image.fromarray(np.arange(src, dtype=np.int32).reshape(1, src))
+    return np.asarray(probe.resize((dst, 1), Image.Resampling.NEAREST), dtype=np.int64).reshape(dst)
+
+
+def _nearest_positions(src: int, dst: int) -> list[int]:
+    """:func:`_nearest_indices` as a plain list, for when NumPy is missing."""
+    probe = Image.new("I", (src, 1))
+    probe.putdata(range(src))
+    return list(probe.resize((dst, 1), Image.Resampling.NEAREST).getdata())
+
+
+def _pick_pixels(image: Image.Image, xs: list[int], ys: list[int]) -> Image.Image:
+    """Build an image whose pixel (i, j) is *image* pixel (xs[i], ys[j]), one column and row at a time."""
+    columns = Image.new(image.mode, (len(xs), image.height))
+    for i, x in enumerate(xs):
+        columns.paste(image.crop((x, 0, x + 1, image.height)), (i, 0))
+    out = Image.new(image.mode, (len(xs), len(ys)))
+    for j, y in enumerate(ys):
+        out.paste(columns.crop((0, y, len(xs), y + 1)), (0, j))
+    return out
+
+
+def _tile_stack(document: LoadedCellDocument, atlas: Image.Image, tile_width: int, tile_height: int) -> tuple[object, object] | None:
+    """Gather the referenced tiles into ``(tiles, slots)``, or ``None`` if the paste loop must be used.
+
+    ``tiles`` is ``(n, tile_height, tile_width, 4)`` and ``slots`` maps each
+    map cell to its tile.  Pasting tiles in order only equals a gather when
+    every referenced part crops to exactly one tile, so overlapping or
+    odd-sized parts fall back.
+    """
+    texture = document.texture
+    grid = build_tile_grid(document)
+    used, inverse = np.unique(grid, return_inverse=True)
+    tiles = np.zeros((len(used), tile_height, tile_width, 4), dtype=np.uint8)
+
+    rects = []
+    for part_index in used.tolist():
+        if part_index == len(texture.parts):
+            continue
+        x0, y0, x1, y1 = texture.parts[part_index].pixel_rect(texture.header.width, texture.header.height)
+        if x1 - x0 != tile_width or y1 - y0 != tile_height:
+            return None
+        rects.append((x0, y0, x1, y1))
+
+    in_bounds = all(x0 >= 0 and y0 >= 0 and x1 <= atlas.width and y1 <= atlas.height for x0, y0, x1, y1 in rects)
+    if atlas.mode != "RGBA":
+        # Out-of-bounds crops pad with zeros before paste converts them, which
+        # is not transparent for every mode.
+        if not in_bounds:
+            return None
+        atlas = atlas.convert("RGBA")
+    pixels = np.asarray(atlas)
+
+    # The "empty" index sorts last in ``used``, so its slot stays transparent.
+    for slot, (x0, y0, x1, y1) in enumerate(rects):
+        sx0, sy0 = max(x0, 0), max(y0, 0)
+        sx1, sy1 = min(x1, atlas.width), min(y1, atlas.height)
+        if sx0 < sx1 and sy0 < sy1:
+            tiles[slot, sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = pixels[sy0:sy1, sx0:sx1]
+    return tiles, inverse.reshape(grid.shape)
+
+
+def _sample_tiles(tiles: object, slots: object, tile_width: int, tile_height: int, xs: object, ys: object) -> Image.Image:
+    """Build an image whose pixel (i, j) is map pixel (xs[i], ys[j])."""
+    cells = slots[(ys // tile_height)[:, None], (xs // tile_width)[None, :]]
+    out = tiles[cells, (ys % tile_height)[:, None], (xs % tile_width)[None, :]]
+    return Image.frombuffer("RGBA", (len(xs), len(ys)), out, "raw", "RGBA", 0, 1)
+
+
+def _render_map_image_numpy(
+    document: LoadedCellDocument,
+    atlas: Image.Image,
+    tile_width: int,
+    tile_height: int,
+    size: tuple[int, int] | None = None,
+) -> Image.Image | None:
+    """Composite the map with NumPy gathers, or ``None`` if the paste loop must be used.
+
+    With *size*, output pixels are sampled straight from the tiles with the
+    same coordinates a NEAREST resize of the full image would pick, so only
+    the downscaled image is ever allocated.
+    """
+    stack = _tile_stack(document, atlas, tile_width, tile_height)
+    if stack is None:
+        return None
+    tiles, slots = stack
+    height, width = slots.shape
+    if size is not None:
+        xs = _nearest_indices(width * tile_width, size[0])
+        ys = _nearest_indices(height * tile_height, size[1])
+        return _sample_tiles(tiles, slots, tile_width, tile_height, xs, ys)
+
+    out = np.empty((height, tile_height, width, tile_width, 4), dtype=np.uint8)
+    for row in range(tile_height):
+        np.take(tiles[:, row], slots, axis=0, out=out[:, row])
+    return Image.frombuffer("RGBA", (width * tile_width, height * tile_height), out, "raw", "RGBA", 0, 1)
+
+
+class MapTileSource:
+    """Renders arbitrary regions of a map at any zoom for tiled viewers.
+
+    The atlas and tile stack are prepared once per document and palette; each
+    :meth:`render_region` call then only touches the pixels it returns, so a
+    viewer can render the visible tiles of a huge map on demand.  At a given
+    zoom the regions tile exactly into what ``render_map_image`` produces for
+    the same output size.  Without NumPy (or for maps the compositor cannot
+    gather) each region pastes just the tiles that can reach it and is
+    resized from those.
+    """
+
+    def __init__(self, document: LoadedCellDocument, palette_index: int = 0) -> None:
+        self.document = document
+        self.palette_index = palette_index
+        self.width = 0
+        self.height = 0
+        self._atlas = None
+        self._stack = None
+        # Cells a pasted part can spill over to the right and below its own
+        self._reach = (0, 0)
+        self._indices: tuple[int, int, object, object] | None = None
+        if document.cell_map is None or document.texture is None or not document.texture.parts:
+            return
+        self._atlas = build_atlas_for_document(document, palette_index)
+        if self._atlas is None:
+            return
+        self.tile_width = max(1, round(document.texture.parts[0].width))
+        self.tile_height = max(1, round(document.texture.parts[0].height))
+        self.width = document.cell_map.width * self.tile_width
+        self.height = document.cell_map.height * self.tile_height
+        if np is not None and self.width and self.height:
+            self._stack = _tile_stack(document, self._atlas, self.tile_width, self.tile_height)
+        if self._stack is None:
+            texture = document.texture
+            rects = [part.pixel_rect(texture.header.width, texture.header.height) for part in texture.parts]
+            self._reach = (
+                max(0, -(-max(x1 - x0 for x0, _, x1, _ in rects) // self.tile_width) - 1),
+                max(0, -(-max(y1 - y0 for _, y0, _, y1 in rects) // self.tile_height) - 1),
+            )
+
+    @property
+    def is_empty(self) -> bool:
+        return self.width == 0 or self.height == 0
+
+    def scaled_size(self, zoom: float) -> tuple[int, int]:
+        return max(1, int(self.width * zoom)), max(1, int(self.height * zoom))
+
+    def _sample_indices(self, scaled_width: int, scaled_height: int) -> tuple[object, object]:
+        if self._indices is None or self._indices[:2] != (scaled_width, scaled_height):
+            nearest = _nearest_indices if np is not None else _nearest_positions
+            self._indices = (
+                scaled_width,
+                scaled_height,
+                nearest(self.width, scaled_width),
+                nearest(self.height, scaled_height),
+            )
+        return self._indices[2], self._indices[3]
+
+    def render_region(self, zoom: float, x: int, y: int, width: int, height: int) -> Image.Image | None:
+        """Render the ``width`` x ``height`` region at (*x*, *y*) of the map scaled by *zoom*.
+
+        The region is clipped to the scaled map; ``None`` if nothing is left.
+        """
+        if self.is_empty:
+            return None
+        scaled_width, scaled_height = self.scaled_size(zoom)
+        width = min(width, scaled_width - x)
+        height = min(height, scaled_height - y)
+        if x < 0 or y < 0 or width <= 0 or height <= 0:
+            return None
+
+        if self._stack is not None:
+            xs, ys = self._sample_indices(scaled_width, scaled_height)
+            tiles, slots = self._stack
+            return _sample_tiles(tiles, slots, self.tile_width, self.tile_height, xs[x:x + width], ys[y:y + height])
+
+        # Paste only the cells under the sampled pixels, plus those whose
+        # parts are large enough to spill into them, so a paint never builds
+        # the whole map.
+        xs, ys = self._sample_indices(scaled_width, scaled_height)
+        xs, ys = xs[x:x + width], ys[y:y + height]
+        left = max(0, int(xs[0]) // self.tile_width - self._reach[0])
+        top = max(0, int(ys[0]) // self.tile_height - self._reach[1])
+        right = int(xs[-1]) // self.tile_width + 1
+        bottom = int(ys[-1]) // self.tile_height + 1
+        image = _render_map_image_paste(
+            self.document, self._atlas, self.tile_width, self.tile_height, (left, top, right, bottom)
+        )
+        return _pick_pixels(image, [int(v) - left * self.tile_width for v in xs], [int(v) - top * self.tile_height for v in ys])
 
 
 def render_map_image(document: LoadedCellDocument, palette_index: int = 0, max_edge: int | None = None) -> Image.Image | None:
@@ -86,35 +345,180 @@ def render_map_image(document: LoadedCellDocument, palette_index: int = 0, max_e
 
     tile_width = max(1, round(document.texture.parts[0].width))
     tile_height = max(1, round(document.texture.parts[0].height))
-    image = Image.new("RGBA", (document.cell_map.width * tile_width, document.cell_map.height * tile_height), (0, 0, 0, 0))
+    full_width = document.cell_map.width * tile_width
+    full_height = document.cell_map.height * tile_height
 
-    crop_cache: dict[int, Image.Image] = {}
-    for index, value in enumerate(document.cell_map.values):
-        record_index = value & 0xFFFF
-        if record_index >= len(document.decoded_records):
-            continue
-        record = document.decoded_records[record_index]
-        part_index = record.value_a_low16
-        if part_index >= len(document.texture.parts):
-            continue
-        if part_index not in crop_cache:
-            part = document.texture.parts[part_index]
-            x0, y0, x1, y1 = part.pixel_rect(document.texture.header.width, document.texture.header.height)
-            crop_cache[part_index] = atlas.crop((x0, y0, x1, y1))
-        x = (index % document.cell_map.width) * tile_width
-        y = (index // document.cell_map.width) * tile_height
-        image.paste(crop_cache[part_index], (x, y))
-
-    if max_edge is None:
-        return image
-    if image.width <= max_edge and image.height <= max_edge:
+    # Work out the output size up front so the compositor can render straight
+    # at preview scale instead of building the full-resolution map first.
+    size = None
+    if max_edge is not None and (full_width > max_edge or full_height > max_edge):
+        scale = min(max_edge / full_width, max_edge / full_height)
+        size = (max(1, round(full_width * scale)), max(1, round(full_height * scale)))
+
+    image = None
+    if np is not None:
+        image = _render_map_image_numpy(document, atlas, tile_width, tile_height, size)
+        if image is not None:
+            return image
+
+    image = _render_map_image_paste(document, atlas, tile_width, tile_height)
+    if size is None:
         return image
-    scale = min(max_edge / image.width, max_edge / image.height)
-    resized = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), Image.Resampling.NEAREST)
-    return resized
+    return image.resize(size, Image.Resampling.NEAREST)
+
+
+DEFAULT_DOCUMENT_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def _records_nbytes(records: list[Any]) -> int:
+    """Rough size of a list of same-shaped slotted records, measured on the first one."""
+    if not records:
+        return 0
+    sample = records[0]
+    per_record = sys.getsizeof(sample) + sum(sys.getsizeof(getattr(sample, name)) for name in sample.__slots__)
+    # Plus the list's pointer to each record
+    return len(records) * (per_record + 8)
+
+
+def _estimate_nbytes(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, LoadedCellDocument):
+        size = len(value.raw_data) + len(value.decompressed_data)
+        size += _records_nbytes(value.records) + _records_nbytes(value.decoded_records)
+        if value.texture is not None:
+            size += len(value.texture.atlas_bytes)
+        # Palettes and the tables built from them usually view the
+        # decompressed data; only copies add to the total.
+        size += sum(sys.getsizeof(palette) for palette in value.palettes)
+        size += sum(table.nbytes for table in value.palette_tables if table.flags.owndata)
+        if value.tile_grid is not None:
+            size += value.tile_grid.nbytes
+        return size
+    if isinstance(value, MapTileSource):
+        size = _estimate_nbytes(value._atlas)
+        if value._stack is not None:
+            size += sum(array.nbytes for array in value._stack)
+        return size
+    return 0
+
+
+@dataclass(slots=True)
+class _DocumentEntry:
+    document: LoadedCellDocument
+    mtime_ns: int
+    size: int
+    nbytes: int
+    artifacts: dict[tuple, Any] = field(default_factory=dict)
+
+
+class DocumentCache:
+    """Process-wide LRU of loaded Cell documents and what is rendered from them.
+
+    Documents are keyed by resolved path and dropped, with everything derived
+    from them, as soon as the file's mtime or size changes.  Atlases, map
+    images and tile sources are stored per document so they are evicted
+    together with it.  The total is bounded by an estimate of the bytes held;
+    the most recently used document is always kept.  Safe to call from
+    worker threads.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_DOCUMENT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _DocumentEntry] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def load(self, path: Path) -> LoadedCellDocument:
+        """Return the document for *path*, loading it if absent or changed on disk."""
+        key = str(Path(path).resolve())
+        stat = Path(path).stat()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.document
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+
+        document = load_cell_document(Path(path))
+        with self._lock:
+            self._entries[key] = _DocumentEntry(document, stat.st_mtime_ns, stat.st_size, _estimate_nbytes(document))
+            self._evict()
+        return document
+
+    def atlas(self, document: LoadedCellDocument, palette_index: int = 0) -> Image.Image | None:
+        return self._artifact(document, ("atlas", palette_index), lambda: build_atlas_for_document(document, palette_index))
+
+    def map_image(self, document: LoadedCellDocument, palette_index: int = 0, max_edge: int | None = None) -> Image.Image | None:
+        return self._artifact(
+            document, ("map", palette_index, max_edge), lambda: render_map_image(document, palette_index, max_edge)
+        )
+
+    def tile_source(self, document: LoadedCellDocument, palette_index: int = 0) -> MapTileSource:
+        return self._artifact(document, ("tiles", palette_index), lambda: MapTileSource(document, palette_index))
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """Forget *path* (or everything)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(path).resolve()), None)
+
+    def _entry_for(self, document: LoadedCellDocument) -> _DocumentEntry | None:
+        entry = self._entries.get(str(document.source_path.resolve()))
+        return entry if entry is not None and entry.document is document else None
+
+    def _artifact(self, document: LoadedCellDocument, key: tuple, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entry_for(document)
+            if entry is not None and key in entry.artifacts:
+                self._entries.move_to_end(str(document.source_path.resolve()))
+                self.hits += 1
+                return entry.artifacts[key]
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            # Documents not loaded through the cache (or evicted meanwhile)
+            # are rendered but not retained.
+            entry = self._entry_for(document)
+            if entry is not None:
+                entry.artifacts[key] = value
+                # Rendering may also have built the document's tile grid.
+                entry.nbytes = _estimate_nbytes(document) + sum(map(_estimate_nbytes, entry.artifacts.values()))
+                self._evict()
+        return value
+
+    def _evict(self) -> None:
+        total = sum(entry.nbytes for entry in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            total -= entry.nbytes
+
+
+document_cache = DocumentCache()
 
 
 def list_cell_files(game_dir: Path) -> list[Path]:
+    index = get_gamedata_index(game_dir)
+    if index is not None:
+        # The index may predate files deleted since it was built
+        return [
+            *sorted(path for path in index.paths("GameData/app/Field/Map/", (".mpd",)) if path.is_file()),
+            *sorted(path for path in index.paths("GameData/app/Field/Chizu/", (".mpd",)) if path.is_file()),
+        ]
     field_map = game_dir / "GameData" / "app" / "Field" / "Map"
     field_chizu = game_dir / "GameData" / "app" / "Field" / "Chizu"
     results: list[Path] = []
@@ -125,5 +529,78 @@ def list_cell_files(game_dir: Path) -> list[Path]:
     return results
 
 
-def scan_workspace(game_dir: Path) -> tuple[object, list[object]]:
-    return analyze_debug(game_dir), scan_map_groups(game_dir)
+def scan_workspace(
+    game_dir: Path,
+    cache: ScanCache | None = None,
+    max_workers: int | None = None,
+    on_insight: Callable[[object], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    tier: str = SCAN_DEEP,
+) -> tuple[object, list[object]]:
+    return analyze_debug(game_dir), scan_map_groups(game_dir, cache, max_workers, on_insight, should_cancel, tier)
+
+
+def benchmark_render(game_dir: Path, palette_index: int = 0, repeat: int = 1) -> dict[str, float]:
+    """Time the NumPy compositor against the paste loop over every map file.
+
+    Both renderers get the same atlas; the best of *repeat* runs is kept per
+    file.  ``mismatches`` counts files whose images differ, ``fallbacks``
+    files the compositor handed back to the paste loop.
+    """
+    stats = {"files": 0, "rendered": 0, "fallbacks": 0, "mismatches": 0, "errors": 0, "numpy_seconds": 0.0, "paste_seconds": 0.0}
+    for path in list_cell_files(game_dir):
+        stats["files"] += 1
+        try:
+            document = load_cell_document(path)
+            if document.cell_map is None or document.texture is None or not document.texture.parts:
+                continue
+            atlas = build_atlas_for_document(document, palette_index)
+            if atlas is None:
+                continue
+        except Exception:
+            stats["errors"] += 1
+            continue
+        tile_width = max(1, round(document.texture.parts[0].width))
+        tile_height = max(1, round(document.texture.parts[0].height))
+
+        fast = None
+        best_fast = best_paste = float("inf")
+        for _ in range(max(1, repeat)):
+            document.tile_grid = None
+            start = time.perf_counter()
+            fast = _render_map_image_numpy(document, atlas, tile_width, tile_height) if np is not None else None
+            best_fast = min(best_fast, time.perf_counter() - start)
+            start = time.perf_counter()
+            slow = _render_map_image_paste(document, atlas, tile_width, tile_height)
+            best_paste = min(best_paste, time.perf_counter() - start)
+
+        stats["rendered"] += 1
+        stats["paste_seconds"] += best_paste
+        if fast is None:
+            stats["fallbacks"] += 1
+            stats["numpy_seconds"] += best_paste
+            continue
+        stats["numpy_seconds"] += best_fast
+        if fast.size != slow.size or fast.tobytes() != slow.tobytes():
+            stats["mismatches"] += 1
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark map compositing over every Field/Map and Field/Chizu .mpd file.")
+    parser.add_argument("game_dir", type=Path, help="Game install directory (containing GameData)")
+    parser.add_argument("--palette", type=int, default=0, help="Palette index to render with (default: 0)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per file, best time is kept (default: 1)")
+    args = parser.parse_args()
+
+    # List the map files from the GameData index when one has been built
+    load_gamedata_index(args.game_dir)
+    result = benchmark_render(args.game_dir, args.palette, args.repeat)
+    speedup = result["paste_seconds"] / result["numpy_seconds"] if result["numpy_seconds"] else 0.0
+    print(
+        f"files={result['files']} rendered={result['rendered']} errors={result['errors']} "
+        f"fallbacks={result['fallbacks']} mismatches={result['mismatches']}"
+    )
+    print(f"paste={result['paste_seconds']:.3f} s  numpy={result['numpy_seconds']:.3f} s  speedup={speedup:.1f}x")
@@ -17,6 +17,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import BinaryIO, Optional, Tuple, Union
 
+from app.core.lz77 import get_backend
+
 
 @dataclass
 class LZ77Header:
@@ -59,35 +61,9 @@ class LZ77Decompressor:
 
     def _decompress_stream(self, data: bytes, expected_size: int) -> Tuple[bytes, int]:
         """Core token-based decompression. Returns (output, bytes_consumed)."""
-        output = bytearray()
-        pos = 0
-        data_len = len(data)
-
-        while pos < data_len and len(output) < expected_size:
-            token = data[pos]
-            pos += 1
-
-            if token & 0x80:
-                if pos >= data_len:
-                    self.logger.warning("Unexpected end of stream while reading offset")
-                    break
-
-                length = ((token & 0x7C) >> 2) + 3
-                offset = ((token & 0x03) << 8) | data[pos]
-                pos += 1
-                offset += 1
-
-                for _ in range(length):
-                    if len(output) >= expected_size:
-                        break
-                    if offset <= len(output):
-                        output.append(output[-offset])
-                    else:
-                        # Window underrun: mirror observed decompressor behaviour with zero fill
-                        output.append(0)
-            else:
-                output.append(token)
-
+        output, pos, truncated = get_backend().token_stream(data, expected_size)
+        if truncated:
+            self.logger.warning("Unexpected end of stream while reading offset")
         return bytes(output), pos
 
     def decompress_data(self, data: bytes) -> Optional[bytes]:
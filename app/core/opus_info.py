@@ -0,0 +1,248 @@
+"""
+Ogg/Opus metadata for PCK sounds without decoding any audio.
+
+Only the Ogg page headers are walked: the first two packets (OpusHead and
+OpusTags) give the channel count, pre-skip and LoopStart/LoopEnd comments,
+and the granule position of the last page gives the length.  Everything
+reads from the sound's buffer (a memoryview into the mapped PCK) and only
+copies the header packets and the last page.
+
+Per-archive results are cached in a JSON file next to the PCK so a voice
+pack with thousands of lines can be listed, sorted and filtered by length
+straight away.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import json
+import os
+import struct
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .pck_handler import PCKFile
+
+
+OPUS_SAMPLE_RATE = 48000
+OPUS_INDEX_SUFFIX = ".opusinfo.json"
+OPUS_INDEX_VERSION = 1
+
+_PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+_MAX_PAGE_SIZE = _PAGE_HEADER.size + 255 + 255 * 255
+
+
+@dataclass(slots=True)
+class OpusInfo:
+    channels: int
+    pre_skip: int
+    input_sample_rate: int
+    granule_position: int
+    size: int
+    vendor: str = ""
+    loop_start: int | None = None
+    loop_end: int | None = None
+
+    @property
+    def samples(self) -> int:
+        return max(0, self.granule_position - self.pre_skip)
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds."""
+        return self.samples / OPUS_SAMPLE_RATE
+
+    @property
+    def bitrate(self) -> float:
+        """Average bitrate in bits per second, container overhead included."""
+        return self.size * 8 / self.duration if self.samples else 0.0
+
+
+def _iter_packets(data, offset: int = 0):
+    """Yield ``(serial, packet)`` for the packets at the start of an Ogg stream."""
+    parts: list[bytes] = []
+    while offset + _PAGE_HEADER.size <= len(data):
+        capture, _version, _flags, _granule, serial, _seq, _crc, segments = _PAGE_HEADER.unpack_from(data, offset)
+        if capture != b"OggS":
+            return
+        lacing = data[offset + _PAGE_HEADER.size:offset + _PAGE_HEADER.size + segments]
+        body = offset + _PAGE_HEADER.size + segments
+        start = body
+        for value in lacing:
+            body += value
+            if value < 255:
+                parts.append(bytes(data[start:body]))
+                yield serial, b"".join(parts)
+                parts = []
+                start = body
+        if start < body:
+            parts.append(bytes(data[start:body]))
+        offset = body
+
+
+def _last_granule(data, serial: int) -> int | None:
+    """Granule position of the last complete page of *serial*."""
+    tail_start = max(0, len(data) - _MAX_PAGE_SIZE)
+    tail = bytes(data[tail_start:])
+    end = len(tail)
+    while True:
+        pos = tail.rfind(b"OggS", 0, end)
+        if pos < 0:
+            return None
+        if pos + _PAGE_HEADER.size <= len(tail):
+            _capture, _version, _flags, granule, page_serial, _seq, _crc, segments = _PAGE_HEADER.unpack_from(tail, pos)
+            lacing = tail[pos + _PAGE_HEADER.size:pos + _PAGE_HEADER.size + segments]
+            complete = len(lacing) == segments and pos + _PAGE_HEADER.size + segments + sum(lacing) <= len(tail)
+            if complete and page_serial == serial and granule != -1:
+                return granule
+        end = pos
+
+
+def _parse_tags(packet: bytes) -> tuple[str, dict[str, str]]:
+    vendor_length = struct.unpack_from("<I", packet, 8)[0]
+    vendor = packet[12:12 + vendor_length].decode("utf-8", errors="replace")
+    offset = 12 + vendor_length
+    count = struct.unpack_from("<I", packet, offset)[0]
+    offset += 4
+    comments: dict[str, str] = {}
+    for _ in range(count):
+        length = struct.unpack_from("<I", packet, offset)[0]
+        entry = packet[offset + 4:offset + 4 + length].decode("utf-8", errors="replace")
+        offset += 4 + length
+        key, _, value = entry.partition("=")
+        comments[key.upper()] = value
+    return vendor, comments
+
+
+def _loop_point(comments: dict[str, str], key: str) -> int | None:
+    try:
+        return int(comments[key])
+    except (KeyError, ValueError):
+        return None
+
+
+def read_opus_info(data) -> OpusInfo | None:
+    """Read Opus metadata from an Ogg stream, or None if *data* is not Opus."""
+    if bytes(data[:4]) != b"OggS":
+        return None
+    try:
+        packets = _iter_packets(data)
+        serial, head = next(packets)
+        if not head.startswith(b"OpusHead") or len(head) < 19:
+            return None
+        channels, pre_skip, input_rate = struct.unpack_from("<BHI", head, 9)
+        vendor, comments = "", {}
+        tags_serial, tags = next(packets, (None, b""))
+        if tags_serial == serial and tags.startswith(b"OpusTags"):
+            vendor, comments = _parse_tags(tags)
+    except struct.error:
+        return None
+    return OpusInfo(
+        channels=channels,
+        pre_skip=pre_skip,
+        input_sample_rate=input_rate,
+        granule_position=_last_granule(data, serial) or 0,
+        size=len(data),
+        vendor=vendor,
+        loop_start=_loop_point(comments, "LOOPSTART"),
+        loop_end=_loop_point(comments, "LOOPEND"),
+    )
+
+
+def opus_index_path(pck_path: str) -> str:
+    return pck_path + OPUS_INDEX_SUFFIX
+
+
+def _archive_key(pck_path: str) -> list[int]:
+    stat = os.stat(pck_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_index(pck_path: str) -> list | None:
+    try:
+        with open(opus_index_path(pck_path), "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != OPUS_INDEX_VERSION or payload.get("archive") != _archive_key(pck_path):
+        return None
+    return payload.get("sounds")
+
+
+def _save_index(pck_path: str, names: list[str], infos: list[OpusInfo | None]) -> None:
+    payload = {
+        "version": OPUS_INDEX_VERSION,
+        "archive": _archive_key(pck_path),
+        "sounds": [
+            {"name": name, "info": asdict(info) if info else None}
+            for name, info in zip(names, infos)
+        ],
+    }
+    try:
+        with open(opus_index_path(pck_path), "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+    except OSError:
+        # Read-only game folders just go without a cache
+        pass
+
+
+def index_pck(pck: PCKFile, use_cache: bool = True) -> list[OpusInfo | None]:
+    """Opus metadata for every sound of *pck*, in index order.
+
+    With *use_cache* the sidecar file next to the archive is reused for
+    sounds that are unchanged since the PCK was parsed, and rewritten when
+    anything had to be read.
+    """
+    source = pck.source_path if use_cache and pck.source_path and os.path.exists(pck.source_path) else None
+    cached = (_load_index(source) or []) if source else []
+
+    infos: list[OpusInfo | None] = []
+    stale = False
+    for i, sound in enumerate(pck.sounds):
+        entry = cached[i] if i < len(cached) else None
+        if entry is not None and entry.get("name") == sound.name and not pck.is_modified(i):
+            infos.append(OpusInfo(**entry["info"]) if entry["info"] else None)
+            continue
+        infos.append(read_opus_info(sound.data))
+        stale = True
+
+    if source and stale and not any(pck.is_modified(i) for i in range(len(pck.sounds))):
+        _save_index(source, [sound.name for sound in pck.sounds], infos)
+    return infos
+
+
+def load_cached_index(pck: PCKFile) -> list[OpusInfo | None] | None:
+    """Opus metadata for *pck* from its sidecar, or None unless the sidecar covers it.
+
+    Only the sidecar is read, so this is cheap enough for the GUI thread;
+    the sidecar must match the archive on disk and every sound must be
+    unchanged since the PCK was parsed.
+    """
+    if not pck.source_path or not os.path.exists(pck.source_path):
+        return None
+    cached = _load_index(pck.source_path)
+    if cached is None or len(cached) != len(pck.sounds):
+        return None
+    infos: list[OpusInfo | None] = []
+    for i, (entry, sound) in enumerate(zip(cached, pck.sounds)):
+        if entry.get("name") != sound.name or pck.is_modified(i):
+            return None
+        infos.append(OpusInfo(**entry["info"]) if entry["info"] else None)
+    return infos
+
+
+def index_pck_file(pck_path: str) -> list[OpusInfo | None]:
+    """:func:`index_pck` on the archive at *pck_path*, through its own mapping.
+
+    Meant for worker threads: the archive is opened separately, so the
+    caller's PCKFile can be closed or modified meanwhile.
+    """
+    from .pck_handler import PCKFile
+
+    with PCKFile(pck_path) as pck:
+        return index_pck(pck)
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:06.3f}"
@@ -11,17 +11,27 @@ License: Free to use and modify
 """
 
 import os
+import bisect
+import mmap
 import struct
+import tempfile
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
 
 @dataclass
 class Sound:
-    """Represents a single sound file within a PCK archive."""
+    """
+    Represents a single sound file within a PCK archive.
+    
+    Sounds parsed from a lazily opened PCKFile hold a memoryview into the
+    archive's memory map, so their bytes are only read from disk when the
+    sound is actually played, extracted or written.
+    """
     name: str
-    data: bytes
+    data: Union[bytes, memoryview]
     loop_start: int = 0  # Opus LoopStart metadata (sample position)
     loop_end: int = 0    # Opus LoopEnd metadata (sample position)
     
@@ -48,7 +58,17 @@ class Sound:
     
     def is_opus(self) -> bool:
         """Check if this sound is in Opus/OGG format."""
-        return self.data.startswith(b'OggS')
+        return bytes(self.data[:4]) == b'OggS'
+
+
+@dataclass
+class _Slot:
+    """On-disk location of a sound as parsed from the source PCK."""
+    name: str
+    offset: int
+    size: int
+    capacity: int  # Bytes available before the next payload
+    data: Optional[Union[bytes, memoryview]]  # Data object the sound was parsed with
 
 
 class PCKFile:
@@ -75,43 +95,57 @@ class PCKFile:
     FILENAME_HEADER = b'Filename            '  # Padded to 20 bytes
     PACK_HEADER = b'Pack                '      # Padded to 20 bytes
     
-    def __init__(self, file_path: str = None):
+    def __init__(self, file_path: str = None, lazy: bool = True):
         """
         Initialize a PCK file handler.
         
         Args:
             file_path: Optional path to an existing PCK file to parse.
                       If None, creates an empty PCK for building.
+            lazy: If True, memory-map the file and parse only the Filename
+                  and Pack index tables; sound data stays on disk until it
+                  is accessed. If False, read the whole file into memory.
         """
         self.sounds: List[Sound] = []
         self.source_path: Optional[str] = file_path
+        self._mmap: Optional[mmap.mmap] = None
+        self._slots: List[_Slot] = []
+        self._info_base = 0
+        self._names: Optional[Dict[str, List[int]]] = None
+        self._names_count = 0
+        # Views dropped by a rewrite that may still have to be restored:
+        # id(view) -> (view, slot index)
+        self._released: Dict[int, Tuple[memoryview, int]] = {}
         
         if file_path:
-            self._parse(file_path)
+            self._parse(file_path, lazy)
     
-    def _parse(self, file_path: str) -> None:
+    def _parse(self, file_path: str, lazy: bool = True) -> None:
         """Parse an existing PCK file."""
         with open(file_path, 'rb') as f:
-            data = f.read()
+            if lazy and os.fstat(f.fileno()).st_size > 0:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._mmap
+            else:
+                data = f.read()
+        # Sound data is sliced from a view so lazy sounds share the map
+        view = memoryview(data) if self._mmap is not None else data
         
         # Verify Filename header
         if not data[:8].startswith(b'Filename'):
             raise ValueError(f"Invalid PCK file: missing 'Filename' header")
         
         # Read Filename section size
-        filename_section_size = struct.unpack('<I', data[self.HEADER_SIZE:self.HEADER_SIZE + 4])[0]
+        filename_section_size = struct.unpack_from('<I', data, self.HEADER_SIZE)[0]
         
         # Calculate sound count from first offset
         # First offset tells us how many offsets there are (offset / 4 = count)
-        first_offset = struct.unpack('<I', data[self.HEADER_SIZE + 4:self.HEADER_SIZE + 8])[0]
+        first_offset = struct.unpack_from('<I', data, self.HEADER_SIZE + 4)[0]
         sound_count = first_offset // 4
         
         # Read all filename offsets
-        filename_offsets = []
         offset_base = self.HEADER_SIZE + 4  # After header and size
-        for i in range(sound_count):
-            offset = struct.unpack('<I', data[offset_base + i * 4:offset_base + i * 4 + 4])[0]
-            filename_offsets.append(offset)
+        filename_offsets = struct.unpack_from(f'<{sound_count}I', data, offset_base)
         
         # Read filenames
         sound_names = []
@@ -131,23 +165,116 @@ class PCKFile:
             raise ValueError(f"Invalid PCK file: missing 'Pack' header at offset {pack_offset}")
         
         # Read Pack section info
-        pack_section_size = struct.unpack('<I', data[pack_offset + self.HEADER_SIZE:pack_offset + self.HEADER_SIZE + 4])[0]
-        pack_file_count = struct.unpack('<I', data[pack_offset + self.HEADER_SIZE + 4:pack_offset + self.HEADER_SIZE + 8])[0]
+        pack_section_size, pack_file_count = struct.unpack_from('<II', data, pack_offset + self.HEADER_SIZE)
         
         # Read sound data info (offset, size pairs)
         info_base = pack_offset + self.HEADER_SIZE + 8
+        sound_info = struct.unpack_from(f'<{sound_count * 2}I', data, info_base)
+        
+        # A slot runs up to the next payload (or end of file); payloads
+        # shared by several entries cannot be rewritten in place.
+        offset_counts = Counter(sound_info[0::2])
+        offsets = sorted(offset_counts)
+        next_offset = dict(zip(offsets, offsets[1:] + [len(data)]))
+        
+        self._info_base = info_base
+        self._slots = []
         for i in range(sound_count):
-            sound_offset = struct.unpack('<I', data[info_base + i * 8:info_base + i * 8 + 4])[0]
-            sound_size = struct.unpack('<I', data[info_base + i * 8 + 4:info_base + i * 8 + 8])[0]
+            sound_offset = sound_info[i * 2]
+            sound_size = sound_info[i * 2 + 1]
             
-            # Extract sound data
-            sound_data = data[sound_offset:sound_offset + sound_size]
+            # Extract sound data (a view into the map when lazy)
+            sound_data = view[sound_offset:sound_offset + sound_size]
             
             # Create Sound object
             self.sounds.append(Sound(
                 name=sound_names[i],
                 data=sound_data
             ))
+            capacity = 0 if offset_counts[sound_offset] > 1 else next_offset[sound_offset] - sound_offset
+            self._slots.append(_Slot(sound_names[i], sound_offset, sound_size, capacity, sound_data))
+    
+    @property
+    def is_mapped(self) -> bool:
+        """True while sound data is served from a memory map of the source."""
+        return self._mmap is not None
+    
+    def is_modified(self, index: int) -> bool:
+        """True if the sound at index differs from the one parsed from the source."""
+        if index >= len(self._slots):
+            return True
+        sound, slot = self.sounds[index], self._slots[index]
+        return sound.name != slot.name or sound.data is not slot.data
+    
+    def close(self) -> None:
+        """
+        Release the memory map of a lazily opened PCK file.
+        
+        Sounds still backed by the map are copied into memory first, so the
+        PCK stays usable (and writable) after closing.
+        """
+        self._unmap(keep_data=True)
+    
+    def _unmap(self, keep_data: bool) -> None:
+        """
+        Drop every view into the memory map and close it.
+        
+        Without keep_data, sounds are left holding their released views,
+        which _remap() can bind to the source again if it turns out to be
+        still needed.
+        """
+        if self._mmap is None:
+            return
+        slots = {id(slot.data): slot for slot in self._slots}
+        if keep_data:
+            for sound in self.sounds:
+                if isinstance(sound.data, memoryview):
+                    view = sound.data
+                    sound.data = view.tobytes()
+                    slot = slots.get(id(view))
+                    if slot is not None:
+                        slot.data = sound.data
+                    view.release()
+        else:
+            self._released = {
+                id(slot.data): (slot.data, i)
+                for i, slot in enumerate(self._slots) if isinstance(slot.data, memoryview)
+            }
+            for sound in self.sounds:
+                if isinstance(sound.data, memoryview):
+                    sound.data.release()
+        for slot in self._slots:
+            if isinstance(slot.data, memoryview):
+                slot.data.release()
+                slot.data = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a view; the map is freed with it
+            pass
+        self._mmap = None
+    
+    def _remap(self) -> None:
+        """Map the untouched source again after a failed rewrite (see _unmap)."""
+        with open(self.source_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        for slot in self._slots:
+            slot.data = view[slot.offset:slot.offset + slot.size]
+        self._rebind(self.sounds)
+    
+    def _rebind(self, sounds: List[Sound]) -> None:
+        """Point sounds still holding a view released by _unmap at the new map."""
+        for sound in sounds:
+            released = self._released.get(id(sound.data))
+            if released is not None and released[0] is sound.data:
+                sound.data = self._slots[released[1]].data
+    
+    def __enter__(self) -> 'PCKFile':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def _format_header(self, name: str) -> bytes:
         """Format a section header (padded to 20 bytes with spaces)."""
@@ -161,25 +288,56 @@ class PCKFile:
             return 0
         return alignment - (size % alignment)
     
+    def _name_index(self) -> Dict[str, List[int]]:
+        """
+        Map of base name (no extension) to the indices of matching sounds.
+        
+        Names are matched with or without extension, and a name with an
+        extension always shares its base with the sound it names, so one
+        dictionary keyed by base name answers every lookup. The index is
+        rebuilt whenever the sound list changed length behind its back.
+        """
+        if self._names is None or self._names_count != len(self.sounds):
+            names: Dict[str, List[int]] = {}
+            for i, sound in enumerate(self.sounds):
+                names.setdefault(os.path.splitext(sound.name)[0], []).append(i)
+            self._names = names
+            self._names_count = len(self.sounds)
+        return self._names
+    
+    def _find_index(self, name: str) -> Optional[int]:
+        """Index of the first sound matching name, or None."""
+        indices = self._name_index().get(os.path.splitext(name)[0])
+        return indices[0] if indices else None
+    
+    @staticmethod
+    def _adopt_name(new_sound: Sound, old_sound: Sound) -> None:
+        """Keep original name extension if new sound has different extension."""
+        old_base, old_ext = os.path.splitext(old_sound.name)
+        if os.path.splitext(new_sound.name)[1] != old_ext:
+            new_sound.name = old_base + old_ext
+    
     def add_sound(self, sound: Sound) -> None:
         """Add a sound to the PCK file."""
+        names = self._name_index()
         self.sounds.append(sound)
+        names.setdefault(os.path.splitext(sound.name)[0], []).append(len(self.sounds) - 1)
+        self._names_count = len(self.sounds)
     
     def remove_sound(self, name: str) -> bool:
         """Remove a sound by name. Returns True if found and removed."""
-        for i, sound in enumerate(self.sounds):
-            if sound.name == name or os.path.splitext(sound.name)[0] == os.path.splitext(name)[0]:
-                del self.sounds[i]
-                return True
-        return False
+        index = self._find_index(name)
+        if index is None:
+            return False
+        del self.sounds[index]
+        # Later indices shift; the index is rebuilt on the next lookup
+        self._names = None
+        return True
     
     def find_sound(self, name: str) -> Optional[Sound]:
         """Find a sound by name (with or without extension)."""
-        name_base = os.path.splitext(name)[0]
-        for sound in self.sounds:
-            if sound.name == name or os.path.splitext(sound.name)[0] == name_base:
-                return sound
-        return None
+        index = self._find_index(name)
+        return self.sounds[index] if index is not None else None
     
     def replace_sound(self, name: str, new_sound: Sound) -> bool:
         """
@@ -192,27 +350,46 @@ class PCKFile:
         Returns:
             True if sound was found and replaced, False otherwise
         """
-        name_base = os.path.splitext(name)[0]
-        for i, sound in enumerate(self.sounds):
-            sound_base = os.path.splitext(sound.name)[0]
-            if sound.name == name or sound_base == name_base:
-                # Keep original name extension if new sound has different extension
-                if os.path.splitext(new_sound.name)[1] != os.path.splitext(sound.name)[1]:
-                    new_sound.name = name_base + os.path.splitext(sound.name)[1]
-                self.sounds[i] = new_sound
-                return True
-        return False
-    
-    def write(self, output_path: str) -> None:
+        index = self._find_index(name)
+        if index is None:
+            return False
+        old_name = self.sounds[index].name
+        self._adopt_name(new_sound, self.sounds[index])
+        self.sounds[index] = new_sound
+        if os.path.splitext(new_sound.name)[0] != os.path.splitext(old_name)[0]:
+            # The sound is now found under another name
+            self._names = None
+        return True
+    
+    def batch(self, output_path: Optional[str] = None) -> 'PCKBatch':
         """
-        Write the PCK file to disk.
+        Start a transaction that groups many adds, replaces and removes.
+        
+        Changes are queued and applied together in one pass when the with
+        block exits, then the PCK is written once to output_path (if given).
+        If the block raises, nothing is applied.
+        
+        Example:
+            with pck.batch(output_path) as batch:
+                batch.replace("V_0001", Sound.from_file("V_0001.opus"))
+                batch.remove("V_0002")
         
         Args:
-            output_path: Path where the PCK file should be written
+            output_path: Where to write the PCK on commit, or None to only
+                         update it in memory
         """
-        if not self.sounds:
-            raise ValueError("Cannot write empty PCK file")
+        return PCKBatch(self, output_path)
+    
+    def _build_index(self) -> Tuple[bytes, int]:
+        """
+        Build everything that precedes the sound payloads.
         
+        The payload offsets only depend on the sound sizes, so the Filename
+        section and the Pack index can be laid out before any data is read.
+        
+        Returns:
+            (index bytes, total file size including the final padding)
+        """
         # Build Filename section
         filename_section = bytearray()
         
@@ -234,8 +411,7 @@ class PCKFile:
             name_data.extend(b'\x00')  # Null terminator
         
         # Write offsets
-        for offset in name_offsets:
-            filename_section.extend(struct.pack('<I', offset))
+        filename_section.extend(struct.pack(f'<{len(name_offsets)}I', *name_offsets))
         
         # Write name data
         filename_section.extend(name_data)
@@ -248,7 +424,7 @@ class PCKFile:
         padding = self._align(len(filename_section), 8)
         filename_section.extend(b'\x00' * padding)
         
-        # Build Pack section
+        # Build Pack section header and index
         pack_section = bytearray()
         
         # Header
@@ -261,47 +437,144 @@ class PCKFile:
         # File count
         pack_section.extend(struct.pack('<I', len(self.sounds)))
         
-        # Build sound data with 16-byte alignment
-        sound_data = bytearray()
-        sound_info = []  # (offset, size) pairs
-        
         # Calculate base offset for sound data
         # It's: filename_section_length + pack_header(0x14) + size(4) + count(4) + info_array + padding(4)
         data_base_offset = len(filename_section) + pack_section_length + 4
         
+        # Write sound info (offset, size pairs); each payload is padded to 16 bytes
+        offset = data_base_offset
         for sound in self.sounds:
-            # Record offset and size
-            sound_info.append((data_base_offset + len(sound_data), len(sound.data)))
-            
-            # Add sound data
-            sound_data.extend(sound.data)
-            
-            # Add padding for 16-byte alignment
-            padding = self._align(len(sound.data), 16)
-            sound_data.extend(b'\x00' * padding)
-        
-        # Write sound info (offset, size pairs)
-        for offset, size in sound_info:
-            pack_section.extend(struct.pack('<I', offset))
-            pack_section.extend(struct.pack('<I', size))
+            size = len(sound.data)
+            pack_section.extend(struct.pack('<II', offset, size))
+            offset += size + self._align(size, 16)
         
         # Add padding before data
         pack_section.extend(b'\x00\x00\x00\x00')
         
-        # Add sound data
-        pack_section.extend(sound_data)
+        # Final padding to 16-byte alignment
+        total_size = offset + self._align(offset, 16)
+        return bytes(filename_section) + bytes(pack_section), total_size
+    
+    def _iter_chunks(self, index: bytes, total_size: int):
+        """Yield the file contents piece by piece, payloads without copying."""
+        yield index
+        written = len(index)
+        for sound in self.sounds:
+            size = len(sound.data)
+            yield sound.data
+            padding = self._align(size, 16)
+            if padding:
+                yield b'\x00' * padding
+            written += size + padding
+        if total_size > written:
+            yield b'\x00' * (total_size - written)
+    
+    def write(self, output_path: str, in_place: bool = True) -> None:
+        """
+        Write the PCK file to disk.
+        
+        The index is laid out first and the sound payloads are then streamed
+        straight from their sources (memory-mapped views of the original PCK
+        or replacement data), so the archive is never assembled in memory.
         
-        # Combine sections
-        output_data = bytes(filename_section) + bytes(pack_section)
+        When output_path is the source file and in_place is True, sounds
+        whose replacement fits in their original slot are rewritten without
+        touching the rest of the archive (see update_in_place).
         
-        # Final padding to 16-byte alignment
-        padding = self._align(len(output_data), 16)
-        output_data += b'\x00' * padding
+        Args:
+            output_path: Path where the PCK file should be written
+            in_place: Allow updating the source file in place
+        """
+        if not self.sounds:
+            raise ValueError("Cannot write empty PCK file")
         
-        # Write to file
-        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-        with open(output_path, 'wb') as f:
-            f.write(output_data)
+        overwrite_source = bool(
+            self.source_path and os.path.exists(output_path)
+            and os.path.samefile(output_path, self.source_path)
+        )
+        if overwrite_source and in_place and self.update_in_place() is not None:
+            return
+        
+        index, total_size = self._build_index()
+        output_dir = os.path.dirname(output_path) or '.'
+        os.makedirs(output_dir, exist_ok=True)
+        
+        if not overwrite_source:
+            with open(output_path, 'wb') as f:
+                f.writelines(self._iter_chunks(index, total_size))
+            return
+        
+        # The source may still be mapped, so build the new archive next to
+        # it and swap it in, then map the new file. The map is dropped
+        # before the swap (a mapped file cannot be replaced on Windows) and
+        # restored if the swap fails, since the source is then untouched.
+        lazy = self._mmap is not None
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=output_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.writelines(self._iter_chunks(index, total_size))
+            self._unmap(keep_data=False)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            if lazy and self._mmap is None:
+                self._remap()
+            raise
+        self.sounds = []
+        self._released = {}
+        self._parse(output_path, lazy)
+    
+    def update_in_place(self) -> Optional[List[str]]:
+        """
+        Rewrite changed sounds inside their original slots of the source file.
+        
+        Only the payload of each replaced sound and its size in the Pack
+        index are written. Nothing is written unless the sound list still
+        matches the source index and every replacement fits in its slot.
+        
+        Returns:
+            Names of the rewritten sounds, or None if the whole archive
+            has to be rewritten instead
+        """
+        if not self.source_path or len(self.sounds) != len(self._slots):
+            return None
+        
+        changed = []
+        for i, (sound, slot) in enumerate(zip(self.sounds, self._slots)):
+            if sound.name != slot.name:
+                return None
+            if sound.data is slot.data:
+                continue
+            if len(sound.data) > slot.capacity:
+                return None
+            changed.append(i)
+        
+        # A replacement may be a view into this same file (e.g. two sounds
+        # swapped), so read every new payload before any slot is overwritten
+        payloads = {i: bytes(self.sounds[i].data) for i in changed}
+        
+        with open(self.source_path, 'r+b') as f:
+            for i in changed:
+                slot = self._slots[i]
+                size = len(payloads[i])
+                # Clear what is left of the old payload and its padding
+                end = min(slot.capacity, max(slot.size, size) + self._align(max(slot.size, size), 16))
+                f.seek(slot.offset)
+                f.write(payloads[i])
+                f.write(b'\x00' * (end - size))
+                f.seek(self._info_base + i * 8 + 4)
+                f.write(struct.pack('<I', size))
+        
+        for i in changed:
+            sound, slot = self.sounds[i], self._slots[i]
+            slot.size = len(payloads[i])
+            if self._mmap is not None:
+                sound.data = memoryview(self._mmap)[slot.offset:slot.offset + slot.size]
+            else:
+                sound.data = payloads[i]
+            slot.data = sound.data
+        return [self.sounds[i].name for i in changed]
     
     def extract_all(self, output_dir: str) -> List[str]:
         """
@@ -336,6 +609,97 @@ class PCKFile:
         return self.sounds[index]
 
 
+class PCKBatch:
+    """
+    Queued changes to a PCKFile, applied together on commit.
+    
+    Use through PCKFile.batch(). Lookups see the archive as it was when the
+    batch started plus the changes queued so far, so replace() and remove()
+    report whether the name will be found when the batch is applied.
+    """
+    
+    def __init__(self, pck: PCKFile, output_path: Optional[str] = None):
+        self.pck = pck
+        self.output_path = output_path
+        self._sounds: Optional[List[Optional[Sound]]] = None
+        self._names: Dict[str, List[int]] = {}
+    
+    def _state(self) -> Tuple[List[Optional[Sound]], Dict[str, List[int]]]:
+        """Working copy of the sound list and its name index."""
+        if self._sounds is None:
+            self._sounds = list(self.pck.sounds)
+            self._names = {base: list(indices) for base, indices in self.pck._name_index().items()}
+        return self._sounds, self._names
+    
+    def _find_index(self, name: str) -> Optional[int]:
+        sounds, names = self._state()
+        for index in names.get(os.path.splitext(name)[0], ()):
+            if sounds[index] is not None:
+                return index
+        return None
+    
+    def add(self, sound: Sound) -> None:
+        """Queue a new sound to be appended."""
+        sounds, names = self._state()
+        sounds.append(sound)
+        names.setdefault(os.path.splitext(sound.name)[0], []).append(len(sounds) - 1)
+    
+    def replace(self, name: str, new_sound: Sound) -> bool:
+        """Queue a replacement. Returns True if name matches a sound."""
+        index = self._find_index(name)
+        if index is None:
+            return False
+        old_base = os.path.splitext(self._sounds[index].name)[0]
+        PCKFile._adopt_name(new_sound, self._sounds[index])
+        self._sounds[index] = new_sound
+        new_base = os.path.splitext(new_sound.name)[0]
+        if new_base != old_base:
+            self._names[old_base].remove(index)
+            bisect.insort(self._names.setdefault(new_base, []), index)
+        return True
+    
+    def remove(self, name: str) -> bool:
+        """Queue a removal. Returns True if name matches a sound."""
+        index = self._find_index(name)
+        if index is None:
+            return False
+        # Removed entries are dropped in one pass on commit
+        self._sounds[index] = None
+        return True
+    
+    def commit(self) -> None:
+        """Apply every queued change to the PCK and write it once."""
+        previous = self.pck.sounds
+        if self._sounds is not None:
+            self.pck.sounds = [sound for sound in self._sounds if sound is not None]
+            self.pck._names = None
+        if self.output_path:
+            try:
+                self.pck.write(self.output_path)
+            except BaseException:
+                # Leave the PCK as it was so the batch can be retried; sounds
+                # the batch dropped still hold the views write() released
+                self.pck.sounds = previous
+                self.pck._rebind(previous)
+                self.pck._names = None
+                raise
+        self._sounds = None
+    
+    def rollback(self) -> None:
+        """Discard every queued change."""
+        self._sounds = None
+        self._names = {}
+    
+    def __enter__(self) -> 'PCKBatch':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
 def extract_pck(pck_path: str, output_dir: str = None) -> List[str]:
     """
     Convenience function to extract all sounds from a PCK file.
@@ -351,8 +715,8 @@ def extract_pck(pck_path: str, output_dir: str = None) -> List[str]:
         base_name = os.path.splitext(os.path.basename(pck_path))[0]
         output_dir = os.path.join(os.path.dirname(pck_path), f"extracted_{base_name}")
     
-    pck = PCKFile(pck_path)
-    return pck.extract_all(output_dir)
+    with PCKFile(pck_path) as pck:
+        return pck.extract_all(output_dir)
 
 
 def create_pck(sound_files: List[str], output_path: str) -> None:
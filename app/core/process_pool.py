@@ -0,0 +1,102 @@
+"""
+Process-pool plumbing shared by batch extraction and the map scanner.
+
+Work is submitted in chunks and every worker pushes each finished item
+onto a result queue, so the caller sees items one by one instead of per
+chunk.  Chunk functions call :func:`put_result` for every item and
+return how many they handled.
+
+Iteration may stop before everything was read: on cancellation, when the
+consumer closes the generator, or when a worker fails.  Items that are
+already queued are then never read, so the workers must not wait for
+their queue to flush when they exit, or the pool shutdown would hang on
+the full pipe.  :func:`_init_worker` takes care of that.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+import os
+import queue as queue_module
+from typing import Any, Callable, Iterator, Sequence
+
+from .lz77 import get_backend, set_backend
+
+
+POLL_INTERVAL = 0.1
+
+# Set in each worker process by _init_worker.
+_result_queue = None
+
+
+def default_workers() -> int:
+    """Number of worker processes used when none is requested."""
+    return max(1, os.cpu_count() or 1)
+
+
+def _init_worker(result_queue, backend_name: str) -> None:
+    global _result_queue
+    _result_queue = result_queue
+    # Results left in the queue are only abandoned when the parent stopped
+    # reading, so exiting without flushing them cannot lose anything wanted
+    result_queue.cancel_join_thread()
+    set_backend(backend_name)
+
+
+def put_result(result: Any) -> None:
+    """Report one finished item from inside a chunk function."""
+    _result_queue.put(result)
+
+
+def _failed_chunk(futures: list[Future]) -> BaseException | None:
+    for future in futures:
+        if future.done() and not future.cancelled() and future.exception() is not None:
+            return future.exception()
+    return None
+
+
+def iter_pool_results(
+    run_chunk: Callable[..., int],
+    chunks: Sequence[tuple],
+    total: int,
+    workers: int,
+    should_cancel: Callable[[], bool] | None = None,
+    description: str = "Worker",
+) -> Iterator[Any]:
+    """Run ``run_chunk(*args)`` for every entry of *chunks* across *workers* processes.
+
+    Yields the *total* items the chunks report through :func:`put_result`,
+    in completion order.  Once *should_cancel* returns True no further
+    chunks are started and iteration stops after the running ones finish;
+    closing the generator early has the same effect.  A chunk that raises
+    is reported as ``RuntimeError("<description> failed: ...")``.
+    """
+    # spawn is the only start method on Windows; using it everywhere keeps
+    # worker behaviour identical and avoids forking the GUI's threads.
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(result_queue, get_backend().name),
+    )
+    try:
+        futures = [pool.submit(run_chunk, *args) for args in chunks]
+        pending = total
+        while pending:
+            if should_cancel and should_cancel():
+                return
+            try:
+                result = result_queue.get(timeout=POLL_INTERVAL)
+            except queue_module.Empty:
+                failure = _failed_chunk(futures)
+                if failure is not None:
+                    raise RuntimeError(f"{description} failed: {failure}") from failure
+                continue
+            pending -= 1
+            yield result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        result_queue.close()
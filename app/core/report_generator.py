@@ -5,6 +5,7 @@ from pathlib import Path
 import json
 
 from .game_scanner import DebugInsight, MapGroup, summarize_map_groups
+from .scan_cache import ScanCacheStats
 
 
 def _fmt_chunks(chunks: list[str] | None) -> str:
@@ -26,7 +27,7 @@ def _fmt_cell_summary(file: object) -> list[str]:
     lines = [
         f"  - cell grid=`{cell_fields['grid_width']}x{cell_fields['grid_height']}` "
         f"entries=`{cell_fields['entry_count']}` "
-        f"unique_record_a=`{cell_fields['unique_value_a']}` "
+        f"unique_record_a=`{cell_fields.get('unique_value_a', '-')}` "
         f"chunks=`{_fmt_chunks(chunks)}`"
     ]
     if cell_map:
@@ -82,19 +83,31 @@ def _fmt_cell_summary(file: object) -> list[str]:
     return lines
 
 
-def write_json_report(out_dir: Path, debug: DebugInsight, map_groups: list[MapGroup]) -> Path:
+def write_json_report(
+    out_dir: Path,
+    debug: DebugInsight,
+    map_groups: list[MapGroup],
+    cache_stats: ScanCacheStats | None = None,
+) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     payload = {
         "debug": asdict(debug),
         "maps": [asdict(group) for group in map_groups],
         "summary": summarize_map_groups(map_groups),
     }
+    if cache_stats is not None:
+        payload["scan_cache"] = asdict(cache_stats)
     path = out_dir / "scan_report.json"
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
     return path
 
 
-def write_markdown_report(out_dir: Path, debug: DebugInsight, map_groups: list[MapGroup]) -> Path:
+def write_markdown_report(
+    out_dir: Path,
+    debug: DebugInsight,
+    map_groups: list[MapGroup],
+    cache_stats: ScanCacheStats | None = None,
+) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     summary = summarize_map_groups(map_groups)
     lines: list[str] = []
@@ -122,18 +135,24 @@ def write_markdown_report(out_dir: Path, debug: DebugInsight, map_groups: list[M
     lines.append("- Extensions:")
     for ext, count in sorted(summary["extensions"].items()):
         lines.append(f"  - `{ext}`: `{count}`")
+    if cache_stats is not None:
+        lines.append(
+            f"- Scan cache: hits=`{cache_stats.hits}` misses=`{cache_stats.misses}` "
+            f"hit_rate=`{cache_stats.hit_rate:.0%}` pruned=`{cache_stats.pruned}`"
+        )
     lines.append("")
     lines.append("## Group Details")
     for group in map_groups:
         lines.append(f"### Group `{group.map_id}`")
         for file in group.files:
             line = (
-                f"- `{file.relative_path}` sig=`{file.signature}` size=`{file.size}` pngs=`{file.png_count}`"
+                f"- `{file.relative_path}` sig=`{file.signature}` size=`{file.size}` "
+                f"pngs=`{'-' if file.png_count is None else file.png_count}`"
             )
             if file.lz77:
                 line += (
                     f" raw=`{file.lz77['raw_size']}` tokens=`{file.lz77['token_count']}` "
-                    f"decomp_sig=`{file.decompressed_signature}`"
+                    f"decomp_sig=`{file.decompressed_signature or '-'}`"
                 )
             if file.parse_error:
                 line += f" error=`{file.parse_error}`"
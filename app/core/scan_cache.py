@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import sqlite3
+import sys
+
+from .game_scanner import SCAN_DEEP, FileInsight, analyze_file, scan_tier_rank
+
+
+# Bump whenever analyze_file (or anything it calls) changes the FileInsight
+# it produces; rows written under another version are discarded on open.
+SCAN_CACHE_VERSION = 2
+SCAN_CACHE_FILENAME = "scan_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS insights (
+    path TEXT NOT NULL,
+    root TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT,
+    insight TEXT NOT NULL,
+    PRIMARY KEY (path, root)
+);
+"""
+
+
+def user_cache_dir() -> Path:
+    """Per-user cache directory for the tools (not created here)."""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+        return base / "DiNaSoR" / "DokaponSoFTools" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "DokaponSoFTools"
+    base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "dokapon-sof-tools"
+
+
+def _content_hash(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class ScanCacheStats:
+    hits: int = 0
+    misses: int = 0
+    pruned: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class ScanCache:
+    """On-disk cache of :func:`analyze_file` results.
+
+    Entries are keyed by absolute path and scan root and are valid while the
+    file's size and mtime are unchanged.  With ``verify_hash`` enabled every
+    lookup also compares a content hash, and a file whose mtime changed but
+    whose bytes did not is still served from the cache.
+
+    A connection is bound to the thread that opened the cache, so create the
+    cache inside the worker that runs the scan.
+    """
+
+    def __init__(self, db_path: Path | None = None, verify_hash: bool = False) -> None:
+        self.db_path = Path(db_path) if db_path is not None else user_cache_dir() / SCAN_CACHE_FILENAME
+        self.verify_hash = verify_hash
+        self.stats = ScanCacheStats()
+        self._seen: set[tuple[str, str]] = set()
+        self._missed: dict[tuple[str, str], tuple[int, int, str | None]] = {}
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(SCAN_CACHE_VERSION):
+            self.clear()
+
+    def __enter__(self) -> ScanCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM insights")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (str(SCAN_CACHE_VERSION),),
+            )
+
+    def analyze(self, path: Path, root: Path, tier: str = SCAN_DEEP) -> FileInsight:
+        """Return the cached insight for *path*, analysing it on a miss."""
+        insight = self.lookup(path, root, tier)
+        if insight is None:
+            insight = analyze_file(path, root, tier)
+            self.store(path, root, insight)
+        return insight
+
+    def lookup(self, path: Path, root: Path, tier: str = SCAN_DEEP) -> FileInsight | None:
+        """Return the cached insight for *path*, or None on a miss.
+
+        An entry scanned at a lower tier than *tier* is a miss.  A miss is
+        meant to be followed by :meth:`store` once the file has been
+        analysed, possibly in another process.
+        """
+        key = (str(path.resolve()), str(root.resolve()))
+        self._seen.add(key)
+        stat = path.stat()
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, content_hash, insight FROM insights WHERE path = ? AND root = ?",
+            key,
+        ).fetchone()
+
+        content_hash = _content_hash(path) if self.verify_hash else None
+        if row is not None:
+            size, mtime_ns, cached_hash, payload = row
+            insight = FileInsight(**json.loads(payload))
+            same_stat = size == stat.st_size and mtime_ns == stat.st_mtime_ns
+            if self.verify_hash and cached_hash is not None:
+                valid = cached_hash == content_hash
+            else:
+                valid = same_stat
+            if valid and scan_tier_rank(insight.tier) >= scan_tier_rank(tier):
+                self.stats.hits += 1
+                if not same_stat or (self.verify_hash and cached_hash is None):
+                    self._conn.execute(
+                        "UPDATE insights SET size = ?, mtime_ns = ?, content_hash = ? WHERE path = ? AND root = ?",
+                        (stat.st_size, stat.st_mtime_ns, content_hash, *key),
+                    )
+                return insight
+
+        self.stats.misses += 1
+        self._missed[key] = (stat.st_size, stat.st_mtime_ns, content_hash)
+        return None
+
+    def store(self, path: Path, root: Path, insight: FileInsight) -> None:
+        """Cache *insight* for *path*, using the stat taken by the preceding :meth:`lookup`."""
+        key = (str(path.resolve()), str(root.resolve()))
+        self._seen.add(key)
+        file_key = self._missed.pop(key, None)
+        if file_key is None:
+            stat = path.stat()
+            file_key = (stat.st_size, stat.st_mtime_ns, _content_hash(path) if self.verify_hash else None)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO insights (path, root, size, mtime_ns, content_hash, insight) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, *file_key, json.dumps(asdict(insight))),
+        )
+
+    def prune(self, root: Path) -> int:
+        """Drop entries under *root* that were not looked up since the cache was opened."""
+        root_key = str(root.resolve())
+        stale = [
+            (path, root_key)
+            for (path,) in self._conn.execute("SELECT path FROM insights WHERE root = ?", (root_key,))
+            if (path, root_key) not in self._seen
+        ]
+        with self._conn:
+            self._conn.executemany("DELETE FROM insights WHERE path = ? AND root = ?", stale)
+        self.stats.pruned += len(stale)
+        return len(stale)
@@ -19,8 +19,36 @@ Usage:
 
 import re
 import os
+import json
+import shutil
 import argparse
-from typing import List, Tuple, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple, Optional
+
+from app.core.exe_image import ExeImage, open_exe_image, release_exe_image
+from app.core.hex_editor import create_hex_patches
+
+
+# Control-code flags recorded for each text block
+TEXT_FLAG_WAIT = 0x01       # \k
+TEXT_FLAG_MODIFIER = 0x02   # \r
+TEXT_FLAG_HEADER = 0x04     # \h
+TEXT_FLAG_COLOR = 0x08      # %Nc
+TEXT_FLAG_POSITION = 0x10   # %Nx / %Ny
+TEXT_FLAG_VARIABLE = 0x20   # %s / %d
+
+# A block starts at \p and ends at the first \k, \z (both included),
+# null byte or next \p (both excluded) after the opening marker.
+_TEXT_START = re.compile(rb'\\p')
+_TEXT_END = re.compile(rb'\\[kzp]|\x00')
+_COLOR_CODE = re.compile(r'%\d+c')
+_POSITION_CODE = re.compile(r'%\d+[xy]')
+
+# Bump whenever scanning or TextEntry changes; older cache files are ignored
+TEXT_TABLE_CACHE_VERSION = 1
+TEXT_TABLE_CACHE_DIRNAME = "text_tables"
+TEXT_TABLE_STAT_INDEX = "exes.json"
+TEXT_EXPORT_INDEX = "exports.json"
 
 
 def find_text_end(content: bytes, start: int) -> int:
@@ -33,66 +61,287 @@ def find_text_end(content: bytes, start: int) -> int:
     3. One or more consecutive null bytes
     4. Next \p (5C 70) - start of new text block
     """
-    pos = start + 2  # Skip initial \p
+    match = _TEXT_END.search(content, start + 2)  # Skip initial \p
+    if match is None:
+        return len(content)
+    if match.group() in (b'\\k', b'\\z'):
+        return match.end()  # Include \k / \z in the text
+    return match.start()  # Don't include null or next \p
+
+
+def _text_flags(text: str) -> int:
+    """Control-code flags for a decoded text block."""
+    flags = 0
+    if '\\k' in text:
+        flags |= TEXT_FLAG_WAIT
+    if '\\r' in text:
+        flags |= TEXT_FLAG_MODIFIER
+    if '\\h' in text:
+        flags |= TEXT_FLAG_HEADER
+    if _COLOR_CODE.search(text):
+        flags |= TEXT_FLAG_COLOR
+    if _POSITION_CODE.search(text):
+        flags |= TEXT_FLAG_POSITION
+    if '%s' in text or '%d' in text:
+        flags |= TEXT_FLAG_VARIABLE
+    return flags
+
+
+def _printable_ratio(text: str) -> float:
+    if text.isprintable():
+        return 1.0
+    return sum(1 for c in text if c.isprintable() or c in '\n\r\t') / len(text)
+
+
+@dataclass
+class TextEntry:
+    """A single \\p text block found in the executable."""
+    offset: int
+    length: int                 # Size of the block in bytes
+    text: Optional[str]         # None if the block is not valid UTF-8
+    printable_ratio: float = 0.0
+    flags: int = 0
     
-    while pos < len(content):
-        byte = content[pos]
-        
-        # Check for \k or \z
-        if byte == 0x5C and pos + 1 < len(content):
-            next_byte = content[pos + 1]
-            if next_byte == 0x6B:  # \k
-                return pos + 2  # Include \k in the text
-            elif next_byte == 0x7A:  # \z
-                return pos + 2  # Include \z in the text
-            elif next_byte == 0x70:  # Next \p - don't include
-                return pos
+    @property
+    def is_text(self) -> bool:
+        """True for blocks that look like real game text (what extraction keeps)."""
+        return self.text is not None and len(self.text) >= 3 and self.printable_ratio >= 0.5
+
+
+class TextTable:
+    """
+    Every \\p text block of an executable, found in a single scan.
+    
+    All extraction, analysis and import helpers in this module work from a
+    TextTable, so the executable only has to be scanned once.
+    """
+    
+    def __init__(self, entries: List[TextEntry], exe_size: int = 0, exe_hash: str = ""):
+        self.entries = entries
+        self.exe_size = exe_size
+        self.exe_hash = exe_hash
+    
+    @classmethod
+    def scan(cls, content) -> 'TextTable':
+        """
+        Scan a buffer (bytes, bytearray or mmap) for text blocks.
         
-        # Check for null bytes (end of text entry)
-        if byte == 0x00:
-            # Count consecutive nulls
-            null_count = 0
-            temp_pos = pos
-            while temp_pos < len(content) and content[temp_pos] == 0x00:
-                null_count += 1
-                temp_pos += 1
+        Block starts and ends are both found by compiled regular
+        expressions, so no Python code runs per byte.
+        """
+        entries = []
+        end_search = _TEXT_END.search
+        for match in _TEXT_START.finditer(content):
+            start = match.start()
+            end_match = end_search(content, start + 2)
+            if end_match is None:
+                end = len(content)
+            elif end_match.group() in (b'\\k', b'\\z'):
+                end = end_match.end()
+            else:
+                end = end_match.start()
             
-            if null_count >= 1:
-                return pos  # End at first null
+            try:
+                text = content[start:end].decode('utf-8')
+            except UnicodeDecodeError:
+                entries.append(TextEntry(start, end - start, None))
+                continue
+            ratio = _printable_ratio(text) if text else 0.0
+            entries.append(TextEntry(start, end - start, text, ratio, _text_flags(text)))
+        return cls(entries, len(content))
+    
+    @classmethod
+    def from_exe(cls, exe_path: str) -> 'TextTable':
+        """Scan an executable through its shared memory-mapped image."""
+        image = open_exe_image(exe_path)
+        table = cls.scan(image.data)
+        table.exe_hash = image.digest()
+        return table
+    
+    def save(self, path: str) -> None:
+        """Write the table to a compact JSON cache file."""
+        payload = {
+            'version': TEXT_TABLE_CACHE_VERSION,
+            'exe_size': self.exe_size,
+            'exe_hash': self.exe_hash,
+            'entries': [
+                [e.offset, e.length, e.text, e.printable_ratio, e.flags]
+                for e in self.entries
+            ],
+        }
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def load(cls, path: str, exe_size: int, exe_hash: str) -> Optional['TextTable']:
+        """Read a cached table, or None if it is missing or for another exe."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (payload.get('version') != TEXT_TABLE_CACHE_VERSION
+                or payload.get('exe_size') != exe_size
+                or payload.get('exe_hash') != exe_hash):
+            return None
+        entries = [TextEntry(*row) for row in payload['entries']]
+        return cls(entries, exe_size, exe_hash)
+    
+    def texts(self) -> List[TextEntry]:
+        """Entries that pass the extraction filter, in file order."""
+        return [entry for entry in self.entries if entry.is_text]
+    
+    def stats(self) -> dict:
+        """Control-code statistics (see analyze_text_patterns)."""
+        stats = {
+            'total_texts': 0,
+            'with_k': 0,  # \k endings
+            'with_r': 0,  # \r modifier
+            'with_h': 0,  # \h modifier  
+            'with_colors': 0,  # %Nc codes
+            'with_positions': 0,  # %Nx/%Ny codes
+            'with_variables': 0,  # %s, %d
+            'avg_length': 0,
+            'min_length': float('inf'),
+            'max_length': 0,
+        }
+        counters = (
+            ('with_k', TEXT_FLAG_WAIT),
+            ('with_r', TEXT_FLAG_MODIFIER),
+            ('with_h', TEXT_FLAG_HEADER),
+            ('with_colors', TEXT_FLAG_COLOR),
+            ('with_positions', TEXT_FLAG_POSITION),
+            ('with_variables', TEXT_FLAG_VARIABLE),
+        )
+        lengths = []
+        for entry in self.entries:
+            if entry.text is None or len(entry.text) < 3:
+                continue
+            stats['total_texts'] += 1
+            lengths.append(len(entry.text))
+            for key, flag in counters:
+                if entry.flags & flag:
+                    stats[key] += 1
+        
+        if lengths:
+            stats['avg_length'] = sum(lengths) / len(lengths)
+            stats['min_length'] = min(lengths)
+            stats['max_length'] = max(lengths)
         
-        pos += 1
+        return stats
     
-    return len(content)
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __iter__(self):
+        return iter(self.entries)
 
 
-def extract_texts_to_memory(exe_path: str) -> list[tuple[str, str, int]]:
-    """Extract texts from executable to memory without writing temp files.
+def _text_cache_dir() -> str:
+    # Local import: the scanner stack is not needed to run this module as a script
+    from app.core.scan_cache import user_cache_dir
+    return str(user_cache_dir() / TEXT_TABLE_CACHE_DIRNAME)
 
-    Returns list of (text, offset_hex_str, max_length) tuples.
+
+def text_table_cache_path(exe_size: int, exe_hash: str) -> str:
+    """Location of the persistent TextTable cache for an executable."""
+    return os.path.join(_text_cache_dir(), f"{exe_size:x}-{exe_hash}.json")
+
+
+def _read_stat_index(name: str = TEXT_TABLE_STAT_INDEX) -> dict:
+    """
+    Known executables: absolute path -> [size, mtime_ns, hash].
+    
+    With name=TEXT_EXPORT_INDEX, the exported executables instead, with
+    the hash of the executable each was exported from.
     """
-    with open(exe_path, "rb") as f:
-        content = f.read()
+    try:
+        with open(os.path.join(_text_cache_dir(), name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    pattern = rb'\\p'
-    results = []
 
-    for match in re.finditer(pattern, content):
-        start = match.start()
-        end = find_text_end(content, start)
-        text_bytes = content[start:end]
+def _write_stat_index(index: dict, name: str = TEXT_TABLE_STAT_INDEX) -> None:
+    path = os.path.join(_text_cache_dir(), name)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+# Last loaded table, reused while the executable is unchanged
+_table_memo: Optional[Tuple[Tuple[str, int, int], TextTable]] = None
+
+
+def load_text_table(exe_path: str, use_cache: bool = True) -> TextTable:
+    """
+    Return the TextTable for an executable, scanning it only if needed.
+    
+    The most recent table is kept in memory and reused as long as the
+    file's path, size and modification time are unchanged. Otherwise, with
+    use_cache, the table is looked up in the per-user cache by the exe's
+    size and content hash; the exe is only scanned (and the cache written)
+    when the executable itself has changed. The hash of each executable is
+    remembered with its size and mtime, so an untouched exe is not even
+    hashed.
+    
+    Args:
+        exe_path: Path to the game executable
+        use_cache: Use and update the persistent cache
+        
+    Returns:
+        The executable's TextTable
+    """
+    global _table_memo
+    stat = os.stat(exe_path)
+    key = (os.path.abspath(exe_path), stat.st_size, stat.st_mtime_ns)
+    if _table_memo is not None and _table_memo[0] == key:
+        return _table_memo[1]
+    
+    if not use_cache or stat.st_size == 0:
+        table = TextTable.from_exe(exe_path)
+    else:
+        table = None
+        stat_index = _read_stat_index()
+        known = stat_index.get(key[0])
+        if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            table = TextTable.load(text_table_cache_path(stat.st_size, known[2]), stat.st_size, known[2])
+        if table is None:
+            image = open_exe_image(exe_path)
+            exe_hash = image.digest()
+            stat_index[key[0]] = [stat.st_size, stat.st_mtime_ns, exe_hash]
+            _write_stat_index(stat_index)
+            cache_path = text_table_cache_path(image.size, exe_hash)
+            table = TextTable.load(cache_path, image.size, exe_hash)
+            if table is None:
+                table = TextTable.scan(image.data)
+                table.exe_hash = exe_hash
+                try:
+                    table.save(cache_path)
+                except OSError:
+                    pass  # An unwritable cache only costs a rescan next time
+    
+    _table_memo = (key, table)
+    return table
 
-        try:
-            text = text_bytes.decode('utf-8')
-            if len(text) < 3:
-                continue
-            printable_ratio = sum(1 for c in text if c.isprintable() or c in '\n\r\t') / len(text)
-            if printable_ratio < 0.5:
-                continue
-            results.append((text, str(start), len(text_bytes)))
-        except UnicodeDecodeError:
-            continue
 
-    return results
+def extract_texts_to_memory(exe_path: str) -> list[tuple[str, str, int]]:
+    """Extract texts from executable to memory without writing temp files.
+
+    Returns list of (text, offset_hex_str, max_length) tuples.
+    """
+    return [
+        (entry.text, str(entry.offset), entry.length)
+        for entry in load_text_table(exe_path).texts()
+    ]
 
 
 def extract_texts(exe_file_path: str, output_file_path: str, offsets_file_path: str) -> int:
@@ -107,41 +356,10 @@ def extract_texts(exe_file_path: str, output_file_path: str, offsets_file_path:
     Returns:
         Number of texts extracted
     """
-    with open(exe_file_path, "rb") as f:
-        content = f.read()
-    
-    # Find all \p markers
-    pattern = rb'\\p'
-    
-    extracted_texts = []
-    offsets_data = []  # (offset, length) pairs
-    
-    for match in re.finditer(pattern, content):
-        start = match.start()
-        end = find_text_end(content, start)
-        
-        # Extract the raw bytes
-        text_bytes = content[start:end]
-        
-        # Try to decode as UTF-8
-        try:
-            text = text_bytes.decode('utf-8')
-            
-            # Skip very short entries (likely not real text)
-            if len(text) < 3:
-                continue
-            
-            # Skip entries that are mostly non-printable
-            printable_ratio = sum(1 for c in text if c.isprintable() or c in '\n\r\t') / len(text)
-            if printable_ratio < 0.5:
-                continue
-            
-            extracted_texts.append(text)
-            offsets_data.append((start, len(text_bytes)))
-            
-        except UnicodeDecodeError:
-            # Skip non-UTF-8 entries
-            continue
+    # Short, non-UTF-8 and mostly non-printable blocks are skipped
+    entries = load_text_table(exe_file_path).texts()
+    extracted_texts = [entry.text for entry in entries]
+    offsets_data = [(entry.offset, entry.length) for entry in entries]  # (offset, length) pairs
     
     # Save texts (one per line, preserving embedded \n as literal)
     os.makedirs(os.path.dirname(output_file_path) or '.', exist_ok=True)
@@ -177,9 +395,8 @@ def import_texts(original_exe_path: str, modified_texts_path: str,
     Returns:
         Tuple of (texts_replaced, texts_skipped)
     """
-    # Read original executable
-    with open(original_exe_path, 'rb') as f:
-        content = bytearray(f.read())
+    image = open_exe_image(original_exe_path)
+    content = image.data
     
     # Read modified texts
     with open(modified_texts_path, 'r', encoding='utf-8') as f:
@@ -199,6 +416,7 @@ def import_texts(original_exe_path: str, modified_texts_path: str,
     
     replaced = 0
     skipped = 0
+    slots = []
     
     for i, (offset_data, new_text) in enumerate(zip(offsets_data, modified_texts)):
         offset, original_length = offset_data
@@ -222,14 +440,17 @@ def import_texts(original_exe_path: str, modified_texts_path: str,
         if len(new_bytes) < original_length:
             new_bytes = new_bytes + b'\x00' * (original_length - len(new_bytes))
         
-        # Replace in content
-        content[offset:offset + original_length] = new_bytes
+        slots.append((offset, new_bytes))
         replaced += 1
     
-    # Write output
-    os.makedirs(os.path.dirname(output_exe_path) or '.', exist_ok=True)
-    with open(output_exe_path, 'wb') as f:
-        f.write(content)
+    # Write output: a copy of the original with each slot written in file order
+    if not os.path.exists(output_exe_path) or not os.path.samefile(original_exe_path, output_exe_path):
+        os.makedirs(os.path.dirname(output_exe_path) or '.', exist_ok=True)
+        release_exe_image(output_exe_path)
+        shutil.copyfile(original_exe_path, output_exe_path)
+    with ExeImage(output_exe_path, writable=True) as output:
+        for offset, new_bytes in slots:
+            output.write(offset, new_bytes)
     
     print(f"Replaced {replaced} texts ({skipped} truncated)")
     print(f"Modified executable saved to: {output_exe_path}")
@@ -237,34 +458,176 @@ def import_texts(original_exe_path: str, modified_texts_path: str,
     return replaced, skipped
 
 
+def diff_texts(table: TextTable, texts: Iterable[Tuple[int, str]]) -> Tuple[List[Tuple[int, bytes]], int]:
+    """
+    Encode edited texts into their original slots and keep the changed ones.
+    
+    Args:
+        table: Text table of the original executable
+        texts: (offset, text) pairs; unchanged texts may be included
+        
+    Returns:
+        Tuple of ([(offset, slot_bytes)] for slots whose bytes change,
+        number of texts truncated or skipped)
+    """
+    entries = {entry.offset: entry for entry in table.entries if entry.text is not None}
+    changes = []
+    skipped = 0
+    
+    for offset, new_text in texts:
+        entry = entries.get(offset)
+        if entry is None:
+            print(f"Warning: No text block at offset {offset}. Skipping...")
+            skipped += 1
+            continue
+        if new_text == entry.text:
+            continue
+        
+        new_bytes = new_text.encode('utf-8')
+        if len(new_bytes) > entry.length:
+            print(f"Warning: Text at offset {offset} is too long ({len(new_bytes)} > {entry.length}). Truncating...")
+            new_bytes = new_bytes[:entry.length]
+            skipped += 1
+        
+        # Pad with nulls so the slot keeps its size
+        new_bytes = new_bytes.ljust(entry.length, b'\x00')
+        if new_bytes != entry.text.encode('utf-8'):
+            changes.append((offset, new_bytes))
+    
+    return changes, skipped
+
+
+def import_text_changes(exe_path: str, texts: Iterable[Tuple[int, str]],
+                        output_exe_path: Optional[str] = None,
+                        hex_path: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Import texts by patching only the slots that differ from the original.
+    
+    The edits are diffed against the executable's (cached) text table, and
+    the changed slots are written through a writable memory map of the
+    output, so a one-line edit writes a few bytes instead of the whole exe.
+    
+    The output starts as a kernel-side copy of the executable. An existing
+    output is only updated in place if it is an earlier export of this
+    same executable that nothing has touched since (both are checked
+    against a journal kept next to the text table cache): every text slot
+    that differs from the wanted bytes is then rewritten, which also
+    restores reverted edits.
+    
+    Args:
+        exe_path: Path to the original executable
+        texts: (offset, text) pairs for the edited entries (unchanged
+               entries may be included)
+        output_exe_path: Path for the output executable (None to only
+                         write hex_path; exe_path patches it in place)
+        hex_path: Optional path to also write the change set as a .hex
+                  patch for the Hex Editor
+        
+    Returns:
+        Tuple of (texts_replaced, texts_skipped)
+    """
+    table = load_text_table(exe_path)
+    changes, skipped = diff_texts(table, texts)
+    
+    if hex_path:
+        create_hex_patches(changes, hex_path)
+        print(f"Hex patch saved to: {hex_path}")
+    
+    if output_exe_path:
+        wanted = dict(changes)
+        export_key = None
+        if not os.path.exists(output_exe_path) or not os.path.samefile(exe_path, output_exe_path):
+            export_key = os.path.abspath(output_exe_path)
+            exports = _read_stat_index(TEXT_EXPORT_INDEX)
+            known = exports.get(export_key)
+            reuse = False
+            if known and table.exe_hash and known[2] == table.exe_hash:
+                # Any other write to the output (a hex patch, another
+                # export) changes its stat, and then it is copied afresh
+                try:
+                    out_stat = os.stat(output_exe_path)
+                    reuse = known[:2] == [out_stat.st_size, out_stat.st_mtime_ns]
+                except OSError:
+                    pass
+            if reuse:
+                # Earlier export: every slot must hold either the edit or the original
+                for entry in table.texts():
+                    wanted.setdefault(entry.offset, entry.text.encode('utf-8'))
+            else:
+                os.makedirs(os.path.dirname(output_exe_path) or '.', exist_ok=True)
+                release_exe_image(output_exe_path)
+                shutil.copyfile(exe_path, output_exe_path)
+        
+        written = _write_slots(output_exe_path, wanted)
+        if export_key is not None:
+            out_stat = os.stat(output_exe_path)
+            exports = _read_stat_index(TEXT_EXPORT_INDEX)
+            exports[export_key] = [out_stat.st_size, out_stat.st_mtime_ns, table.exe_hash]
+            _write_stat_index(exports, TEXT_EXPORT_INDEX)
+        print(f"Replaced {len(changes)} texts ({skipped} truncated or skipped), "
+              f"{written} bytes written")
+        print(f"Modified executable saved to: {output_exe_path}")
+    
+    return len(changes), skipped
+
+
+def read_text_edits(texts_path: str, offsets_path: str) -> List[Tuple[int, str]]:
+    """
+    Read a texts file and its offsets file into (offset, text) pairs.
+    
+    Args:
+        texts_path: Path to texts file (one text per line)
+        offsets_path: Path to offsets file (offset:length or offset per line)
+        
+    Returns:
+        List of (offset, text) pairs in file order
+    """
+    with open(texts_path, 'r', encoding='utf-8') as f:
+        texts = [line.rstrip('\n') for line in f]
+    with open(offsets_path, 'r', encoding='utf-8') as f:
+        offsets = [int(line.split(':', 1)[0]) for line in f if line.strip()]
+    return list(zip(offsets, texts))
+
+
+def _write_slots(path: str, slots: Dict[int, bytes]) -> int:
+    """Write slots that differ from the file's bytes; returns bytes written."""
+    if not slots:
+        return 0
+    written = 0
+    with ExeImage(path, writable=True) as image:
+        for offset in sorted(slots):
+            if image.write(offset, slots[offset]):
+                written += len(slots[offset])
+    return written
+
+
 def extract_with_context(exe_file_path: str, output_file_path: str, 
                         context_bytes: int = 50) -> int:
     """
     Extract texts with surrounding context for analysis.
     Useful for understanding text structure.
     """
-    with open(exe_file_path, 'rb') as f:
-        content = f.read()
+    table = load_text_table(exe_file_path)
     
-    pattern = rb'\\p'
+    content = open_exe_image(exe_file_path).data
     
     with open(output_file_path, 'w', encoding='utf-8') as out:
         count = 0
-        for match in re.finditer(pattern, content):
-            start = max(0, match.start() - context_bytes)
-            end_pos = find_text_end(content, match.start())
+        for entry in table:
+            start = max(0, entry.offset - context_bytes)
+            end_pos = entry.offset + entry.length
             end = min(len(content), end_pos + context_bytes)
             
             try:
-                before = content[start:match.start()].decode('utf-8', errors='replace')
-                text = content[match.start():end_pos].decode('utf-8', errors='replace')
+                before = content[start:entry.offset].decode('utf-8', errors='replace')
+                text = content[entry.offset:end_pos].decode('utf-8', errors='replace')
                 after = content[end_pos:end].decode('utf-8', errors='replace')
                 
-                out.write(f"=== Offset: 0x{match.start():08X} ===\n")
+                out.write(f"=== Offset: 0x{entry.offset:08X} ===\n")
                 out.write(f"Before: {repr(before)}\n")
                 out.write(f"Text: {repr(text)}\n")
                 out.write(f"After: {repr(after)}\n")
-                out.write(f"Length: {end_pos - match.start()}\n\n")
+                out.write(f"Length: {entry.length}\n\n")
                 count += 1
             except:
                 continue
@@ -278,60 +641,7 @@ def analyze_text_patterns(exe_file_path: str) -> dict:
     Analyze text patterns in the executable.
     Returns statistics about control codes used.
     """
-    with open(exe_file_path, 'rb') as f:
-        content = f.read()
-    
-    stats = {
-        'total_texts': 0,
-        'with_k': 0,  # \k endings
-        'with_r': 0,  # \r modifier
-        'with_h': 0,  # \h modifier  
-        'with_colors': 0,  # %Nc codes
-        'with_positions': 0,  # %Nx/%Ny codes
-        'with_variables': 0,  # %s, %d
-        'avg_length': 0,
-        'min_length': float('inf'),
-        'max_length': 0,
-    }
-    
-    pattern = rb'\\p'
-    lengths = []
-    
-    for match in re.finditer(pattern, content):
-        start = match.start()
-        end = find_text_end(content, start)
-        text_bytes = content[start:end]
-        
-        try:
-            text = text_bytes.decode('utf-8')
-            if len(text) < 3:
-                continue
-            
-            stats['total_texts'] += 1
-            lengths.append(len(text))
-            
-            if '\\k' in text:
-                stats['with_k'] += 1
-            if '\\r' in text:
-                stats['with_r'] += 1
-            if '\\h' in text:
-                stats['with_h'] += 1
-            if re.search(r'%\d+c', text):
-                stats['with_colors'] += 1
-            if re.search(r'%\d+[xy]', text):
-                stats['with_positions'] += 1
-            if '%s' in text or '%d' in text:
-                stats['with_variables'] += 1
-                
-        except:
-            continue
-    
-    if lengths:
-        stats['avg_length'] = sum(lengths) / len(lengths)
-        stats['min_length'] = min(lengths)
-        stats['max_length'] = max(lengths)
-    
-    return stats
+    return load_text_table(exe_file_path).stats()
 
 
 if __name__ == "__main__":
@@ -346,6 +656,9 @@ Examples:
   Import modified texts:
     python text_extract_repack.py import --exe "DOKAPON! Sword of Fury.exe" --texts modified.txt --offsets offsets.txt --output_exe modded.exe
   
+  Import only changed texts and also write a .hex patch:
+    python text_extract_repack.py import --exe "DOKAPON! Sword of Fury.exe" --texts modified.txt --offsets offsets.txt --output_exe modded.exe --delta --hex texts.hex
+  
   Analyze text patterns:
     python text_extract_repack.py analyze --exe "DOKAPON! Sword of Fury.exe"
 """
@@ -361,6 +674,10 @@ Examples:
                        help="Path to offsets file")
     parser.add_argument("--output_exe", 
                        help="Path for modified executable (import mode)")
+    parser.add_argument("--delta", action="store_true",
+                       help="Import mode: patch only texts that differ from the original")
+    parser.add_argument("--hex",
+                       help="Import mode: also write the changed texts as a .hex patch (implies --delta)")
     
     args = parser.parse_args()
     
@@ -370,9 +687,15 @@ Examples:
         extract_texts(args.exe, args.texts, args.offsets)
         
     elif args.mode == "import":
-        if not args.texts or not args.offsets or not args.output_exe:
-            parser.error("import mode requires --texts, --offsets, and --output_exe")
-        import_texts(args.exe, args.texts, args.offsets, args.output_exe)
+        if args.delta or args.hex:
+            if not args.texts or not args.offsets or not (args.output_exe or args.hex):
+                parser.error("delta import requires --texts, --offsets, and --output_exe or --hex")
+            edits = read_text_edits(args.texts, args.offsets)
+            import_text_changes(args.exe, edits, args.output_exe, args.hex)
+        else:
+            if not args.texts or not args.offsets or not args.output_exe:
+                parser.error("import mode requires --texts, --offsets, and --output_exe")
+            import_texts(args.exe, args.texts, args.offsets, args.output_exe)
         
     elif args.mode == "analyze":
         stats = analyze_text_patterns(args.exe)
@@ -3,10 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 from io import BytesIO
 import struct
-from typing import Iterable
+from typing import Any, Iterable
 
 from PIL import Image
 
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # NumPy is optional; palette lookup falls back to a Python loop
+    np = None  # type: ignore
+
 from .cell_parser import CellChunk
 from .lz77 import CellLZ77Info as LZ77Info, decompress as _decompress_lz77
 
@@ -45,6 +50,28 @@ class TexturePart:
         )
 
 
+@dataclass(slots=True)
+class Palette:
+    """256 RGBA colours backed by a view of the Palette chunk payload."""
+
+    data: memoryview
+
+    def __len__(self) -> int:
+        return len(self.data) // 4
+
+    def __getitem__(self, index: int) -> tuple[int, int, int, int]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("palette index out of range")
+        off = index * 4
+        return tuple(self.data[off:off + 4])  # type: ignore[return-value]
+
+    def __iter__(self) -> Iterable[tuple[int, int, int, int]]:
+        for off in range(0, len(self.data), 4):
+            yield tuple(self.data[off:off + 4])  # type: ignore[misc]
+
+
 @dataclass(slots=True)
 class TexturePartsContainer:
     header: TextureHeader
@@ -144,8 +171,8 @@ def parse_texture_parts_chunk(buf: bytes, chunk: CellChunk) -> TexturePartsConta
     return parse_texture_parts_payload(payload)
 
 
-def parse_palette_chunk(buf: bytes, chunk: CellChunk) -> list[list[tuple[int, int, int, int]]]:
-    payload = buf[chunk.payload_offset:chunk.payload_offset + chunk.payload_size]
+def parse_palette_chunk(buf: bytes, chunk: CellChunk) -> list[Palette]:
+    payload = memoryview(buf)[chunk.payload_offset:chunk.payload_offset + chunk.payload_size]
     if len(payload) < 4:
         raise ValueError("Palette chunk payload is too small")
     palette_count = struct.unpack_from("<I", payload, 0)[0]
@@ -154,29 +181,40 @@ def parse_palette_chunk(buf: bytes, chunk: CellChunk) -> list[list[tuple[int, in
         raise ValueError(
             f"Palette chunk size mismatch: payload=0x{len(payload):X} expected=0x{expected_size:X}"
         )
-    palettes: list[list[tuple[int, int, int, int]]] = []
-    off = 4
-    for _ in range(palette_count):
-        colors: list[tuple[int, int, int, int]] = []
-        for _ in range(256):
-            r, g, b, a = struct.unpack_from("<BBBB", payload, off)
-            colors.append((r, g, b, a))
-            off += 4
-        palettes.append(colors)
-    return palettes
-
-
-def build_indexed_atlas_image(container: TexturePartsContainer, palette: list[tuple[int, int, int, int]]) -> Image.Image:
+    return [Palette(payload[off:off + 256 * 4]) for off in range(4, expected_size, 256 * 4)]
+
+
+def build_palette_table(palette: Palette | list[tuple[int, int, int, int]]) -> Any:
+    """Return *palette* as a ``(256, 4)`` uint8 lookup table, or ``None`` without NumPy."""
+    if np is None:
+        return None
+    if isinstance(palette, Palette):
+        return np.frombuffer(palette.data, dtype=np.uint8).reshape(-1, 4)
+    return np.asarray(palette, dtype=np.uint8).reshape(-1, 4)
+
+
+def build_indexed_atlas_image(
+    container: TexturePartsContainer,
+    palette: Palette | list[tuple[int, int, int, int]],
+    table: Any = None,
+) -> Image.Image:
     if container.storage_kind != "indexed_lz77":
         raise ValueError("indexed atlas rendering requires indexed_lz77 storage")
     if len(container.atlas_bytes) != container.header.width * container.header.height:
         raise ValueError("atlas byte length does not match texture dimensions")
+    size = (container.header.width, container.header.height)
+
+    if np is not None:
+        if table is None:
+            table = build_palette_table(palette)
+        rgba = table[np.frombuffer(container.atlas_bytes, dtype=np.uint8)]
+        return Image.frombuffer("RGBA", size, rgba, "raw", "RGBA", 0, 1)
 
     rgba = bytearray()
     for index in container.atlas_bytes:
         r, g, b, a = palette[index]
         rgba.extend((r, g, b, a))
-    return Image.frombytes("RGBA", (container.header.width, container.header.height), bytes(rgba))
+    return Image.frombytes("RGBA", size, bytes(rgba))
 
 
 def build_png_image(container: TexturePartsContainer) -> Image.Image:
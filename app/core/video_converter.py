@@ -18,6 +18,8 @@ from dataclasses import dataclass
 from typing import Optional, Callable, List, Tuple
 from pathlib import Path
 
+from app.core.gamedata_index import get_gamedata_index
+
 
 @dataclass
 class VideoInfo:
@@ -385,6 +387,14 @@ def find_game_videos(game_dir: str) -> List[str]:
     Returns:
         List of paths to OGV files
     """
+    index = get_gamedata_index(game_dir)
+    if index is not None:
+        # Every search path below lies inside game_dir, which the index covers
+        prefix = index.relative(game_dir)
+        # Skip videos deleted since the index was built
+        paths = index.paths(prefix + "/" if prefix else "", (".ogv",))
+        return sorted(str(path) for path in paths if path.is_file())
+
     ogv_files = []
     
     # Common locations for game videos
@@ -0,0 +1,213 @@
+"""
+Replacement pipeline for PCK sounds.
+
+Sources that are not already Opus/OGG are encoded with ``opusenc``.  Each
+encode is a separate subprocess, so the pipeline keeps a bounded number of
+them running at once (one per core by default) and yields every result as
+soon as it is ready.
+
+Encoded outputs are kept in a content-addressed cache keyed by the source
+bytes, the LoopStart/LoopEnd comments and the encoder version, so applying
+the same mod a second time does not run the encoder at all.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import os
+from pathlib import Path
+import subprocess
+import tempfile
+from typing import Callable, Iterable, Iterator
+
+from .scan_cache import user_cache_dir
+
+
+ENCODE_TIMEOUT = 120
+ENCODE_CACHE_DIRNAME = "opus"
+OPUS_EXTENSIONS = (".opus", ".ogg")
+
+
+@dataclass(slots=True)
+class ReplacementJob:
+    name: str
+    source_path: str
+    loop_start: int = 0
+    loop_end: int = 0
+
+
+@dataclass(slots=True)
+class ReplacementResult:
+    name: str
+    success: bool
+    data: bytes | None = None
+    message: str = ""
+    encoded: bool = False
+    cached: bool = False
+
+
+def default_encoders() -> int:
+    """Number of concurrent encoder processes used when none is requested."""
+    return max(1, os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=None)
+def encoder_version(opusenc_path: str) -> str | None:
+    """First line of ``opusenc --version``, or None if it cannot be run."""
+    try:
+        result = subprocess.run(
+            [opusenc_path, "--version"], capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    lines = result.stdout.strip().splitlines()
+    return lines[0] if lines else opusenc_path
+
+
+class EncodeCache:
+    """Directory of encoded outputs named by a hash of everything that affects them."""
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else user_cache_dir() / ENCODE_CACHE_DIRNAME
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source: bytes, loop_start: int, loop_end: int, version: str) -> str:
+        digest = hashlib.blake2b(source, digest_size=20)
+        digest.update(f"\0{loop_start}\0{loop_end}\0{version}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.opus"
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            # A cache that cannot be written only costs a re-encode later
+            pass
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob("*/*.opus"):
+            path.unlink(missing_ok=True)
+
+
+def _encode(job: ReplacementJob, source: bytes, opusenc_path: str) -> ReplacementResult:
+    cmd = [opusenc_path]
+    if job.loop_start > 0:
+        cmd.extend(["--comment", f"LoopStart={job.loop_start}"])
+    if job.loop_end > 0:
+        cmd.extend(["--comment", f"LoopEnd={job.loop_end}"])
+
+    with tempfile.TemporaryDirectory(prefix="dokapon-opus-") as temp_dir:
+        output_path = os.path.join(temp_dir, "encoded.opus")
+        cmd.extend([job.source_path, output_path])
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=ENCODE_TIMEOUT)
+        except FileNotFoundError:
+            return ReplacementResult(job.name, True, source, "opusenc not found; used source file as-is")
+        if result.returncode != 0:
+            return ReplacementResult(job.name, True, source, "opusenc failed; used source file as-is")
+        with open(output_path, "rb") as handle:
+            return ReplacementResult(job.name, True, handle.read(), "Encoded", encoded=True)
+
+
+def _run_job(
+    job: ReplacementJob, opusenc_path: str, cache: EncodeCache | None, version: str | None
+) -> ReplacementResult:
+    try:
+        with open(job.source_path, "rb") as handle:
+            source = handle.read()
+        if job.source_path.lower().endswith(OPUS_EXTENSIONS):
+            return ReplacementResult(job.name, True, source, "Replaced")
+
+        key = None
+        if cache is not None and version is not None:
+            key = EncodeCache.key(source, job.loop_start, job.loop_end, version)
+            data = cache.get(key)
+            if data is not None:
+                return ReplacementResult(job.name, True, data, "Cached", cached=True)
+
+        result = _encode(job, source, opusenc_path)
+        if key is not None and result.encoded:
+            cache.put(key, result.data)
+        return result
+    except Exception as exc:
+        return ReplacementResult(job.name, False, message=str(exc))
+
+
+def iter_replacements(
+    jobs: Iterable[ReplacementJob],
+    opusenc_path: str = "opusenc",
+    max_workers: int | None = None,
+    cache: EncodeCache | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> Iterator[ReplacementResult]:
+    """Prepare replacement data for *jobs*, yielding results as they finish.
+
+    At most *max_workers* encoder processes run at once.  Results arrive in
+    completion order.  Pass ``cache=None`` to always encode.  Once
+    *should_cancel* returns True no new encodes are started and iteration
+    stops after the running ones finish.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    version = encoder_version(opusenc_path) if cache is not None else None
+    workers = min(max_workers or default_encoders(), len(jobs))
+
+    # Each worker thread only waits on its encoder subprocess, so threads
+    # give one running encode per worker without the cost of processes.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_run_job, job, opusenc_path, cache, version) for job in jobs}
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                if should_cancel and should_cancel():
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def prepare_replacements(
+    jobs: Iterable[ReplacementJob],
+    opusenc_path: str = "opusenc",
+    max_workers: int | None = None,
+    cache: EncodeCache | None = None,
+    on_result: Callable[[ReplacementResult], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> list[ReplacementResult]:
+    """Run :func:`iter_replacements` to completion and return every result.
+
+    *on_result* is called for each sound as it finishes, e.g. to emit a Qt
+    signal from a worker thread.
+    """
+    results = []
+    for result in iter_replacements(jobs, opusenc_path, max_workers, cache, should_cancel):
+        if on_result:
+            on_result(result)
+        results.append(result)
+    return results
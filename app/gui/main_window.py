@@ -18,7 +18,9 @@ from .tabs.hex_tab import HexEditorTab
 from .tabs.video_tab import VideoTab
 from .tabs.map_tab import MapExplorerTab
 from .tabs.about_tab import AboutTab
+from .widgets.worker import WorkerThread
 from .styles import COLORS
+from ..core.gamedata_index import load_gamedata_index, refresh_gamedata_index
 from datetime import datetime
 import os
 
@@ -31,6 +33,8 @@ class DokaponToolsGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self._settings = QSettings("DiNaSoR", "DokaponSoFTools")
+        self._index_workers: list[WorkerThread] = []
+        self._closing = False
         self._init_ui()
         # Restore last game path
         saved = self._settings.value("game_path", "")
@@ -182,11 +186,35 @@ class DokaponToolsGUI(QMainWindow):
         # Persist
         self._settings.setValue("game_path", path)
 
+        # Map the last-built GameData index so the tabs list files from it
+        load_gamedata_index(path)
+
         # Propagate to every tool tab
         for tab in self._tool_tabs:
             tab.set_game_path(path)
 
         self._update_status(f"Game directory set to: {path}")
+        if os.path.isdir(os.path.join(path, "GameData")):
+            self._refresh_gamedata_index(path)
+
+    def _refresh_gamedata_index(self, path: str):
+        """Bring the GameData index up to date in the background."""
+        self._update_status("Updating GameData index...")
+        worker = WorkerThread(refresh_gamedata_index, [path, lambda: self._closing])
+        worker.result.connect(lambda stats: self._on_gamedata_indexed(path, stats))
+        worker.error.connect(lambda e: self._update_status(f"GameData index error: {e}"))
+        self._index_workers.append(worker)
+        worker.start()
+
+    def _on_gamedata_indexed(self, path: str, stats):
+        self._update_status(
+            f"GameData index: {stats.files} file(s), {stats.added} added, "
+            f"{stats.updated} updated, {stats.removed} removed ({stats.seconds:.1f} s)"
+        )
+        # The file lists were built from a missing or outdated index
+        if stats.changed and path == self._settings.value("game_path", ""):
+            for tab in (self.asset_tab, self.video_tab, self.map_tab):
+                tab.set_game_path(path)
 
     # ------------------------------------------------------------------ #
     #  Status panel
@@ -314,5 +342,11 @@ class DokaponToolsGUI(QMainWindow):
                 if worker.isRunning():
                     worker.quit()
                     worker.wait(1000)
+        # quit() cannot stop a plain function, so the index refresh is asked
+        # to stop between files and waited for; it never leaves a partial
+        # index behind.
+        self._closing = True
+        for worker in self._index_workers:
+            worker.wait()
 
         event.accept()
@@ -1,19 +1,23 @@
 from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton,
                             QLabel, QComboBox, QSplitter, QFileDialog, QMessageBox)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from .base_tab import BaseTab
 from ..widgets.file_browser import FileBrowserWidget
 from ..widgets.preview_widget import PreviewWidget
 from ..widgets.worker import WorkerThread
-from app.core.dokapon_extract import process_file
+from app.core.batch_extract import ExtractionJob, extract_files
 import os
 
 class AssetExtractorTab(BaseTab):
+    # Emitted from the worker thread once per finished file
+    _extraction_result = pyqtSignal(object)
 
     def __init__(self):
         super().__init__()
         self._init_ui()
         self.results = {'success': [], 'failed': [], 'raw_bin': []}
+        self._total_files = 0
+        self._extraction_result.connect(self._on_extraction_result)
         
     def _init_ui(self):
         layout = QVBoxLayout(self)
@@ -129,58 +133,52 @@ class AssetExtractorTab(BaseTab):
         self._log_status(f"\nStarting extraction of {total_files} files...")
         
         try:
-            self.workers = []  # Clear previous workers
-            
+            jobs = []
             for input_path, rel_path in files_to_extract:
                 # Create output directory maintaining structure
                 output_dir = os.path.join(output_base, os.path.dirname(rel_path))
                 os.makedirs(output_dir, exist_ok=True)
+                jobs.append(ExtractionJob(input_path, output_dir, rel_path))
                 
-                worker = WorkerThread(
-                    process_file,
-                    [input_path, output_dir, selected_type]
-                )
-                
-                # Store file info with worker
-                worker.file_path = input_path
-                worker.rel_path = rel_path
-                
-                worker.finished.connect(self._on_worker_finished)
-                worker.error.connect(self._on_worker_error)
-                
-                self.workers.append(worker)
-                worker.start()
+            self._run_extraction(jobs, selected_type)
                 
         except Exception as e:
             self._log_status(f"Error starting extraction: {str(e)}")
 
-    def _on_worker_finished(self):
-        worker = self.sender()
-        if worker and hasattr(worker, 'file_path'):
-            file_name = os.path.basename(worker.file_path)
-            # Check if a .bin file was created
-            bin_path = os.path.join(worker.args[1], file_name + ".bin")
-            if os.path.exists(bin_path):
-                self.results['raw_bin'].append(worker.file_path)
-                self._log_status(f"Saved raw data: {file_name}.bin (Not yet decompressed)")
-            else:
-                self.results['success'].append(worker.file_path)
-                self._log_status(f"Successfully extracted: {file_name}")
-            self._check_extraction_complete()
+    def _run_extraction(self, jobs, selected_type):
+        """Run jobs on the shared process-pool engine from a single worker thread"""
+        self._total_files = len(jobs)
+        
+        def _do_extract():
+            extract_files(jobs, selected_type, on_result=self._extraction_result.emit)
+            
+        worker = WorkerThread(_do_extract)
+        worker.error.connect(self._on_worker_error)
+        
+        self.workers = [worker]  # Clear previous workers
+        worker.start()
+
+    def _on_extraction_result(self, result):
+        file_name = os.path.basename(result.input_path)
+        if not result.success:
+            self.results['failed'].append((result.input_path, result.error))
+            self._log_status(f"Failed to extract {file_name}: {result.error}")
+        elif result.raw_bin:
+            self.results['raw_bin'].append(result.input_path)
+            self._log_status(f"Saved raw data: {file_name}.bin (Not yet decompressed)")
+        else:
+            self.results['success'].append(result.input_path)
+            self._log_status(f"Successfully extracted: {file_name}")
+        self._check_extraction_complete()
 
     def _on_worker_error(self, error_msg):
-        worker = self.sender()
-        if worker and hasattr(worker, 'file_path'):
-            self.results['failed'].append((worker.file_path, error_msg))
-            self._log_status(f"Failed to extract {os.path.basename(worker.file_path)}: {error_msg}")
-            self._check_extraction_complete()
+        self._log_status(f"Extraction aborted: {error_msg}")
+        self._show_extraction_report()
 
     def _check_extraction_complete(self):
         """Check if all extractions are complete and show report"""
         total_processed = len(self.results['success']) + len(self.results['failed']) + len(self.results['raw_bin'])
-        total_files = len(self.workers)
-        
-        if total_processed == total_files:
+        if total_processed == self._total_files:
             self._show_extraction_report()
 
     def _show_extraction_report(self):
@@ -271,22 +269,11 @@ class AssetExtractorTab(BaseTab):
             }
             selected_type = type_map.get(self.file_type.currentText(), "all")
             
-            # Create worker for single file extraction
-            worker = WorkerThread(
-                process_file,
-                [file_path, output_dir, selected_type]
+            self._run_extraction(
+                [ExtractionJob(file_path, output_dir, file_name)],
+                selected_type
             )
             
-            # Store file info with worker
-            worker.file_path = file_path
-            worker.rel_path = os.path.basename(file_path)  # Just the filename for single extraction
-            
-            worker.finished.connect(self._on_worker_finished)  # Use the same handler as bulk extraction
-            worker.error.connect(self._on_worker_error)
-            
-            self.workers = [worker]  # Clear and set single worker
-            worker.start()
-            
         except Exception as e:
             self._log_status(f"Error extracting file: {str(e)}")
 
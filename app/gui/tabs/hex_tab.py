@@ -10,12 +10,13 @@ from PyQt6.QtWidgets import (
     QSplitter, QListWidget, QListWidgetItem
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QDragEnterEvent, QDropEvent
+from PyQt6.QtGui import QColor, QDragEnterEvent, QDropEvent, QFont
 from .base_tab import BaseTab
 from ..widgets.worker import WorkerThread
 from app.core.hex_editor import (
     HexPatch, PatchConflict, parse_hex_file, parse_hex_files,
-    detect_conflicts, apply_patches, find_hex_files, get_patch_summary
+    detect_conflicts, apply_patches, find_hex_files, get_patch_summary,
+    revert_patches, get_applied_patches, get_journal_path, create_diff_patch
 )
 from ..styles import COLORS
 import os
@@ -57,9 +58,13 @@ class HexEditorTab(BaseTab):
         self.output_path_label.setStyleSheet(f"color: {COLORS['text_secondary']};")
         output_row.addWidget(self.output_path_label, 1)
         
-        self.backup_checkbox = QCheckBox("Create backup")
-        self.backup_checkbox.setChecked(True)
-        output_row.addWidget(self.backup_checkbox)
+        self.in_place_checkbox = QCheckBox("Patch in place")
+        self.in_place_checkbox.setToolTip(
+            "Write the patches into the selected EXE and keep only the original\n"
+            "bytes of the patched ranges in an undo journal (*.hexjournal)"
+        )
+        self.in_place_checkbox.toggled.connect(self._update_output_path)
+        output_row.addWidget(self.in_place_checkbox)
         exe_layout.addLayout(output_row)
         
         layout.addWidget(exe_group)
@@ -84,6 +89,11 @@ class HexEditorTab(BaseTab):
         add_folder_btn.clicked.connect(self._add_hex_folder)
         left_header.addWidget(add_folder_btn)
         
+        diff_btn = QPushButton("Create from EXE")
+        diff_btn.setToolTip("Create a .hex patch from the differences between the selected EXE and a modified copy")
+        diff_btn.clicked.connect(self._create_diff_patch)
+        left_header.addWidget(diff_btn)
+        
         left_layout.addLayout(left_header)
         
         self.file_list = QListWidget()
@@ -116,12 +126,13 @@ class HexEditorTab(BaseTab):
         right_layout.addWidget(QLabel("Patch Details"))
         
         self.patch_table = QTableWidget()
-        self.patch_table.setColumnCount(4)
-        self.patch_table.setHorizontalHeaderLabels(["File", "Offset", "Size", "Preview"])
+        self.patch_table.setColumnCount(5)
+        self.patch_table.setHorizontalHeaderLabels(["File", "Offset", "Size", "Preview", "Status"])
         self.patch_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.patch_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.patch_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         self.patch_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.patch_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
         self.patch_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         right_layout.addWidget(self.patch_table)
         
@@ -151,6 +162,12 @@ class HexEditorTab(BaseTab):
         
         bottom_layout.addStretch()
         
+        self.revert_btn = QPushButton("Revert")
+        self.revert_btn.setToolTip("Restore the original bytes recorded when patching in place")
+        self.revert_btn.setEnabled(False)
+        self.revert_btn.clicked.connect(self._revert_patches)
+        bottom_layout.addWidget(self.revert_btn)
+        
         self.apply_btn = QPushButton("Apply Patches")
         self.apply_btn.setProperty("class", "primary")
         self.apply_btn.setEnabled(False)
@@ -169,11 +186,22 @@ class HexEditorTab(BaseTab):
         )
         if path:
             self.exe_path_label.setText(path)
-            base, ext = os.path.splitext(path)
-            self.output_path_label.setText(f"{base}_patched{ext}")
+            self._update_output_path()
+            self._update_patch_table()
             self._update_apply_button()
             self._log_status(f"Selected EXE: {os.path.basename(path)}")
 
+    def _update_output_path(self):
+        """Show where Apply will write for the selected EXE."""
+        exe_path = self.exe_path_label.text()
+        if exe_path == "No file selected":
+            return
+        if self.in_place_checkbox.isChecked():
+            self.output_path_label.setText(exe_path)
+        else:
+            base, ext = os.path.splitext(exe_path)
+            self.output_path_label.setText(f"{base}_patched{ext}")
+
     def _add_hex_files(self):
         """Add hex files via file dialog."""
         paths, _ = QFileDialog.getOpenFileNames(
@@ -195,6 +223,46 @@ class HexEditorTab(BaseTab):
             else:
                 self._log_status(f"No .hex files found in {path}")
 
+    def _create_diff_patch(self):
+        """Create a .hex patch from a modified copy of the selected EXE."""
+        exe_path = self.exe_path_label.text()
+        if not os.path.isfile(exe_path):
+            QMessageBox.warning(self, "No EXE", "Select the original executable first.")
+            return
+        
+        modified_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Modified Executable",
+            os.path.dirname(exe_path),
+            "Executable Files (*.exe);;All Files (*)"
+        )
+        if not modified_path:
+            return
+        
+        base = os.path.splitext(os.path.basename(modified_path))[0]
+        hex_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Hex Patch",
+            os.path.join(os.path.dirname(modified_path), f"{base}.hex"),
+            "Hex Files (*.hex)"
+        )
+        if not hex_path:
+            return
+        
+        try:
+            patches = create_diff_patch(exe_path, modified_path, hex_path)
+        except Exception as e:
+            self._log_status(f"Error creating patch: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to create patch:\n{e}")
+            return
+        
+        total = sum(p.size for p in patches)
+        self._log_status(f"Created {os.path.basename(hex_path)}: {len(patches)} patches, {total} bytes")
+        if hex_path in self.hex_files:
+            self._refresh_patches()
+        elif patches:
+            self._load_hex_files([hex_path])
+
     def _load_hex_files(self, paths: list):
         """Load hex files and parse patches."""
         added = 0
@@ -254,11 +322,27 @@ class HexEditorTab(BaseTab):
 
     def _update_patch_table(self):
         """Update the patch details table."""
+        conflict_files = set()
+        for c in self.conflicts:
+            conflict_files.add(c.patch1.source_file)
+            conflict_files.add(c.patch2.source_file)
+        mono_font = QFont("Consolas")
+        mono_font.setStyleHint(QFont.StyleHint.Monospace)
+        
+        # Which patches the selected EXE already contains (reads only the patched ranges)
+        exe_path = self.exe_path_label.text()
+        applied = [False] * len(self.patches)
+        if self.patches and os.path.isfile(exe_path):
+            try:
+                applied = get_applied_patches(exe_path, self.patches)
+            except OSError as e:
+                self._log_status(f"Could not read {exe_path}: {e}")
+        
+        self.patch_table.setUpdatesEnabled(False)
         self.patch_table.setRowCount(0)
+        self.patch_table.setRowCount(len(self.patches))
         
         for i, patch in enumerate(self.patches):
-            self.patch_table.insertRow(i)
-            
             # File name
             file_item = QTableWidgetItem(os.path.basename(patch.source_file))
             file_item.setFlags(file_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
@@ -278,17 +362,20 @@ class HexEditorTab(BaseTab):
             preview = patch.get_hex_preview(16)
             preview_item = QTableWidgetItem(preview)
             preview_item.setFlags(preview_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            preview_item.setStyleSheet(f"font-family: 'Consolas', monospace;")
+            preview_item.setFont(mono_font)
             self.patch_table.setItem(i, 3, preview_item)
             
+            # Applied status
+            status_item = QTableWidgetItem("Applied" if applied[i] else "")
+            status_item.setFlags(status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.patch_table.setItem(i, 4, status_item)
+            
             # Highlight if in conflict
-            is_conflict = any(
-                patch.source_file == c.patch1.source_file or patch.source_file == c.patch2.source_file
-                for c in self.conflicts
-            )
-            if is_conflict:
-                for col in range(4):
+            if patch.source_file in conflict_files:
+                for col in range(5):
                     self.patch_table.item(i, col).setBackground(QColor("#5a1d1d"))
+        
+        self.patch_table.setUpdatesEnabled(True)
 
     def _update_conflicts_panel(self):
         """Update the conflicts display panel."""
@@ -326,6 +413,9 @@ class HexEditorTab(BaseTab):
         has_exe = self.exe_path_label.text() != "No file selected"
         has_patches = len(self.patches) > 0
         self.apply_btn.setEnabled(has_exe and has_patches)
+        self.revert_btn.setEnabled(
+            has_exe and os.path.exists(get_journal_path(self.exe_path_label.text()))
+        )
 
     def _on_file_selection_changed(self):
         """Handle file list selection changes."""
@@ -356,17 +446,22 @@ class HexEditorTab(BaseTab):
         try:
             self._log_status(f"Applying {len(self.patches)} patches...")
             
-            backup = self.backup_checkbox.isChecked()
-            applied, errors = apply_patches(exe_path, self.patches, output_path, backup)
+            in_place = self.in_place_checkbox.isChecked()
+            if in_place:
+                output_path = exe_path
+            applied, errors = apply_patches(exe_path, self.patches, output_path, backup=True)
             
             for error in errors:
                 self._log_status(f"  {error}")
             
+            self._update_patch_table()
+            self._update_apply_button()
+            
             if applied > 0:
                 self._log_status(f"Successfully applied {applied} patches to: {output_path}")
                 
-                if backup:
-                    self._log_status(f"Backup saved as: {exe_path}.backup")
+                if in_place:
+                    self._log_status(f"Undo journal saved as: {get_journal_path(exe_path)}")
                 
                 QMessageBox.information(
                     self,
@@ -381,6 +476,37 @@ class HexEditorTab(BaseTab):
             self._log_status(f"Error applying patches: {e}")
             QMessageBox.critical(self, "Error", f"Failed to apply patches:\n{e}")
 
+    def _revert_patches(self):
+        """Restore the original bytes of an EXE patched in place."""
+        exe_path = self.exe_path_label.text()
+        
+        try:
+            restored, errors = revert_patches(exe_path)
+            for error in errors:
+                self._log_status(f"  {error}")
+            
+            if errors:
+                result = QMessageBox.warning(
+                    self,
+                    "Modified Since Patching",
+                    f"{len(errors)} range(s) were not restored because they changed after patching.\n\n"
+                    "Restore them anyway?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if result == QMessageBox.StandardButton.Yes:
+                    forced, errors = revert_patches(exe_path, force=True)
+                    restored += forced
+                    for error in errors:
+                        self._log_status(f"  {error}")
+            
+            self._log_status(f"Restored {restored} range(s) in: {exe_path}")
+        except Exception as e:
+            self._log_status(f"Error reverting patches: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to revert patches:\n{e}")
+        
+        self._update_patch_table()
+        self._update_apply_button()
+
     def _drag_enter_event(self, event: QDragEnterEvent):
         """Handle drag enter for file drops."""
         if event.mimeData().hasUrls():
@@ -405,8 +531,8 @@ class HexEditorTab(BaseTab):
         exe = os.path.join(path, "DOKAPON! Sword of Fury.exe")
         if os.path.isfile(exe):
             self.exe_path_label.setText(exe)
-            base, ext = os.path.splitext(exe)
-            self.output_path_label.setText(f"{base}_patched{ext}")
+            self._update_output_path()
+            self._update_patch_table()
             self._update_apply_button()
 
 
@@ -4,6 +4,7 @@ Provides visual exploration of Cell/Map files with atlas view, map rendering,
 records and parts tables, and full scan report generation.
 """
 
+from collections import OrderedDict
 from io import BytesIO
 from pathlib import Path
 
@@ -16,7 +17,6 @@ from PyQt6.QtWidgets import (
     QListWidget,
     QPushButton,
     QScrollArea,
-    QSpinBox,
     QSplitter,
     QTableWidget,
     QTableWidgetItem,
@@ -24,23 +24,24 @@ from PyQt6.QtWidgets import (
     QTextEdit,
     QVBoxLayout,
     QWidget,
+    QWIDGETSIZE_MAX,
 )
 from PyQt6.QtCore import Qt, QPoint, pyqtSignal
-from PyQt6.QtGui import QPixmap, QWheelEvent, QMouseEvent
+from PyQt6.QtGui import QImage, QPainter, QPaintEvent, QPixmap, QWheelEvent, QMouseEvent
 
 from .base_tab import BaseTab
 from ..styles import COLORS
 from ..widgets.worker import WorkerThread
 from ...core.map_renderer import (
     LoadedCellDocument,
-    build_atlas_for_document,
+    MapTileSource,
+    document_cache,
     list_cell_files,
-    load_cell_document,
-    render_map_image,
     scan_workspace,
 )
-from ...core.game_scanner import scan_map_groups
+from ...core.game_scanner import SCAN_DEEP, SCAN_QUICK, SCAN_TIERS, analyze_file, scan_map_groups
 from ...core.report_generator import write_markdown_report
+from ...core.scan_cache import ScanCache
 
 
 def pil_to_qpixmap(image: Image.Image) -> QPixmap:
@@ -52,14 +53,30 @@ def pil_to_qpixmap(image: Image.Image) -> QPixmap:
     return pixmap
 
 
+def pil_to_qimage(image: Image.Image) -> QImage:
+    """Convert a PIL Image to a QImage without a PNG round trip."""
+    rgba = image if image.mode == "RGBA" else image.convert("RGBA")
+    data = rgba.tobytes("raw", "RGBA")
+    return QImage(data, rgba.width, rgba.height, rgba.width * 4, QImage.Format.Format_RGBA8888).copy()
+
+
 class ZoomPanLabel(QLabel):
-    """A QLabel that supports mouse-wheel zoom and click-drag panning inside a QScrollArea."""
+    """A QLabel that supports mouse-wheel zoom and click-drag panning inside a QScrollArea.
+
+    The map is drawn from a :class:`MapTileSource` in fixed-size tiles that
+    are rendered on demand for the visible area only and kept in an LRU, so
+    zooming and panning cost is bounded by the viewport, not the map size.
+    """
 
     zoom_changed = pyqtSignal(float)
 
+    TILE_SIZE = 256
+    MAX_CACHED_TILES = 512  # 512 * 256 KiB = 128 MiB worst case
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._pixmap_original: QPixmap | None = None
+        self._source: MapTileSource | None = None
+        self._tiles: OrderedDict[tuple, QPixmap] = OrderedDict()
         self._zoom: float = 1.0
         self._min_zoom: float = 0.05
         self._max_zoom: float = 20.0
@@ -71,11 +88,27 @@ class ZoomPanLabel(QLabel):
 
     # -- public API --
 
-    def setSourcePixmap(self, pixmap: QPixmap):
-        """Set the full-resolution source pixmap and display at current zoom."""
-        self._pixmap_original = pixmap
+    def setTileSource(self, source: MapTileSource):
+        """Set the map to display and show it at the current zoom."""
+        previous = self._source
+        if previous is not None and previous.document is not source.document:
+            # A reloaded copy of the same file may differ; drop its stale tiles.
+            path = str(previous.document.source_path)
+            if path == str(source.document.source_path):
+                for key in [key for key in self._tiles if key[0] == path]:
+                    del self._tiles[key]
+        self._source = source
+        super().setText("")
         self._apply_zoom()
 
+    def setText(self, text: str):
+        """Show a message instead of the map."""
+        self._source = None
+        self.setMinimumSize(0, 0)
+        self.setMaximumSize(QWIDGETSIZE_MAX, QWIDGETSIZE_MAX)
+        super().setText(text)
+        self.adjustSize()
+
     def resetZoom(self):
         """Reset zoom to 1:1."""
         self._zoom = 1.0
@@ -84,35 +117,46 @@ class ZoomPanLabel(QLabel):
     def fitToView(self):
         """Fit the image to the viewport of the parent QScrollArea."""
         scroll = self._scroll_area()
-        if scroll is None or self._pixmap_original is None or self._pixmap_original.isNull():
+        if scroll is None or self._source is None or self._source.is_empty:
             return
         vp = scroll.viewport().size()
-        pw, ph = self._pixmap_original.width(), self._pixmap_original.height()
-        if pw == 0 or ph == 0:
-            return
-        self._zoom = min(vp.width() / pw, vp.height() / ph)
+        self._zoom = max(self._min_zoom, min(self._max_zoom, min(vp.width() / self._source.width, vp.height() / self._source.height)))
         self._apply_zoom()
 
     @property
     def zoom(self) -> float:
         return self._zoom
 
+    @property
+    def source(self) -> MapTileSource | None:
+        return self._source
+
     # -- internal --
 
     def _apply_zoom(self):
-        if self._pixmap_original is None or self._pixmap_original.isNull():
+        if self._source is None or self._source.is_empty:
             return
-        w = max(1, int(self._pixmap_original.width() * self._zoom))
-        h = max(1, int(self._pixmap_original.height() * self._zoom))
-        scaled = self._pixmap_original.scaled(
-            w, h,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
-        self.setPixmap(scaled)
-        self.adjustSize()
+        w, h = self._source.scaled_size(self._zoom)
+        self.setFixedSize(w, h)
+        self.update()
         self.zoom_changed.emit(self._zoom)
 
+    def _tile_pixmap(self, tx: int, ty: int) -> QPixmap | None:
+        source = self._source
+        key = (str(source.document.source_path), source.palette_index, round(self._zoom, 6), tx, ty)
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+        image = source.render_region(self._zoom, tx * self.TILE_SIZE, ty * self.TILE_SIZE, self.TILE_SIZE, self.TILE_SIZE)
+        if image is None:
+            return None
+        pixmap = QPixmap.fromImage(pil_to_qimage(image))
+        self._tiles[key] = pixmap
+        while len(self._tiles) > self.MAX_CACHED_TILES:
+            self._tiles.popitem(last=False)
+        return pixmap
+
     def _scroll_area(self) -> QScrollArea | None:
         parent = self.parent()
         while parent is not None:
@@ -123,8 +167,21 @@ class ZoomPanLabel(QLabel):
 
     # -- events --
 
+    def paintEvent(self, event: QPaintEvent):
+        if self._source is None:
+            return super().paintEvent(event)
+        rect = event.rect()
+        size = self.TILE_SIZE
+        painter = QPainter(self)
+        for ty in range(rect.top() // size, rect.bottom() // size + 1):
+            for tx in range(rect.left() // size, rect.right() // size + 1):
+                pixmap = self._tile_pixmap(tx, ty)
+                if pixmap is not None:
+                    painter.drawPixmap(tx * size, ty * size, pixmap)
+        painter.end()
+
     def wheelEvent(self, event: QWheelEvent):
-        if self._pixmap_original is None:
+        if self._source is None:
             return super().wheelEvent(event)
 
         scroll = self._scroll_area()
@@ -185,11 +242,18 @@ class ZoomPanLabel(QLabel):
 class MapExplorerTab(BaseTab):
     """Map Explorer tab with atlas/map views, record/part tables, and report."""
 
+    # Emitted from the scan worker thread for every analysed file
+    _scan_insight = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self._current_document: LoadedCellDocument | None = None
         self._game_dir: Path | None = None
+        self._scanning = False
+        self._scan_cancelled = False
+        self._scan_count = 0
         self._init_ui()
+        self._scan_insight.connect(self._on_scan_insight)
 
     def _init_ui(self):
         """Initialize the Map Explorer UI."""
@@ -242,7 +306,22 @@ class MapExplorerTab(BaseTab):
         self.file_list.currentRowChanged.connect(self._on_file_selected)
         left_layout.addWidget(self.file_list, stretch=1)
 
-        # Scan button
+        # Scan depth and button
+        tier_layout = QHBoxLayout()
+        tier_label = QLabel("Scan depth:")
+        tier_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 11px;")
+        tier_layout.addWidget(tier_label)
+        self.scan_tier_combo = QComboBox()
+        for tier in SCAN_TIERS:
+            self.scan_tier_combo.addItem(tier.capitalize(), tier)
+        self.scan_tier_combo.setCurrentIndex(SCAN_TIERS.index(SCAN_DEEP))
+        self.scan_tier_combo.setToolTip(
+            "Quick reads file headers only, Standard adds PNG counts and chunk tables, "
+            "Deep adds record, map and texture summaries."
+        )
+        tier_layout.addWidget(self.scan_tier_combo, stretch=1)
+        left_layout.addLayout(tier_layout)
+
         self.scan_btn = QPushButton("Full Scan")
         self.scan_btn.setStyleSheet(
             f"background-color: {COLORS['bg_tertiary']}; color: {COLORS['text_primary']}; "
@@ -359,24 +438,6 @@ class MapExplorerTab(BaseTab):
         self.map_palette_combo.currentIndexChanged.connect(self._refresh_map)
         controls_bar.addWidget(self.map_palette_combo)
 
-        render_label = QLabel("Render Size:")
-        render_label.setStyleSheet(f"color: {COLORS['text_primary']};")
-        controls_bar.addWidget(render_label)
-
-        self.zoom_spin = QSpinBox()
-        self.zoom_spin.setRange(64, 8192)
-        self.zoom_spin.setValue(2048)
-        self.zoom_spin.setSingleStep(256)
-        self.zoom_spin.setSuffix(" px")
-        self.zoom_spin.setStyleSheet(
-            f"background-color: {COLORS['bg_tertiary']}; "
-            f"color: {COLORS['text_primary']}; "
-            f"border: 1px solid {COLORS['border_primary']}; "
-            f"border-radius: 4px; padding: 4px;"
-        )
-        self.zoom_spin.valueChanged.connect(self._refresh_map)
-        controls_bar.addWidget(self.zoom_spin)
-
         # Zoom controls
         controls_bar.addSpacing(16)
 
@@ -517,7 +578,19 @@ class MapExplorerTab(BaseTab):
         self.file_list.clear()
         self._log_status("Scanning for cell files...")
 
-        worker = WorkerThread(list_cell_files, [self._game_dir])
+        game_dir = self._game_dir
+
+        def _list_files():
+            # A quick scan only reads file heads, cheap enough for every listed file
+            files = []
+            for path in list_cell_files(game_dir):
+                try:
+                    files.append((path, analyze_file(path, game_dir, SCAN_QUICK)))
+                except OSError:
+                    continue  # Deleted or unreadable since it was listed
+            return files
+
+        worker = WorkerThread(_list_files)
         worker.result.connect(self._on_files_listed)
         worker.error.connect(lambda e: self._log_status(f"Error listing files: {e}"))
         worker.finished.connect(lambda: self._log_status("File scan complete."))
@@ -525,18 +598,33 @@ class MapExplorerTab(BaseTab):
         worker.start()
 
     def _on_files_listed(self, files):
-        """Handle the result of list_cell_files."""
-        self._cell_files: list[Path] = files
+        """Handle the listed cell files and their quick-scan insights."""
+        self._cell_files: list[Path] = [path for path, _insight in files]
         self.file_list.clear()
-        for path in files:
+        for path, insight in files:
             # Show relative path from game dir for readability
             try:
                 display = str(path.relative_to(self._game_dir))
             except ValueError:
                 display = str(path)
             self.file_list.addItem(display)
+            self.file_list.item(self.file_list.count() - 1).setToolTip(self._format_quick_insight(insight))
         self._log_status(f"Found {len(files)} cell file(s).")
 
+    @staticmethod
+    def _format_quick_insight(insight) -> str:
+        lines = [f"{insight.signature}, {insight.size:,} bytes"]
+        if insight.lz77:
+            lines.append(f"LZ77: {insight.lz77['raw_size']:,} bytes unpacked")
+        if insight.cell_fields:
+            lines.append(
+                f"Grid {insight.cell_fields['grid_width']}x{insight.cell_fields['grid_height']}, "
+                f"{insight.cell_fields['entry_count']} entries"
+            )
+        if insight.parse_error:
+            lines.append(f"Error: {insight.parse_error}")
+        return "\n".join(lines)
+
     # ------------------------------------------------------------------ #
     #  File selection -> load document
     # ------------------------------------------------------------------ #
@@ -548,7 +636,7 @@ class MapExplorerTab(BaseTab):
         path = self._cell_files[row]
         self._log_status(f"Loading: {path.name}...")
 
-        worker = WorkerThread(load_cell_document, [path])
+        worker = WorkerThread(document_cache.load, [path])
         worker.result.connect(self._on_document_loaded)
         worker.error.connect(lambda e: self._log_status(f"Error loading file: {e}"))
         self.workers.append(worker)
@@ -603,7 +691,7 @@ class MapExplorerTab(BaseTab):
 
         palette_index = max(0, self.atlas_palette_combo.currentIndex())
 
-        worker = WorkerThread(build_atlas_for_document, [doc, palette_index])
+        worker = WorkerThread(document_cache.atlas, [doc, palette_index])
         worker.result.connect(self._on_atlas_rendered)
         worker.error.connect(lambda e: self._log_status(f"Atlas render error: {e}"))
         self.workers.append(worker)
@@ -623,27 +711,28 @@ class MapExplorerTab(BaseTab):
     # ------------------------------------------------------------------ #
 
     def _refresh_map(self):
-        """Render the map image with the selected palette and zoom via WorkerThread."""
+        """Prepare a tile source for the selected palette via WorkerThread."""
         doc = self._current_document
         if doc is None:
             return
 
         palette_index = max(0, self.map_palette_combo.currentIndex())
-        max_edge = self.zoom_spin.value()
 
-        worker = WorkerThread(render_map_image, [doc, palette_index, max_edge])
+        worker = WorkerThread(document_cache.tile_source, [doc, palette_index])
         worker.result.connect(self._on_map_rendered)
         worker.error.connect(lambda e: self._log_status(f"Map render error: {e}"))
         self.workers.append(worker)
         worker.start()
 
-    def _on_map_rendered(self, image):
-        """Display the map image."""
-        if image is None:
+    def _on_map_rendered(self, source):
+        """Display the map; tiles are rendered as they become visible."""
+        if source.is_empty:
             self.map_label.setText("No map available for this file.")
             return
-        pixmap = pil_to_qpixmap(image)
-        self.map_label.setSourcePixmap(pixmap)
+        previous = self.map_label.source
+        self.map_label.setTileSource(source)
+        if previous is None or previous.document is not source.document:
+            self.map_label.fitToView()
         self._update_zoom_label()
 
     def _update_zoom_label(self):
@@ -775,27 +864,76 @@ class MapExplorerTab(BaseTab):
     # ------------------------------------------------------------------ #
 
     def _run_full_scan(self):
-        """Run a full workspace scan via WorkerThread."""
+        """Run a full workspace scan via WorkerThread, or cancel the running one."""
+        if self._scanning:
+            self._scan_cancelled = True
+            self.scan_btn.setEnabled(False)
+            self._log_status("Cancelling scan...")
+            return
         if self._game_dir is None:
             self._log_status("No game directory selected.")
             return
 
         self._log_status("Starting full scan (this may take a while)...")
-        self.scan_btn.setEnabled(False)
-
-        worker = WorkerThread(scan_workspace, [self._game_dir])
+        self._scanning = True
+        self._scan_cancelled = False
+        self._scan_count = 0
+        self.scan_btn.setText("Cancel Scan")
+        self.report_text.setPlainText("# Scanning...\n")
+        self.detail_tabs.setCurrentIndex(4)  # Switch to Report tab
+
+        game_dir = self._game_dir
+        tier = self.scan_tier_combo.currentData()
+
+        def _do_scan():
+            # The cache's SQLite connection must live on the worker thread
+            with ScanCache() as cache:
+                debug_insight, map_groups = scan_workspace(
+                    game_dir,
+                    cache,
+                    on_insight=self._scan_insight.emit,
+                    should_cancel=lambda: self._scan_cancelled,
+                    tier=tier,
+                )
+                return debug_insight, map_groups, cache.stats
+
+        worker = WorkerThread(_do_scan)
         worker.result.connect(self._on_scan_complete)
         worker.error.connect(lambda e: self._log_status(f"Scan error: {e}"))
-        worker.finished.connect(lambda: self.scan_btn.setEnabled(True))
+        worker.error.connect(lambda _e: self._on_scan_finished())
+        worker.finished.connect(self._on_scan_finished)
         self.workers.append(worker)
         worker.start()
 
+    def _on_scan_finished(self):
+        self._scanning = False
+        self.scan_btn.setText("Full Scan")
+        self.scan_btn.setEnabled(True)
+
+    def _on_scan_insight(self, insight):
+        """Append one analysed file to the Report tab while the scan runs."""
+        self._scan_count += 1
+        detail = insight.decompressed_signature or ""
+        if insight.parse_error:
+            detail = f"{detail} error: {insight.parse_error}".strip()
+        self.report_text.append(
+            f"- `{insight.relative_path}` {insight.signature} {detail}".rstrip()
+        )
+        if self._scan_count % 50 == 0:
+            self._log_status(f"Scanned {self._scan_count} file(s)...")
+
     def _on_scan_complete(self, result):
         """Handle full scan results and build a markdown report in the Report tab."""
-        debug_insight, map_groups = result
-        self._log_status(
-            f"Scan complete: {len(map_groups)} map group(s) found."
-        )
+        debug_insight, map_groups, cache_stats = result
+        if self._scan_cancelled:
+            self._log_status(
+                f"Scan cancelled after {self._scan_count} file(s); the report below is partial."
+            )
+        else:
+            self._log_status(
+                f"Scan complete: {len(map_groups)} map group(s) found "
+                f"(cache: {cache_stats.hits} hit(s), {cache_stats.misses} miss(es))."
+            )
 
         # Build report text in-memory (same format as write_markdown_report but
         # we render it directly into the QTextEdit instead of writing to disk).
@@ -803,7 +941,7 @@ class MapExplorerTab(BaseTab):
             import tempfile
 
             with tempfile.TemporaryDirectory() as tmp:
-                report_path = write_markdown_report(Path(tmp), debug_insight, map_groups)
+                report_path = write_markdown_report(Path(tmp), debug_insight, map_groups, cache_stats)
                 report_text = report_path.read_text(encoding="utf-8")
             self.report_text.setPlainText(report_text)
             self.detail_tabs.setCurrentIndex(4)  # Switch to Report tab
@@ -13,7 +13,7 @@ from PyQt6.QtGui import QColor, QFont, QIcon
 from .base_tab import BaseTab
 from ..widgets.worker import WorkerThread
 from ..widgets.smart_text_editor import SmartTextEditorWidget, DokaponSyntaxHighlighter
-from app.core.text_extract_repack import extract_texts, extract_texts_to_memory, import_texts, analyze_text_patterns
+from app.core.text_extract_repack import extract_texts, extract_texts_to_memory, import_text_changes, analyze_text_patterns
 import os
 import re
 
@@ -838,34 +838,15 @@ class TextTab(BaseTab):
             self._log_status("Error: No EXE file selected")
             return
 
-        # Create temp files for import
-        temp_dir = os.path.join(os.path.dirname(exe_path), ".temp_import")
-        os.makedirs(temp_dir, exist_ok=True)
-            
-        text_file = os.path.join(temp_dir, "texts.txt")
-        offset_file = os.path.join(temp_dir, "offsets.txt")
-        
-        # Write current state
-        with open(text_file, 'w', encoding='utf-8') as tf, \
-             open(offset_file, 'w', encoding='utf-8') as of:
-            for entry in self.entries:
-                tf.write(entry['current_text'] + '\n')
-                of.write(f"{entry['offset']}:{entry['length']}\n")
-        
-            output_exe = exe_path.replace(".exe", "_modified.exe")
+        output_exe = exe_path.replace(".exe", "_modified.exe")
+        edits = [(int(entry['offset']), entry['current_text']) for entry in self.entries]
         self._log_status(f"Saving to {os.path.basename(output_exe)}...")
         
-        def do_import():
-            return import_texts(exe_path, text_file, offset_file, output_exe)
-        
-        def cleanup():
-            os.remove(text_file)
-            os.remove(offset_file)
-            os.rmdir(temp_dir)
-            self._log_status(f"Saved to {os.path.basename(output_exe)}")
-        
-        worker = WorkerThread(do_import)
-        worker.finished.connect(cleanup)
+        # Only slots that differ from the original text are written
+        worker = WorkerThread(import_text_changes, [exe_path, edits, output_exe])
+        worker.result.connect(
+            lambda result: self._log_status(
+                f"Saved {result[0]} changed texts to {os.path.basename(output_exe)}"))
         worker.error.connect(lambda e: self._log_status(f"Error: {e}"))
         self.workers.append(worker)
         worker.start()
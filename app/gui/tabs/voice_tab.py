@@ -9,25 +9,29 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem, QHeaderView, QProgressBar, QSpinBox,
     QGroupBox, QSplitter, QMessageBox, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QMimeData
+from PyQt6.QtCore import Qt, QMimeData, pyqtSignal
 from PyQt6.QtGui import QColor, QDragEnterEvent, QDropEvent
 from .base_tab import BaseTab
 from ..widgets.worker import WorkerThread
 from app.core.pck_handler import PCKFile, Sound, extract_pck
 from app.core.tool_manager import ToolManager
+from app.core.opus_info import format_duration, index_pck_file, load_cached_index
+from app.core.voice_replace import EncodeCache, ReplacementJob, prepare_replacements
 from ..styles import COLORS
 import os
-import subprocess
-import tempfile
 
 
 class VoiceExtractorTab(BaseTab):
     """Enhanced Voice Tools tab with Extract and Replace modes."""
 
+    _replacement_result = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.current_pck: PCKFile = None
+        self._sound_infos = None  # Opus metadata of current_pck, once indexed
         self.replacement_queue = {}  # {original_name: (new_path, loop_start, loop_end)}
+        self._replacement_result.connect(self._on_replacement_result)
         self._init_ui()
 
     def _init_ui(self):
@@ -60,13 +64,14 @@ class VoiceExtractorTab(BaseTab):
         
         # Sound list table
         self.sound_table = QTableWidget()
-        self.sound_table.setColumnCount(5)
-        self.sound_table.setHorizontalHeaderLabels(["Name", "Size", "Format", "Replacement", "Status"])
+        self.sound_table.setColumnCount(6)
+        self.sound_table.setHorizontalHeaderLabels(["Name", "Size", "Format", "Replacement", "Status", "Duration"])
         self.sound_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.sound_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.sound_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         self.sound_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
         self.sound_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
+        self.sound_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
         self.sound_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.sound_table.setAcceptDrops(True)
         self.sound_table.dragEnterEvent = self._drag_enter_event
@@ -197,8 +202,15 @@ class VoiceExtractorTab(BaseTab):
         """Load and display a PCK file."""
         try:
             self.pck_path_label.setText(path)
+            if self.current_pck:
+                self.current_pck.close()
             self.current_pck = PCKFile(path)
+            # Durations come from a fresh sidecar straight away, otherwise
+            # they are indexed in the background and filled in later
+            self._sound_infos = load_cached_index(self.current_pck)
             self._populate_sound_table()
+            if self._sound_infos is None:
+                self._index_durations(path)
             self._log_status(f"Loaded PCK: {os.path.basename(path)} ({len(self.current_pck)} sounds)")
             
             # Update output PCK label
@@ -248,6 +260,42 @@ class VoiceExtractorTab(BaseTab):
             if replacement:
                 status_item.setForeground(QColor(COLORS['accent_warning']))
             self.sound_table.setItem(i, 4, status_item)
+            
+            # Duration (filled in by _fill_durations)
+            duration_item = QTableWidgetItem("")
+            duration_item.setFlags(duration_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.sound_table.setItem(i, 5, duration_item)
+        
+        self._fill_durations()
+
+    def _index_durations(self, path: str):
+        """Read the Ogg page index of every sound in the background."""
+        worker = WorkerThread(index_pck_file, [path])
+        worker.result.connect(lambda infos: self._on_durations_indexed(path, infos))
+        worker.error.connect(lambda e: self._log_status(f"Error reading sound durations: {e}"))
+        self.workers.append(worker)
+        worker.start()
+
+    def _on_durations_indexed(self, path: str, infos):
+        # Another PCK may have been opened meanwhile
+        if self.current_pck is None or self.current_pck.source_path != path:
+            return
+        self._sound_infos = infos
+        self._fill_durations()
+
+    def _fill_durations(self):
+        """Show the indexed durations (from the Ogg page index, no decoding)."""
+        infos = self._sound_infos
+        if infos is None or len(infos) != self.sound_table.rowCount():
+            return
+        for i, info in enumerate(infos):
+            duration_item = self.sound_table.item(i, 5)
+            duration_item.setText(format_duration(info.duration) if info else "")
+            if info:
+                tooltip = f"{info.channels} ch, {info.bitrate / 1000:.0f} kbps, pre-skip {info.pre_skip}"
+                if info.loop_start is not None or info.loop_end is not None:
+                    tooltip += f"\nLoopStart={info.loop_start or 0} LoopEnd={info.loop_end or 0}"
+                duration_item.setToolTip(tooltip)
 
     def _format_size(self, size: int) -> str:
         """Format file size for display."""
@@ -402,71 +450,59 @@ class VoiceExtractorTab(BaseTab):
         worker.start()
 
     def _do_replacements_work(self, replacement_queue, opusenc_path):
-        """Worker function: process replacements off the GUI thread."""
-        results = []  # list of (original_name, success, message, new_sound_or_None)
-
-        for original_name, (replacement_path, loop_start, loop_end) in replacement_queue.items():
-            try:
-                # Convert to Opus if needed
-                if not replacement_path.lower().endswith(('.opus', '.ogg')):
-                    temp_opus = tempfile.mktemp(suffix='.opus')
-
-                    cmd = [opusenc_path]
-                    if loop_start > 0:
-                        cmd.extend(["--comment", f"LoopStart={loop_start}"])
-                    if loop_end > 0:
-                        cmd.extend(["--comment", f"LoopEnd={loop_end}"])
-                    cmd.extend([replacement_path, temp_opus])
-
-                    try:
-                        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-                        if result.returncode != 0:
-                            with open(replacement_path, 'rb') as f:
-                                new_data = f.read()
-                        else:
-                            with open(temp_opus, 'rb') as f:
-                                new_data = f.read()
-                            os.remove(temp_opus)
-                    except FileNotFoundError:
-                        with open(replacement_path, 'rb') as f:
-                            new_data = f.read()
-                else:
-                    with open(replacement_path, 'rb') as f:
-                        new_data = f.read()
+        """Worker function: encode replacements off the GUI thread."""
+        jobs = [
+            ReplacementJob(original_name, replacement_path, loop_start, loop_end)
+            for original_name, (replacement_path, loop_start, loop_end) in replacement_queue.items()
+        ]
+        prepared = prepare_replacements(
+            jobs, opusenc_path, cache=EncodeCache(), on_result=self._replacement_result.emit
+        )
 
+        # Results arrive in completion order; report them in queue order
+        prepared = {result.name: result for result in prepared}
+        results = []  # list of (original_name, success, message, new_sound_or_None)
+        for job in jobs:
+            result = prepared[job.name]
+            new_sound = None
+            if result.success:
                 new_sound = Sound(
-                    name=original_name,
-                    data=new_data,
-                    loop_start=loop_start,
-                    loop_end=loop_end
+                    name=job.name,
+                    data=result.data,
+                    loop_start=job.loop_start,
+                    loop_end=job.loop_end
                 )
-                results.append((original_name, True, "Replaced", new_sound))
-            except Exception as e:
-                results.append((original_name, False, str(e), None))
+            results.append((job.name, result.success, result.message, new_sound))
 
         return results
 
+    def _on_replacement_result(self, result):
+        """Mark a sound as encoded as soon as its replacement is ready."""
+        for row in range(self.sound_table.rowCount()):
+            if self.sound_table.item(row, 0).text() == result.name:
+                status_item = self.sound_table.item(row, 4)
+                status_item.setText("Cached" if result.cached else "Ready" if result.success else "Failed")
+                break
+
     def _on_replacements_complete(self, results):
         """Handle replacement results on the GUI thread."""
-        for original_name, success, message, new_sound in results:
-            if success and new_sound:
-                if self.current_pck.replace_sound(original_name, new_sound):
-                    self._log_status(f"Replaced: {original_name}")
-                    for row in range(self.sound_table.rowCount()):
-                        if self.sound_table.item(row, 0).text() == original_name:
-                            status_item = self.sound_table.item(row, 4)
-                            status_item.setText("Done")
-                            status_item.setForeground(QColor(COLORS['accent_success']))
-                            break
-                else:
-                    self._log_status(f"Warning: Could not find {original_name} in PCK")
-            else:
-                self._log_status(f"Error replacing {original_name}: {message}")
-
-        # Save modified PCK
+        # Apply every replacement in one batch and save the PCK once
+        output_path = self.output_pck_label.text()
+        rows = {self.sound_table.item(row, 0).text(): row for row in range(self.sound_table.rowCount())}
         try:
-            output_path = self.output_pck_label.text()
-            self.current_pck.write(output_path)
+            with self.current_pck.batch(output_path) as batch:
+                for original_name, success, message, new_sound in results:
+                    if success and new_sound:
+                        if batch.replace(original_name, new_sound):
+                            self._log_status(f"Replaced: {original_name}")
+                            if original_name in rows:
+                                status_item = self.sound_table.item(rows[original_name], 4)
+                                status_item.setText("Done")
+                                status_item.setForeground(QColor(COLORS['accent_success']))
+                        else:
+                            self._log_status(f"Warning: Could not find {original_name} in PCK")
+                    else:
+                        self._log_status(f"Error replacing {original_name}: {message}")
             self._log_status(f"Saved modified PCK to: {output_path}")
             self.replacement_queue.clear()
         except Exception as e:
@@ -16,6 +16,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, QSize, QModelIndex, QTimer, QThread, QM
 import os
 
 from app.core.dokapon_extract import decompress_lz77
+from app.core.gamedata_index import get_gamedata_index
 from app.gui.styles import COLORS
 
 
@@ -430,7 +431,15 @@ class FileBrowserWidget(QWidget):
         else:
             folder_item = self._create_folder_item(os.path.basename(path) or path, path)
             root_item.appendRow(folder_item)
-            file_count = self._add_directory_contents(folder_item[0], path, selected_type)
+            index = get_gamedata_index(path)
+            if index is not None:
+                prefix = index.relative(path)
+                prefix = prefix + "/" if prefix else ""
+                file_count = self._add_indexed_contents(
+                    folder_item[0], path, index.files(prefix), len(prefix), selected_type, index.mtime_ns
+                )
+            else:
+                file_count = self._add_directory_contents(folder_item[0], path, selected_type)
 
             root_index = self.tree_model.indexFromItem(folder_item[0])
             if root_index.isValid():
@@ -497,7 +506,7 @@ class FileBrowserWidget(QWidget):
 
         return [name_item, type_item, size_item]
     
-    def _add_file_item(self, parent_item: QStandardItem, file_path: str, selected_type: str) -> bool:
+    def _add_file_item(self, parent_item: QStandardItem, file_path: str, selected_type: str, size: int = None) -> bool:
         """Add a file item to the tree. Returns True if file was added."""
         file_name = os.path.basename(file_path)
         file_ext = os.path.splitext(file_name)[1].lower()
@@ -513,10 +522,11 @@ class FileBrowserWidget(QWidget):
             if required_ext and file_ext != required_ext:
                 return False
         
-        try:
-            size = os.path.getsize(file_path)
-        except OSError:
-            size = 0
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
         
         row = self._create_file_item(file_name, file_path, size, file_ext)
         parent_item.appendRow(row)
@@ -545,6 +555,57 @@ class FileBrowserWidget(QWidget):
         
         return file_count
     
+    def _add_indexed_contents(self, parent_item: QStandardItem, dir_path: str, entries: list, skip: int,
+                              selected_type: str, built_ns: int) -> int:
+        """Add GameData index entries below dir_path, in the same order as _add_directory_contents.
+
+        The tree comes from the index instead of a walk; *skip* is the length
+        of dir_path's prefix in the entries' paths. The index can be older
+        than the folder (files repacked or extracted since), so a folder
+        modified after the index was written (*built_ns*) is walked instead,
+        and files are stat-ed for their current size and skipped if gone.
+        """
+        tree = {}
+        for entry in entries:
+            node = tree
+            *folders, name = entry.relative_path[skip:].split("/")
+            for folder in folders:
+                node = node.setdefault(folder, {})
+            node[name] = entry
+        if self._folder_changed(dir_path, built_ns):
+            return self._add_directory_contents(parent_item, dir_path, selected_type)
+        return self._add_indexed_node(parent_item, dir_path, tree, selected_type, built_ns)
+    
+    @staticmethod
+    def _folder_changed(dir_path: str, built_ns: int) -> bool:
+        """True if entries were added to or removed from dir_path after built_ns."""
+        return os.stat(dir_path).st_mtime_ns > built_ns
+    
+    def _add_indexed_node(self, parent_item: QStandardItem, dir_path: str, node: dict, selected_type: str,
+                          built_ns: int) -> int:
+        file_count = 0
+        for name, child in sorted(node.items(), key=lambda item: (not isinstance(item[1], dict), item[0].lower())):
+            child_path = os.path.join(dir_path, name)
+            if isinstance(child, dict):
+                try:
+                    changed = self._folder_changed(child_path, built_ns)
+                except OSError:
+                    continue  # Deleted since the index was built
+                folder_row = self._create_folder_item(name, child_path)
+                parent_item.appendRow(folder_row)
+                if changed:
+                    file_count += self._add_directory_contents(folder_row[0], child_path, selected_type)
+                else:
+                    file_count += self._add_indexed_node(folder_row[0], child_path, child, selected_type, built_ns)
+                continue
+            try:
+                size = os.stat(child_path).st_size
+            except OSError:
+                continue  # Deleted since the index was built
+            if self._add_file_item(parent_item, child_path, selected_type, size):
+                file_count += 1
+        return file_count
+    
     def _populate_grid_folder(self, folder_path: str):
         """Populate the grid view with contents of a specific folder."""
         self.grid_model.clear()
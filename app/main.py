@@ -10,6 +10,7 @@ Repository: https://github.com/DiNaSoR/dokaponsof
 
 import sys
 import os
+import multiprocessing
 
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon, QFont
@@ -55,4 +56,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed for process-pool workers in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
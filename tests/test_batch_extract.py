@@ -0,0 +1,44 @@
+import threading
+
+from app.core.batch_extract import ExtractionJob, extract_files, iter_extract
+
+
+def _missing_jobs(tmp_path, count):
+    return [ExtractionJob(str(tmp_path / f"missing_{i}.tex"), str(tmp_path / "out")) for i in range(count)]
+
+
+def _returns_within(function, timeout=60):
+    thread = threading.Thread(target=function, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def test_every_job_reports_a_result(tmp_path):
+    jobs = _missing_jobs(tmp_path, 50)
+    results = extract_files(jobs, max_workers=2)
+    assert sorted(result.input_path for result in results) == sorted(job.input_path for job in jobs)
+    assert not any(result.success for result in results)
+
+
+def test_cancel_mid_run_returns(tmp_path):
+    # Enough results to fill the result pipe once nobody reads it any more
+    jobs = _missing_jobs(tmp_path, 2000)
+    seen = []
+
+    def run():
+        extract_files(jobs, max_workers=4, on_result=seen.append, should_cancel=lambda: len(seen) > 0)
+
+    assert _returns_within(run)
+    assert 0 < len(seen) < len(jobs)
+
+
+def test_closing_the_generator_returns(tmp_path):
+    jobs = _missing_jobs(tmp_path, 2000)
+
+    def run():
+        results = iter_extract(jobs, max_workers=4)
+        next(results)
+        results.close()
+
+    assert _returns_within(run)
@@ -0,0 +1,45 @@
+import os
+import threading
+
+from app.core import game_scanner
+from app.core.game_scanner import SCAN_DEEP, SCAN_QUICK, analyze_file, scan_map_groups
+
+
+def _make_game_dir(tmp_path, count=400):
+    field_map = tmp_path / "GameData" / "app" / "Field" / "Map"
+    field_map.mkdir(parents=True)
+    for i in range(count):
+        (field_map / f"F_{i % 4:02d}_{i}.mpd").write_bytes(b"Cell" + os.urandom(64))
+    return tmp_path
+
+
+def test_parallel_scan_matches_serial(tmp_path, monkeypatch):
+    game_dir = _make_game_dir(tmp_path, 40)
+    serial = scan_map_groups(game_dir, max_workers=1)
+    monkeypatch.setattr(game_scanner, "_SCAN_PARALLEL_MIN_BYTES", 0)
+    parallel = scan_map_groups(game_dir, max_workers=2)
+    assert parallel == serial
+
+
+def test_cancel_mid_scan_returns(tmp_path, monkeypatch):
+    game_dir = _make_game_dir(tmp_path)
+    monkeypatch.setattr(game_scanner, "_SCAN_PARALLEL_MIN_BYTES", 0)
+    seen = []
+    done = threading.Event()
+
+    def run():
+        scan_map_groups(game_dir, max_workers=4, on_insight=seen.append, should_cancel=lambda: len(seen) > 0)
+        done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    assert done.wait(60)
+    assert 0 < len(seen) < 400
+
+
+def test_quick_tier_reads_header_only(tmp_path):
+    game_dir = _make_game_dir(tmp_path, 1)
+    path = next((game_dir / "GameData" / "app" / "Field" / "Map").iterdir())
+    quick = analyze_file(path, game_dir, SCAN_QUICK)
+    deep = analyze_file(path, game_dir, SCAN_DEEP)
+    assert quick.tier == SCAN_QUICK and quick.png_count is None
+    assert (quick.signature, quick.size) == (deep.signature, deep.size)
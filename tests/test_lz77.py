@@ -0,0 +1,123 @@
+import os
+import random
+import struct
+
+import pytest
+
+from app.core import lz77
+from app.core.lz77 import available_backends, compress, decompress, set_backend
+
+
+@pytest.fixture
+def backend():
+    previous = lz77.get_backend().name
+    yield set_backend
+    set_backend(previous)
+
+
+def _decode_with_every_backend(backend, data, variant):
+    outputs = {}
+    for name in available_backends():
+        backend(name)
+        try:
+            outputs[name] = decompress(data, variant)
+        except ValueError as exc:
+            outputs[name] = ("ValueError", str(exc))
+    return outputs
+
+
+def _flag_byte_streams():
+    rng = random.Random(1)
+    literals = bytes(rng.randrange(256) for _ in range(64))
+    packed = compress(literals * 4 + bytes(40), "flag_byte")
+    yield packed
+    # Truncated: the compressed span runs past the end of the file
+    for cut in (20, 27, 33, len(packed) - 1):
+        yield packed[:cut]
+    with_trailing = compress(literals, "flag_byte", trailing=b"Sequence")
+    end = struct.unpack_from("<I", with_trailing, 12)[0]
+    yield with_trailing[:end - 3]
+    for _ in range(50):
+        yield b"LZ77" + os.urandom(4) + struct.pack("<II", rng.randrange(400), rng.randrange(200)) + os.urandom(rng.randrange(120))
+
+
+def test_backends_agree_on_flag_byte_streams(backend):
+    for data in _flag_byte_streams():
+        outputs = _decode_with_every_backend(backend, data, "flag_byte")
+        assert len(set(map(repr, outputs.values()))) == 1, (data, outputs)
+
+
+def _decode(packed, variant):
+    if variant == "cell":
+        return decompress(packed, "cell")[0]
+    # flag_byte reports an empty payload as None
+    return decompress(packed, variant) or b""
+
+
+def _payloads():
+    rng = random.Random(2)
+    seven_bit = bytes(rng.randrange(0x80) for _ in range(3000))
+    text = b"".join(b"Player %d rolled a %d.\n" % (rng.randrange(4), rng.randrange(1, 7)) for _ in range(200))
+    yield "empty", b""
+    yield "single", b"a"
+    yield "incompressible", seven_bit
+    yield "text", text
+    yield "zero run", bytes(10000)
+    yield "byte run", b"A" * 5000
+    yield "period 2", b"ab" * 2000
+    yield "period 3 with tail", b"abc" * 1000 + b"ab"
+    yield "overlap after literals", b"xyz" + b"xy" * 300
+    yield "far match", seven_bit[:200] + bytes(1500) + seven_bit[:200]
+
+
+@pytest.mark.parametrize("level", lz77.COMPRESSION_LEVELS)
+@pytest.mark.parametrize("variant", ["flag_byte", "token_stream", "cell"])
+def test_round_trip(backend, variant, level):
+    for name in available_backends():
+        backend(name)
+        for label, payload in _payloads():
+            packed = compress(payload, variant, level)
+            assert _decode(packed, variant) == payload, (name, label)
+
+
+@pytest.mark.parametrize("level", lz77.COMPRESSION_LEVELS)
+@pytest.mark.parametrize("variant", ["flag_byte", "cell"])
+def test_round_trip_full_byte_range(variant, level):
+    payload = bytes(random.Random(3).randrange(256) for _ in range(2000)) * 2
+    assert _decode(compress(payload, variant, level), variant) == payload
+
+
+@pytest.mark.parametrize("level", lz77.COMPRESSION_LEVELS)
+def test_long_runs_compress(level):
+    for variant in ("flag_byte", "token_stream", "cell"):
+        assert len(compress(bytes(10000), variant, level)) < 10000 // 4
+
+
+@pytest.mark.parametrize("level", lz77.COMPRESSION_LEVELS)
+def test_token_stream_rejects_new_high_bytes(level):
+    with pytest.raises(ValueError, match="0x90 at offset 2"):
+        compress(b"ab\x90", "token_stream", level)
+    with pytest.raises(ValueError, match="0xFF at offset 6"):
+        compress(b"abcabc\xff", "token_stream", level)
+
+
+@pytest.mark.parametrize("level", lz77.COMPRESSION_LEVELS)
+def test_token_stream_tails(level):
+    # One or two bytes left after the last full match
+    for tail in range(1, 6):
+        payload = b"abcd" * 6 + b"abcd"[:tail % 4] + b"\x7f"[:tail // 4]
+        assert _decode(compress(payload, "token_stream", level), "token_stream") == payload
+
+
+def test_token_stream_stops_at_declared_size():
+    # A minimum-length back-reference may run past the end of the payload
+    stream = b"ab" + bytes([0x80, 0x01])
+    assert decompress(b"LZ77" + struct.pack("<III", 4, 0, 0) + stream, "token_stream") == b"abab"
+
+
+def test_trailing_bytes_survive_round_trip():
+    payload = b"header" * 50
+    packed = compress(payload, "flag_byte", trailing=b"Sequence")
+    assert decompress(packed, "flag_byte") == payload + b"Sequence"
+    packed = compress(payload, "token_stream", trailing=b"tail")
+    assert lz77._split_payload(packed, "token_stream") == (payload, b"tail")
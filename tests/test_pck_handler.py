@@ -0,0 +1,93 @@
+import pytest
+
+from app.core.pck_handler import PCKFile, Sound, create_pck
+
+
+def _make_pck(tmp_path, payloads):
+    paths = []
+    for name, data in payloads.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths.append(str(path))
+    pck_path = tmp_path / "test.pck"
+    create_pck(paths, str(pck_path))
+    return str(pck_path)
+
+
+def _payloads(pck_path):
+    with PCKFile(pck_path, lazy=False) as pck:
+        return {sound.name: bytes(sound.data) for sound in pck}
+
+
+def test_swap_in_place_keeps_both_payloads(tmp_path):
+    pck_path = _make_pck(tmp_path, {"A.opus": b"aaaa", "B.opus": b"bbbb"})
+    with PCKFile(pck_path) as pck:
+        a, b = pck.find_sound("A"), pck.find_sound("B")
+        pck.replace_sound("A", Sound("A.opus", b.data))
+        pck.replace_sound("B", Sound("B.opus", a.data))
+        assert pck.update_in_place() == ["A.opus", "B.opus"]
+        assert bytes(pck.find_sound("A").data) == b"bbbb"
+    assert _payloads(pck_path) == {"A.opus": b"bbbb", "B.opus": b"aaaa"}
+
+
+def test_replace_under_new_name_updates_lookup(tmp_path):
+    pck_path = _make_pck(tmp_path, {"A.opus": b"aaaa", "B.opus": b"bbbb"})
+    with PCKFile(pck_path) as pck:
+        assert pck.replace_sound("A", Sound("C.opus", b"cccc"))
+        assert pck.find_sound("A") is None
+        assert bytes(pck.find_sound("C").data) == b"cccc"
+
+
+def test_batch_replace_under_new_name_updates_lookup(tmp_path):
+    pck_path = _make_pck(tmp_path, {"A.opus": b"aaaa", "B.opus": b"bbbb"})
+    with PCKFile(pck_path) as pck:
+        with pck.batch() as batch:
+            assert batch.replace("A", Sound("C.opus", b"cccc"))
+            assert not batch.remove("A")
+            assert batch.remove("C")
+        assert [sound.name for sound in pck] == ["B.opus"]
+
+
+def test_failed_batch_write_keeps_sounds(tmp_path):
+    pck_path = _make_pck(tmp_path, {"A.opus": b"aaaa", "B.opus": b"bbbb"})
+    with PCKFile(pck_path) as pck:
+        batch = pck.batch(str(tmp_path))  # A directory cannot be written
+        batch.remove("A")
+        with pytest.raises(OSError):
+            batch.commit()
+        assert [sound.name for sound in pck] == ["A.opus", "B.opus"]
+
+
+def _fail_replace(monkeypatch):
+    def replace(src, dst):
+        raise PermissionError("archive is locked")
+    monkeypatch.setattr("app.core.pck_handler.os.replace", replace)
+
+
+def test_failed_rewrite_keeps_sounds_readable(tmp_path, monkeypatch):
+    pck_path = _make_pck(tmp_path, {"A.opus": b"aaaa", "B.opus": b"bbbb"})
+    with PCKFile(pck_path) as pck:
+        pck.add_sound(Sound("C.opus", b"cccc"))
+        _fail_replace(monkeypatch)
+        with pytest.raises(PermissionError):
+            pck.write(pck_path)
+        assert [bytes(sound.data) for sound in pck] == [b"aaaa", b"bbbb", b"cccc"]
+        assert not pck.is_modified(0)
+        monkeypatch.undo()
+        pck.write(pck_path)
+    assert _payloads(pck_path) == {"A.opus": b"aaaa", "B.opus": b"bbbb", "C.opus": b"cccc"}
+
+
+def test_failed_batch_replace_keeps_pck_usable(tmp_path, monkeypatch):
+    pck_path = _make_pck(tmp_path, {"A.opus": b"aaaa", "B.opus": b"bbbb"})
+    with PCKFile(pck_path) as pck:
+        batch = pck.batch(pck_path)
+        batch.remove("A")
+        batch.add(Sound("C.opus", b"cccc"))
+        _fail_replace(monkeypatch)
+        with pytest.raises(PermissionError):
+            batch.commit()
+        assert [(sound.name, bytes(sound.data)) for sound in pck] == [("A.opus", b"aaaa"), ("B.opus", b"bbbb")]
+        monkeypatch.undo()
+        batch.commit()
+    assert _payloads(pck_path) == {"B.opus": b"bbbb", "C.opus": b"cccc"}